@@ -1,10 +1,41 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import sys
+from typing import Optional
 
-def fetch_discuss_explanations(problem_code: str):
+# Shared scraping helpers live in backend/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+
+import http_client
+import scrape_cache
+from html_parsing import parse
+from concurrent_fetch import fetch_ranked
+from discuss_ranking import rank_topics, TOP_K
+from cc_discuss_index import posts_from_index
+
+# Topic pages fetched in parallel per request
+DISCUSS_FETCH_WORKERS = int(os.getenv("CC_DISCUSS_WORKERS", "4"))
+
+# Discuss posts carry no contest date, so "no editorial" backs off per re-check instead
+NO_EDITORIAL_TTL = scrape_cache.backoff_ttl(15 * 60, 24 * 3600)
+
+# Own namespace: codechef/cc_editorial.py caches a different post format for the same codes
+@scrape_cache.cached("cc_editorial_discuss_explanations", ttl=6 * 3600, stale_ttl=7 * 24 * 3600,
+                     cacheable=lambda result: scrape_cache.is_cacheable(result) and result.get("count", 0) > 0,
+                     negative=lambda result: "error" not in result and result.get("count", 0) == 0,
+                     negative_ttl=NO_EDITORIAL_TTL)
+def fetch_discuss_explanations(problem_code: str, limit: Optional[int] = None, first_only: bool = False):
     """
     Fetch meaningful CodeChef Discuss posts for a given problem.
-    Filters out 'Help me' type posts and prefers 'Editorial' or 'Explanation' ones.
+    Topics are ranked on search.json signals (discuss_ranking), 'Help me'
+    type posts are dropped and only the top few are fetched, concurrently and
+    in rank order; with limit (or first_only) the call returns once the
+    best-ranked posts are known. Problem codes found in the local editorial
+    index (cc_discuss_index) are answered from it without any request.
+    Non-empty results are cached for 6 hours (scrape_cache), shared by all workers,
+    then served stale for up to a week while a background refresh runs.
+    "Nothing found" is cached too, for 15 minutes at first and twice as long
+    after every re-check that still finds nothing (up to a day), unless a
+    topic fetch failed.
     """
     base_url = "https://discuss.codechef.com"
     search_url = f"{base_url}/search.json?q={problem_code}"
@@ -14,54 +45,76 @@ def fetch_discuss_explanations(problem_code: str):
         "Accept": "application/json"
     }
 
-    try:
-        res = requests.get(search_url, headers=headers, timeout=10)
-        res.raise_for_status()
-        data = res.json()
+    if first_only:
+        limit = 1
 
-        topics = data.get("topics", [])
-        posts = []
+    def to_post(title, topic_url, cooked):
+        soup = parse(cooked, "codechef_discuss_post")
+        text = soup.get_text().strip()
 
-        for topic in topics:
-            title = topic.get("title", "").lower()
-            if any(bad in title for bad in ["help", "doubt", "error", "stuck", "solve", "solution needed"]):
-                continue  # skip unhelpful posts
+        return {
+            "title": title,
+            "url": topic_url,
+            "text": text[:1200]
+        }
 
-            if not any(good in title for good in ["editorial", "explanation", "approach", "tutorial"]):
-                continue  # skip irrelevant ones
+    # Topics whose fetch failed rather than being filtered out
+    failed_topics = []
 
-            topic_id = topic.get("id")
-            slug = topic.get("slug")
-            topic_url = f"{base_url}/t/{slug}/{topic_id}"
+    def fetch_topic(topic):
+        topic_id = topic.get("id")
+        slug = topic.get("slug")
+        topic_url = f"{base_url}/t/{slug}/{topic_id}"
 
-            topic_res = requests.get(f"{base_url}/t/{topic_id}.json", headers=headers)
+        try:
+            topic_res = http_client.get(f"{base_url}/t/{topic_id}.json", headers=headers, conditional=True)
+            topic_res.raise_for_status()
             topic_json = topic_res.json()
+        except Exception as e:
+            print(f"Error fetching topic {topic_id}: {e}")
+            failed_topics.append(topic_id)
+            return None
 
-            post_stream = topic_json.get("post_stream", {}).get("posts", [])
-            if not post_stream:
-                continue
+        post_stream = topic_json.get("post_stream", {}).get("posts", [])
+        if not post_stream:
+            return None
 
-            first_post = post_stream[0]
-            cooked = first_post.get("cooked", "")
-            soup = BeautifulSoup(cooked, "html.parser")
-            text = soup.get_text().strip()
-
-            posts.append({
-                "title": topic.get("title"),
-                "url": topic_url,
-                "text": text[:1200]
-            })
+        first_post = post_stream[0]
+        return to_post(topic.get("title"), topic_url, first_post.get("cooked", ""))
 
+    # Editorials the background crawler already indexed need no Discourse round trip
+    posts = posts_from_index(problem_code, to_post, limit)
+    if posts:
         return {
             "problem_code": problem_code,
             "count": len(posts),
             "posts": posts
         }
 
+    try:
+        res = http_client.get(search_url, headers=headers, conditional=True)
+        res.raise_for_status()
+        data = res.json()
+
+        # Score topics on search.json signals and download only the best few
+        candidates = rank_topics(data, problem_code, top_k=max(TOP_K, limit or 0))
+
+        posts = fetch_ranked(candidates, fetch_topic, max_workers=DISCUSS_FETCH_WORKERS, limit=limit)
+
+        result = {
+            "problem_code": problem_code,
+            "count": len(posts),
+            "posts": posts
+        }
+        if not posts and failed_topics:
+            # The editorial may be in a topic we couldn't load; this is not "nothing found"
+            result["error"] = f"Could not fetch {len(failed_topics)} Discuss topic(s), please try again."
+        return result
+
     except Exception as e:
         return {
             "problem_code": problem_code,
             "count": 0,
             "posts": [],
             "error": str(e)
-        }
\ No newline at end of file
+        }
@@ -1,5 +1,7 @@
 from fastapi import FastAPI, Query
 from cc_editorial import fetch_discuss_explanations
+import scrape_cache  # on sys.path via cc_editorial
+import single_flight
 from hint_generator import generate_hints
 
 app = FastAPI(
@@ -13,17 +15,23 @@ def home():
     return {"message": "CodeChef Discuss Scraper + Gemini Hint Generator is running."}
 
 @app.get("/cc_editorial")
-def get_cc_editorial(problem_code: str, with_hints: bool = Query(False)):
+def get_cc_editorial(problem_code: str, with_hints: bool = Query(False),
+                     bypass_negative_cache: bool = Query(False)):
     """
     Fetch CodeChef editorial or explanation posts for a given problem code.
     Example: /cc_editorial?problem_code=FLOW001&with_hints=true
+    bypass_negative_cache=true re-checks a problem cached as having no editorial.
     """
-    data = fetch_discuss_explanations(problem_code)
+    with scrape_cache.request_scope(bypass_negative=bypass_negative_cache) as cache_scope:
+        data = fetch_discuss_explanations(problem_code)
+    data["negative_cache_hit"] = bool(cache_scope["negative_hits"])
     
     if with_hints and data.get("count", 0) > 0:
         # Take the first editorial text
         editorial_text = data["posts"][0]["text"]
-        hints = generate_hints(editorial_text, problem_code)
+        # Concurrent requests for the same problem share one LLM call
+        hints = single_flight.do(f"codechef:{problem_code}:hints:hint_generator:{single_flight.digest(editorial_text)}",
+                                 lambda: generate_hints(editorial_text, problem_code))
         data["hints"] = hints
 
     return data
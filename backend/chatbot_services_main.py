@@ -17,6 +17,9 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'CC_Editorial'))
 from chatbot_core import chat_with_bot
 from cc_editorial import fetch_discuss_explanations
 from hint_generator import generate_hints
+import cc_discuss_index
+import scrape_cache
+import single_flight
 
 # Load environment variables
 load_dotenv()
@@ -37,6 +40,12 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def start_codechef_background_jobs():
+    # Keeps the local problem code -> Discuss editorial index growing
+    cc_discuss_index.start_crawler()
+
+
 class ChatRequest(BaseModel):
     message: str
     context: list | None = None
@@ -67,16 +76,22 @@ def chat_endpoint(req: ChatRequest):
 # ==================== CC EDITORIAL ENDPOINTS ====================
 
 @app.get("/cc_editorial")
-def get_cc_editorial(problem_code: str, with_hints: bool = Query(False)):
+def get_cc_editorial(problem_code: str, with_hints: bool = Query(False),
+                     bypass_negative_cache: bool = Query(False)):
     """
     Fetch CodeChef editorial or explanation posts for a given problem code.
     Example: /cc_editorial?problem_code=FLOW001&with_hints=true
+    bypass_negative_cache=true re-checks a problem cached as having no editorial.
     """
-    data = fetch_discuss_explanations(problem_code)
+    with scrape_cache.request_scope(bypass_negative=bypass_negative_cache) as cache_scope:
+        data = fetch_discuss_explanations(problem_code)
+    data["negative_cache_hit"] = bool(cache_scope["negative_hits"])
     
     if with_hints and data.get("count", 0) > 0:
         editorial_text = data["posts"][0]["text"]
-        hints = generate_hints(editorial_text, problem_code)
+        # Concurrent requests for the same problem share one LLM call
+        hints = single_flight.do(f"codechef:{problem_code}:hints:hint_generator:{single_flight.digest(editorial_text)}",
+                                 lambda: generate_hints(editorial_text, problem_code))
         data["hints"] = hints
 
     return data
@@ -0,0 +1,92 @@
+# bench_editorial_scoring.py
+"""
+Check that find_editorial_candidate picks the same div as the previous
+strategy-4 loop of extract_editorial_content, and compare their speed.
+
+    python bench_editorial_scoring.py [--depth N] [--width N]
+
+1. Every page in ../common/fixtures/pages, plus generated nested pages,
+   goes through both; the selected text must be identical.
+2. Timing of both on a generated page of nested divs where no div
+   qualifies (the old loop re-serializes every subtree once per enclosing div).
+"""
+import os
+import time
+import random
+import argparse
+
+import cc_editorial
+from html_parsing import parse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "common", "fixtures", "pages")
+
+
+def legacy_candidate_text(soup):
+    """Strategy 4 as it was: get_text() on every div."""
+    all_divs = soup.find_all('div')
+    for div in all_divs:
+        text = div.get_text(separator="\n", strip=True)
+        # Check if this div contains solution-like content
+        solution_keywords = ['approach', 'solution', 'algorithm', 'complexity', 'time complexity']
+        if any(keyword in text.lower() for keyword in solution_keywords) and len(text) > 200:
+            # Make sure this isn't just the problem statement
+            if 'input format' not in text.lower() or text.count('\n') > 20:
+                return text
+    return None
+
+
+def new_candidate_text(soup):
+    div = cc_editorial.find_editorial_candidate(soup)
+    return div.get_text(separator="\n", strip=True) if div is not None else None
+
+
+FILLER = ["prefix", "sum", "modulo", "count", "pairs", "array", "greedy", "sort", "\n", "  ", "x"]
+KEYWORDS = ["Input Format", "APPROACH", "Solution", "complexity", "<!-- approach -->"]
+
+
+def nested_page(depth, width, seed=0, words=FILLER + KEYWORDS):
+    """Divs nested `depth` deep, each level with `width` paragraphs of random words."""
+    rng = random.Random(seed)
+    html = ""
+    for level in range(depth):
+        paragraphs = "".join(
+            "<p>" + " ".join(rng.choice(words) for _ in range(rng.randint(1, 12))) + "</p>"
+            for _ in range(width)
+        )
+        html = f"<div class='level{level}'>{paragraphs}{html}<span>{rng.choice(words)}</span></div>"
+    return f"<html><body>{html}</body></html>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=300)
+    parser.add_argument("--width", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = {}
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+                pages[name] = f.read()
+    for seed in range(200):
+        pages[f"generated-{seed}"] = nested_page(random.Random(seed).randint(1, 40), 3, seed)
+
+    mismatches = 0
+    for name, html in pages.items():
+        soup = parse(html, "bench")
+        if legacy_candidate_text(soup) != new_candidate_text(soup):
+            mismatches += 1
+            print(f"MISMATCH {name}")
+    print(f"Equivalence: {len(pages)} pages, {mismatches} mismatches")
+
+    # No keywords: nothing qualifies, so the old loop serializes every div (worst case)
+    soup = parse(nested_page(args.depth, args.width, words=FILLER), "bench")
+    for label, pick in (("get_text per div", legacy_candidate_text), ("bottom-up scores", new_candidate_text)):
+        start = time.perf_counter()
+        pick(soup)
+        print(f"{label:>17}: {(time.perf_counter() - start) * 1000:8.1f} ms "
+              f"(depth {args.depth}, {len(soup.find_all('div'))} divs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,53 @@
 # cc_editorial.py
+import os
 import re
-import time
-import requests
+import sys
 from typing import Optional, Dict, List
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-
-def fetch_discuss_explanations(problem_code: str):
+from bs4 import SoupStrainer, NavigableString, CData, Tag
+
+# Shared scraping helpers live in backend/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+
+import http_client
+import cookie_jar
+import editorial_cleaner
+import scrape_cache
+from html_parsing import parse, parse_any
+from concurrent_fetch import fetch_ranked
+from discuss_ranking import rank_topics, TOP_K
+from cc_discuss_index import posts_from_index
+from browser_pool import create_driver
+from tiered_fetcher import fetch_page, is_challenge_page
+
+# Topic pages fetched in parallel per request
+DISCUSS_FETCH_WORKERS = int(os.getenv("CC_DISCUSS_WORKERS", "4"))
+
+# Discuss posts carry no contest date, so "no editorial" backs off per re-check instead
+NO_EDITORIAL_TTL = scrape_cache.backoff_ttl(15 * 60, 24 * 3600)
+
+@scrape_cache.cached("cc_discuss_explanations", ttl=6 * 3600, stale_ttl=7 * 24 * 3600,
+                     cacheable=lambda result: scrape_cache.is_cacheable(result) and result.get("count", 0) > 0,
+                     negative=lambda result: "error" not in result and result.get("count", 0) == 0,
+                     negative_ttl=NO_EDITORIAL_TTL)
+def fetch_discuss_explanations(problem_code: str, limit: Optional[int] = None, first_only: bool = False):
     """
     Fetch meaningful CodeChef Discuss posts for a given problem.
     This uses the CodeChef Discuss API to search for editorial/explanation posts.
     
-    Filters out 'Help me' type posts and prefers 'Editorial' or 'Explanation' ones.
+    Topics are ranked on search.json signals (discuss_ranking): 'Help me'
+    type posts are dropped, official editorials come first, and only the top
+    few are fetched. Topic pages are fetched concurrently; posts keep the rank order.
+    With limit (or first_only, i.e. limit=1) the call returns as soon as the
+    best-ranked substantial posts are known and cancels the other fetches.
+    Problem codes found in the local editorial index (cc_discuss_index) are
+    answered from it without any request.
+    Non-empty results are cached for 6 hours (scrape_cache), shared by all workers,
+    then served stale for up to a week while a background refresh runs.
+    "Nothing found" is cached too, for 15 minutes at first and twice as long
+    after every re-check that still finds nothing (up to a day); a miss
+    where a topic fetch failed (rate limit, timeout) is reported as an error
+    and not cached.
     
     Returns:
         dict: {
@@ -35,60 +65,76 @@ def fetch_discuss_explanations(problem_code: str):
         "Accept": "application/json"
     }
 
-    try:
-        res = requests.get(search_url, headers=headers, timeout=10)
-        res.raise_for_status()
-        data = res.json()
+    if first_only:
+        limit = 1
 
-        topics = data.get("topics", [])
-        posts = []
+    def to_post(title, topic_url, cooked):
+        soup = parse(cooked, "codechef_discuss_post")
+        text = soup.get_text(separator="\n", strip=True)
 
-        for topic in topics:
-            title = topic.get("title", "").lower()
-            
-            # Skip unhelpful posts
-            if any(bad in title for bad in ["help", "doubt", "error", "stuck", "solve", "solution needed", "please help"]):
-                continue
-            
-            # Only keep relevant posts
-            if not any(good in title for good in ["editorial", "explanation", "approach", "tutorial", "solution"]):
-                continue
+        # Only add if we got substantial content
+        if len(text) > 100:
+            return {
+                "title": title,
+                "url": topic_url,
+                "text": text[:3000]  # Limit text length
+            }
+        return None
 
-            topic_id = topic.get("id")
-            slug = topic.get("slug")
-            topic_url = f"{base_url}/t/{slug}/{topic_id}"
+    # Topics whose fetch failed rather than being filtered out
+    failed_topics = []
 
-            # Fetch the full topic content
-            try:
-                topic_res = requests.get(f"{base_url}/t/{topic_id}.json", headers=headers, timeout=10)
-                topic_json = topic_res.json()
+    def fetch_topic(topic):
+        topic_id = topic.get("id")
+        slug = topic.get("slug")
+        topic_url = f"{base_url}/t/{slug}/{topic_id}"
 
-                post_stream = topic_json.get("post_stream", {}).get("posts", [])
-                if not post_stream:
-                    continue
+        # Fetch the full topic content
+        try:
+            topic_res = http_client.get(f"{base_url}/t/{topic_id}.json", headers=headers, conditional=True)
+            topic_res.raise_for_status()
+            topic_json = topic_res.json()
 
-                first_post = post_stream[0]
-                cooked = first_post.get("cooked", "")
-                soup = BeautifulSoup(cooked, "html.parser")
-                text = soup.get_text(separator="\n", strip=True)
-
-                # Only add if we got substantial content
-                if len(text) > 100:
-                    posts.append({
-                        "title": topic.get("title"),
-                        "url": topic_url,
-                        "text": text[:3000]  # Limit text length
-                    })
-            except Exception as e:
-                print(f"Error fetching topic {topic_id}: {e}")
-                continue
+            post_stream = topic_json.get("post_stream", {}).get("posts", [])
+            if not post_stream:
+                return None
 
+            first_post = post_stream[0]
+            return to_post(topic.get("title"), topic_url, first_post.get("cooked", ""))
+        except Exception as e:
+            print(f"Error fetching topic {topic_id}: {e}")
+            failed_topics.append(topic_id)
+        return None
+
+    # Editorials the background crawler already indexed need no Discourse round trip
+    posts = posts_from_index(problem_code, to_post, limit)
+    if posts:
         return {
             "problem_code": problem_code,
             "count": len(posts),
             "posts": posts
         }
 
+    try:
+        res = http_client.get(search_url, headers=headers, conditional=True)
+        res.raise_for_status()
+        data = res.json()
+
+        # Score topics on search.json signals and download only the best few
+        candidates = rank_topics(data, problem_code, top_k=max(TOP_K, limit or 0))
+
+        posts = fetch_ranked(candidates, fetch_topic, max_workers=DISCUSS_FETCH_WORKERS, limit=limit)
+
+        result = {
+            "problem_code": problem_code,
+            "count": len(posts),
+            "posts": posts
+        }
+        if not posts and failed_topics:
+            # The editorial may be in a topic we couldn't load; this is not "nothing found"
+            result["error"] = f"Could not fetch {len(failed_topics)} Discuss topic(s), please try again."
+        return result
+
     except Exception as e:
         return {
             "problem_code": problem_code,
@@ -99,30 +145,13 @@ def fetch_discuss_explanations(problem_code: str):
 
 def setup_selenium_driver() -> webdriver.Chrome:
     """
-    Setup and return a configured Chrome WebDriver for scraping CodeChef.
+    Setup and return a standalone configured Chrome WebDriver for scraping CodeChef.
     CodeChef uses Cloudflare protection, so we need a proper browser setup.
-    """
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run without GUI
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    
-    # Suppress unnecessary logs
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
     
-    # Remove webdriver property
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    
-    return driver
+    The scrapers below borrow drivers from the shared browser pool instead;
+    use this only when a private, short-lived browser is really needed.
+    """
+    return create_driver()
 
 def parse_problem_url(url: str) -> Optional[Dict[str, str]]:
     """
@@ -168,15 +197,13 @@ def parse_problem_url(url: str) -> Optional[Dict[str, str]]:
 
 def fetch_problem_page(problem_code: str, contest_code: Optional[str] = None) -> str:
     """
-    Fetch the problem page HTML using Selenium to bypass Cloudflare.
+    Fetch the problem page HTML. Plain HTTP is tried first; Selenium is
+    used when Cloudflare challenges the request or the page needs rendering.
     
     Returns:
         str: HTML content of the problem page
     """
-    driver = None
     try:
-        driver = setup_selenium_driver()
-        
         # Construct URL
         if contest_code:
             url = f"https://www.codechef.com/{contest_code}/problems/{problem_code}"
@@ -184,30 +211,24 @@ def fetch_problem_page(problem_code: str, contest_code: Optional[str] = None) ->
             url = f"https://www.codechef.com/problems/{problem_code}"
         
         print(f"Fetching CodeChef problem page: {url}")
-        driver.get(url)
+        page = fetch_page(url, "codechef_problem")
+        print(f"Fetched via {page['tier']} in {page['elapsed']}s")
+        if page["status"] and page["status"] != 200:
+            raise Exception(f"HTTP {page['status']} for {url}")
         
-        # Wait for page to load - look for problem title or content
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "h1"))
-            )
-        except:
-            print("Warning: Timeout waiting for h1, continuing anyway...")
-        
-        time.sleep(3)  # Additional wait for dynamic content
-        
-        page_source = driver.page_source
-        driver.quit()
-        return page_source
+        return page["html"]
         
     except Exception as e:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
         raise Exception(f"Error fetching problem page: {e}")
 
+# The title plus the containers that carry the difficulty badge, tags and the
+# "Difficulty:" / "Success Rate:" labels (problem info / stats panels)
+METADATA_TARGETS = [
+    SoupStrainer('h1'),
+    SoupStrainer(attrs={'class': re.compile(r'difficulty|tags?|success|accuracy|problem-?info|problem-?details|stats?\b', re.IGNORECASE)}),
+    SoupStrainer(attrs={'id': re.compile(r'difficulty|tags?|success|problem-?info|problem-?details|stats?\b', re.IGNORECASE)}),
+]
+
 def extract_problem_metadata(html: str, problem_code: str) -> Dict:
     """
     Extract problem metadata from the HTML.
@@ -221,7 +242,9 @@ def extract_problem_metadata(html: str, problem_code: str) -> Dict:
             "success_rate": str (optional)
         }
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    # Only the title and the metadata containers are parsed; the free-text
+    # "Difficulty:" / "Success Rate:" labels are searched inside them
+    soup = parse_any(html, "codechef_problem_metadata", METADATA_TARGETS)
     
     metadata = {
         "problem_code": problem_code,
@@ -268,9 +291,94 @@ def extract_problem_metadata(html: str, problem_code: str) -> Dict:
         parent = success_elem.parent
         if parent:
             metadata["success_rate"] = parent.get_text(strip=True)
-    
+
     return metadata
 
+PROBLEM_API_URL = "https://www.codechef.com/api/contests/{contest}/problems/{problem}"
+
+# Numeric difficulty_rating -> the difficulty labels the problem page shows
+DIFFICULTY_BANDS = [(1000, "Simple"), (1600, "Easy"), (2200, "Medium"), (2800, "Hard")]
+
+def _difficulty_label(rating) -> Optional[str]:
+    try:
+        rating = int(float(rating))
+    except (TypeError, ValueError):
+        return None
+    if rating <= 0:
+        return None
+    for upper, label in DIFFICULTY_BANDS:
+        if rating < upper:
+            return label
+    return "Challenge"
+
+def fetch_problem_metadata_json(problem_code: str, contest_code: Optional[str] = None) -> Optional[Dict]:
+    """
+    Problem metadata from CodeChef's problem JSON endpoint, without rendering
+    the page. Practice problems live under the PRACTICE contest.
+
+    Returns:
+        dict: same shape as extract_problem_metadata, or None when the API
+        does not answer with the problem (error status, challenge page, ...)
+    """
+    url = PROBLEM_API_URL.format(contest=contest_code or "PRACTICE", problem=problem_code)
+    try:
+        res = http_client.get(url, headers={**cookie_jar.request_headers(url), "Accept": "application/json"})
+        if is_challenge_page(res.status_code, res.text) or res.status_code != 200:
+            print(f"CodeChef problem API unavailable for {problem_code} (status {res.status_code})")
+            return None
+        data = res.json()
+    except Exception as e:
+        print(f"CodeChef problem API failed for {problem_code}: {e}")
+        return None
+
+    if data.get("status") != "success" or not data.get("problem_name"):
+        print(f"CodeChef problem API has no {problem_code}: {data.get('message') or data.get('status')}")
+        return None
+
+    tags = []
+    for tag in (data.get("user_tags") or []) + (data.get("computed_tags") or []):
+        name = tag.get("tag") if isinstance(tag, dict) else tag
+        if name and name not in tags:
+            tags.append(name)
+
+    success_rate = None
+    solved = data.get("successful_submissions")
+    total = data.get("total_submissions")
+    try:
+        if solved is not None and total and int(total) > 0:
+            success_rate = f"Success Rate: {100 * int(solved) / int(total):.2f}%"
+    except (TypeError, ValueError):
+        pass
+
+    return {
+        "problem_code": problem_code,
+        "name": data.get("problem_name"),
+        "difficulty": _difficulty_label(data.get("difficulty_rating")),
+        "tags": tags,
+        "success_rate": success_rate
+    }
+
+@scrape_cache.cached("cc_problem_metadata", ttl=24 * 3600, cacheable=lambda metadata: bool(metadata.get("name")))
+def get_problem_metadata(problem_code: str, contest_code: Optional[str] = None) -> Dict:
+    """
+    Problem metadata, from the JSON endpoint when it answers, otherwise
+    scraped from the (possibly browser-rendered) problem page.
+    """
+    metadata = fetch_problem_metadata_json(problem_code, contest_code)
+    if metadata:
+        print(f"Metadata for {problem_code} from the problem API")
+        return metadata
+
+    print(f"Falling back to the problem page for {problem_code} metadata")
+    html = fetch_problem_page(problem_code, contest_code)
+    return extract_problem_metadata(html, problem_code)
+
+EDITORIAL_TARGETS = [
+    SoupStrainer('div', id=re.compile(r'editorial', re.IGNORECASE)),
+    SoupStrainer('div', class_=re.compile(r'problem-statement|problem_description', re.IGNORECASE)),
+    SoupStrainer('a', href=re.compile(r'editorial|discuss', re.IGNORECASE)),
+]
+
 def extract_editorial_content(html: str, problem_code: str) -> Optional[str]:
     """
     Extract editorial content from the problem page HTML.
@@ -283,7 +391,9 @@ def extract_editorial_content(html: str, problem_code: str) -> Optional[str]:
     Returns:
         str: Editorial text or None if not found
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    # Strategies 1-3 only need these containers; strategy 4 scans every div
+    # and parses the full page only if it is reached
+    soup = parse_any(html, "codechef_editorial_content", EDITORIAL_TARGETS, fallback=False)
     
     editorial_text = None
     
@@ -326,110 +436,139 @@ def extract_editorial_content(html: str, problem_code: str) -> Optional[str]:
         return f"Editorial available at link: {href}"
     
     # Strategy 4: Look for any section with substantial content containing solution keywords
-    all_divs = soup.find_all('div')
-    for div in all_divs:
-        text = div.get_text(separator="\n", strip=True)
-        # Check if this div contains solution-like content
-        solution_keywords = ['approach', 'solution', 'algorithm', 'complexity', 'time complexity']
-        if any(keyword in text.lower() for keyword in solution_keywords) and len(text) > 200:
-            # Make sure this isn't just the problem statement
-            if 'input format' not in text.lower() or text.count('\n') > 20:
-                editorial_text = text
-                print(f"✓ Found potential editorial content (heuristic match)")
-                return clean_editorial_text(editorial_text)
+    soup = parse(html, "codechef_editorial_content_full")
+    candidate = find_editorial_candidate(soup)
+    if candidate is not None:
+        editorial_text = candidate.get_text(separator="\n", strip=True)
+        print(f"✓ Found potential editorial content (heuristic match)")
+        return clean_editorial_text(editorial_text)
     
     print("✗ No editorial content found")
     return None
 
+SOLUTION_KEYWORDS = ('approach', 'solution', 'algorithm', 'complexity', 'time complexity')
+
+def score_text_nodes(soup) -> Dict[int, Dict]:
+    """
+    One bottom-up pass over the tree. For every tag, describe
+    tag.get_text(separator="\n", strip=True) without building it:
+    length, newline count, and whether it contains a solution keyword or
+    "input format". Keys are id(tag).
+    
+    Strings are joined with "\n" and the phrases contain no newline, so a
+    phrase occurs in a tag's text exactly when it occurs in one of its
+    strings; lengths and newline counts add up over the children.
+    """
+    first_div = soup.find('div')
+    types = getattr(first_div, 'interesting_string_types', None) or (NavigableString, CData)
+    
+    scores = {}
+    # Iterative post-order walk: (node, children visited?)
+    stack = [(soup, False)]
+    while stack:
+        node, visited = stack.pop()
+        if not visited:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.contents) if isinstance(child, Tag))
+            continue
+        
+        pieces = chars = newlines = 0
+        keyword = input_format = False
+        for child in node.contents:
+            if isinstance(child, Tag):
+                child_score = scores[id(child)]
+                pieces += child_score["pieces"]
+                chars += child_score["chars"]
+                newlines += child_score["newlines"]
+                keyword = keyword or child_score["keyword"]
+                input_format = input_format or child_score["input_format"]
+                continue
+            if not isinstance(child, NavigableString):
+                continue
+            if isinstance(types, type):
+                if type(child) is not types:
+                    continue
+            elif type(child) not in types:
+                continue
+            stripped = child.strip()
+            if not stripped:
+                continue
+            lowered = stripped.lower()
+            pieces += 1
+            chars += len(stripped)
+            newlines += stripped.count('\n')
+            keyword = keyword or any(k in lowered for k in SOLUTION_KEYWORDS)
+            input_format = input_format or 'input format' in lowered
+        
+        scores[id(node)] = {
+            "pieces": pieces,
+            "chars": chars,
+            "newlines": newlines,
+            "keyword": keyword,
+            "input_format": input_format,
+        }
+    
+    # Add the "\n" separators between pieces, now that the sums are complete
+    for score in scores.values():
+        separators = max(score["pieces"] - 1, 0)
+        score["chars"] += separators
+        score["newlines"] += separators
+    return scores
+
+def find_editorial_candidate(soup):
+    """
+    First div (document order) whose text looks like a solution write-up:
+    a solution keyword, more than 200 characters, and not just the problem
+    statement. Linear in the page size thanks to score_text_nodes.
+    """
+    scores = score_text_nodes(soup)
+    for div in soup.find_all('div'):
+        score = scores[id(div)]
+        if score["keyword"] and score["chars"] > 200:
+            # Make sure this isn't just the problem statement
+            if not score["input_format"] or score["newlines"] > 20:
+                return div
+    return None
+
+EDITORIAL_PAGE_CONTAINERS = SoupStrainer('div', class_=re.compile(r'editorial|content|post', re.IGNORECASE))
+
 def fetch_editorial_from_link(editorial_url: str) -> Optional[str]:
     """
     Fetch editorial content from a separate editorial page/link.
     Used when the editorial is not on the problem page itself.
     """
-    driver = None
     try:
-        driver = setup_selenium_driver()
-        
         if not editorial_url.startswith('http'):
             editorial_url = f"https://www.codechef.com{editorial_url}"
         
         print(f"Fetching editorial from link: {editorial_url}")
-        driver.get(editorial_url)
-        
-        time.sleep(4)  # Wait for content
+        page = fetch_page(editorial_url, "codechef_editorial")
+        if page["status"] and page["status"] != 200:
+            raise Exception(f"HTTP {page['status']} for {editorial_url}")
+        html = page["html"]
         
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = parse(html, "codechef_editorial_page", EDITORIAL_PAGE_CONTAINERS)
         
         # Extract main content
         content = soup.find('div', class_=re.compile(r'editorial|content|post', re.IGNORECASE))
         if content:
             text = content.get_text(separator="\n", strip=True)
-            driver.quit()
             return clean_editorial_text(text)
         
         # Fallback: get all text
         text = soup.get_text(separator="\n", strip=True)
-        driver.quit()
         return clean_editorial_text(text[:15000])
         
     except Exception as e:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
         print(f"Error fetching editorial link: {e}")
         return None
 
 def clean_editorial_text(text: str) -> str:
     """
-    Clean up editorial text to make it more readable.
-    Removes excessive whitespace, cleans up formatting artifacts, etc.
+    Clean up the editorial text to make it more readable.
+    Uses the shared cleaner with the CodeChef profile.
     """
-    if not text:
-        return ""
-    
-    # Remove excessive newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    
-    # Remove excessive spaces
-    text = re.sub(r' {2,}', ' ', text)
-    
-    # Clean up common artifacts
-    text = text.replace('\\n', ' ')
-    text = re.sub(r'\s+([,.])', r'\1', text)
-    
-    # Remove lines with only special characters or very short lines that are likely artifacts
-    lines = text.split('\n')
-    cleaned_lines = []
-    
-    for line in lines:
-        stripped = line.strip()
-        
-        # Keep empty lines for paragraph breaks
-        if not stripped:
-            if cleaned_lines and cleaned_lines[-1].strip():
-                cleaned_lines.append('')
-            continue
-        
-        # Skip very short lines that are likely artifacts (but keep single-letter problem labels)
-        if len(stripped) <= 2 and not re.match(r'^[A-Z]$|^\d+$', stripped):
-            continue
-        
-        cleaned_lines.append(line)
-    
-    text = '\n'.join(cleaned_lines)
-    
-    # Final cleanup
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    
-    # Remove leading/trailing whitespace from each line
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
-    
-    return text.strip()
+    return editorial_cleaner.clean_editorial_text(text, "codechef")
 
 def get_editorial(problem_url: str) -> Dict:
     """
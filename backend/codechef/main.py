@@ -5,6 +5,8 @@ from typing import Optional
 from dotenv import load_dotenv
 import os
 import cc_editorial as cce
+import scrape_cache  # on sys.path via cc_editorial
+import single_flight
 
 # Load environment variables from .env
 load_dotenv()
@@ -38,6 +40,8 @@ app.add_middleware(
 
 class InputURL(BaseModel):
     problem_url: str
+    # Re-check problems cached as having no editorial
+    bypass_negative_cache: bool = False
 
 
 @app.get("/")
@@ -59,8 +63,9 @@ def generate_hints(input_data: InputURL):
     
     problem_code = parsed["problem_code"]
     
-    # Fetch editorial from Discuss forum
-    result = cce.fetch_discuss_explanations(problem_code)
+    # Fetch editorial from Discuss forum (hints only use the best-ranked post)
+    with scrape_cache.request_scope(bypass_negative=input_data.bypass_negative_cache) as cache_scope:
+        result = cce.fetch_discuss_explanations(problem_code, first_only=True)
     
     if "error" in result:
         return {"error": result["error"]}
@@ -69,7 +74,8 @@ def generate_hints(input_data: InputURL):
         return {
             "error": "Editorial not available for this problem",
             "message": "No editorial found in CodeChef Discuss forum for this problem.",
-            "problem_code": problem_code
+            "problem_code": problem_code,
+            "negative_cache_hit": bool(cache_scope["negative_hits"])
         }
     
     # Get the first (most relevant) editorial post
@@ -101,25 +107,27 @@ Now generate clear, structured hints:
 """
 
     # Generate hints using AI
-    try:
+    def ask_llm():
         if USE_GEMINI:
             # --- Gemini Path ---
             model = genai.GenerativeModel("gemini-2.0-flash-exp")
             response = model.generate_content(prompt)
-            hints = response.text.strip()
-
-        else:
-            # --- OpenAI Path ---
-            completion = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI tutor for competitive programming."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=700,
-                temperature=0.7
-            )
-            hints = completion.choices[0].message.content.strip()
+            return response.text.strip()
+        # --- OpenAI Path ---
+        completion = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful AI tutor for competitive programming."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=700,
+            temperature=0.7
+        )
+        return completion.choices[0].message.content.strip()
+
+    try:
+        # Students asking about the same problem at once share one LLM call
+        hints = single_flight.do(f"codechef:{problem_code}:hints:codechef:{single_flight.digest(prompt)}", ask_llm)
 
         return {
             "problem": metadata,
@@ -133,7 +141,7 @@ Now generate clear, structured hints:
 
 
 @app.get("/fetch/editorial")
-def fetch_editorial(problem_url: Optional[str] = Query(None)):
+def fetch_editorial(problem_url: Optional[str] = Query(None), bypass_negative_cache: bool = Query(False)):
     """
     Fetch editorial from CodeChef Discuss forum.
     """
@@ -148,9 +156,10 @@ def fetch_editorial(problem_url: Optional[str] = Query(None)):
     problem_code = parsed["problem_code"]
     
     # Fetch from Discuss
-    result = cce.fetch_discuss_explanations(problem_code)
+    with scrape_cache.request_scope(bypass_negative=bypass_negative_cache) as cache_scope:
+        result = cce.fetch_discuss_explanations(problem_code)
     
-    return result
+    return {**result, "negative_cache_hit": bool(cache_scope["negative_hits"])}
 
 
 @app.get("/metadata")
@@ -170,11 +179,8 @@ def get_metadata(problem_url: Optional[str] = Query(None)):
         problem_code = parsed["problem_code"]
         contest_code = parsed.get("contest_code")
         
-        # Fetch page
-        html = cce.fetch_problem_page(problem_code, contest_code)
-        
-        # Extract only metadata
-        metadata = cce.extract_problem_metadata(html, problem_code)
+        # Metadata from the problem API, page scrape as fallback
+        metadata = cce.get_problem_metadata(problem_code, contest_code)
         
         return {
             "problem": metadata,
@@ -0,0 +1,102 @@
+# cf_api_cache.py
+"""
+In-process response cache for Codeforces API calls.
+
+Entries are keyed on (method, params) with the signing noise (apiKey,
+apiSig, time) stripped, so authenticated and anonymous calls for the same
+data share one entry. The TTL depends on the method and, for contest
+methods, on the contest phase: a finished contest's problem list never
+changes, a running contest's can.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+MAX_ENTRIES = 1024
+
+# Params that change on every signed call and say nothing about the data
+NOISE_PARAMS = {"apiKey", "apiSig", "time"}
+
+FOREVER = 30 * 24 * 3600  # effectively permanent; bounded only so memory churns eventually
+
+# contest phase -> TTL for contest.* responses
+CONTEST_PHASE_TTL = {
+    "FINISHED": FOREVER,
+    "PENDING_SYSTEM_TEST": 300,
+    "SYSTEM_TEST": 120,
+    "CODING": 60,
+    "BEFORE": 60,
+}
+
+METHOD_TTL = {
+    "user.blogEntries": 600,
+    "blogEntry.view": 3600,
+    "contest.list": 3600,
+    "problemset.problems": 3600,
+    "user.info": 300,
+}
+
+DEFAULT_TTL = 60
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Tuple, Tuple[float, dict]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "stored": 0}
+
+
+def cache_key(method: str, params: Optional[dict]) -> Tuple:
+    clean = {k: str(v) for k, v in (params or {}).items() if k not in NOISE_PARAMS}
+    return (method,) + tuple(sorted(clean.items()))
+
+
+def ttl_for(method: str, response: dict) -> int:
+    """Seconds a successful response for `method` may be served from cache."""
+    if method.startswith("contest."):
+        result = response.get("result")
+        contest = result.get("contest") if isinstance(result, dict) else None
+        if contest:
+            return CONTEST_PHASE_TTL.get(contest.get("phase"), DEFAULT_TTL)
+    return METHOD_TTL.get(method, DEFAULT_TTL)
+
+
+def get(method: str, params: Optional[dict]) -> Optional[dict]:
+    key = cache_key(method, params)
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry[0] > time.time():
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[1]
+        if entry:
+            del _entries[key]
+        _stats["misses"] += 1
+    return None
+
+
+def put(method: str, params: Optional[dict], response: dict):
+    """Store a response; FAILED responses are never cached."""
+    if response.get("status") != "OK":
+        return
+    key = cache_key(method, params)
+    expires = time.time() + ttl_for(method, response)
+    with _lock:
+        _entries[key] = (expires, response)
+        _entries.move_to_end(key)
+        _stats["stored"] += 1
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def cached_call(method: str, params: Optional[dict], fetch: Callable[[], dict]) -> dict:
+    """Return the cached response for (method, params) or fetch and store it."""
+    cached = get(method, params)
+    if cached is not None:
+        return cached
+    response = fetch()
+    put(method, params, response)
+    return response
+
+
+def cache_stats() -> Dict:
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
@@ -0,0 +1,413 @@
+# cf_catalog.py
+"""
+Local Codeforces problemset / contest catalog backed by a memory-mapped index.
+
+Built from the bulk `problemset.problems` and `contest.list` API calls and
+written to one compact file that every uvicorn worker maps read-only, so a
+metadata lookup is a hash probe in shared page cache instead of a live
+`contest.standings` call.
+
+File layout (little endian):
+    header   magic(8) | 3 x (slot_count u32, table_offset u64) | records_offset u64
+    tables   problems, contests, rounds - open addressing, 16-byte slots:
+             key_hash u64 | record_offset u32 | record_len u32   (len 0 = empty)
+    records  UTF-8 JSON, each carrying its own "_key" to resolve collisions
+
+Keys: problems "1741/B"; contests "id:1741" and "name:<lowercased name>";
+rounds "826" / "educational-150" -> list of contest ids (see round_key()).
+
+Configuration (environment variables):
+    CF_CATALOG_PATH         index file (default codeforces/data/cf_catalog.idx)
+    CF_CATALOG_MAX_AGE      seconds before a background refresh (default 21600)
+"""
+import os
+import re
+import json
+import mmap
+import struct
+import hashlib
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+import http_client
+import cf_rate_limiter
+from file_lock import FileLock
+
+CF_API_BASE = "https://codeforces.com/api"
+
+CATALOG_PATH = os.getenv(
+    "CF_CATALOG_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cf_catalog.idx")
+)
+MAX_AGE = int(os.getenv("CF_CATALOG_MAX_AGE", str(6 * 3600)))
+
+MAGIC = b"CFCAT001"
+HEADER = struct.Struct("<8s" + "IQ" * 3 + "Q")
+SLOT = struct.Struct("<QII")
+
+TABLE_PROBLEMS = 0
+TABLE_CONTESTS = 1
+TABLE_ROUNDS = 2
+
+ROUND_PATTERN = re.compile(r'Round #?(\d+)', re.IGNORECASE)
+
+# How often a worker checks whether another process replaced the file
+REMAP_CHECK_INTERVAL = 30
+
+
+def _key_hash(key: str) -> int:
+    value = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+    return value or 1
+
+
+def extract_round_number(contest_name: str) -> Optional[str]:
+    """'Codeforces Round 826 (Div. 3)' -> '826'"""
+    match = ROUND_PATTERN.search(contest_name or "")
+    return match.group(1) if match else None
+
+
+def round_key(title: str) -> Optional[str]:
+    """
+    Key grouping the contests (Div. 1 / Div. 2 ...) of one round, from a
+    contest name or an editorial title. Educational rounds are numbered
+    separately, so they get their own prefix.
+    """
+    number = extract_round_number(title)
+    if not number:
+        return None
+    return f"educational-{number}" if "educational" in (title or "").lower() else number
+
+
+# ---------- writing ----------
+
+def _build_table(items: Dict[str, dict], records: bytearray) -> bytes:
+    slot_count = 1
+    while slot_count < max(2 * len(items), 8):
+        slot_count *= 2
+
+    slots = [None] * slot_count
+    for key, value in items.items():
+        payload = json.dumps({"_key": key, **value}, separators=(",", ":")).encode("utf-8")
+        offset = len(records)
+        records.extend(payload)
+        key_hash = _key_hash(key)
+        pos = key_hash & (slot_count - 1)
+        while slots[pos] is not None:
+            pos = (pos + 1) & (slot_count - 1)
+        slots[pos] = (key_hash, offset, len(payload))
+
+    table = bytearray()
+    for slot in slots:
+        table.extend(SLOT.pack(*(slot or (0, 0, 0))))
+    return bytes(table)
+
+
+def write_catalog(problems: Dict[str, dict], contests: Dict[str, dict], path: str = CATALOG_PATH):
+    """
+    Serialize the catalog and atomically replace the index file.
+
+    problems: "contestId/index" -> problem API object
+    contests: contest id (str) -> contest API object
+    """
+    contest_items = {}
+    rounds: Dict[str, List[int]] = {}
+    for contest_id, contest in contests.items():
+        contest_items[f"id:{contest_id}"] = contest
+        if contest.get("name"):
+            contest_items[f"name:{contest['name'].lower()}"] = {"id": contest.get("id")}
+        key = round_key(contest.get("name", ""))
+        if key:
+            rounds.setdefault(key, []).append(contest.get("id"))
+
+    round_items = {key: {"contestIds": sorted(ids)} for key, ids in rounds.items()}
+
+    records = bytearray()
+    tables = [
+        _build_table({key: {"problem": p} for key, p in problems.items()}, records),
+        _build_table(contest_items, records),
+        _build_table(round_items, records),
+    ]
+
+    header_fields = [MAGIC]
+    offset = HEADER.size
+    for table in tables:
+        header_fields.extend([len(table) // SLOT.size, offset])
+        offset += len(table)
+    header_fields.append(offset)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(*header_fields))
+        for table in tables:
+            f.write(table)
+        f.write(records)
+    os.replace(tmp_path, path)
+
+
+# ---------- reading ----------
+
+class CatalogIndex:
+    """Read-only view over a mapped catalog file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        fields = HEADER.unpack_from(self._map, 0)
+        if fields[0] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a catalog index")
+        self._tables = [(fields[1], fields[2]), (fields[3], fields[4]), (fields[5], fields[6])]
+        self._records_offset = fields[7]
+        stat = os.fstat(self._file.fileno())
+        self.identity = (stat.st_ino, stat.st_mtime_ns)
+        self.built_at = stat.st_mtime
+
+    def close(self):
+        try:
+            self._map.close()
+        finally:
+            self._file.close()
+
+    def _record(self, offset: int, length: int) -> dict:
+        start = self._records_offset + offset
+        return json.loads(self._map[start:start + length])
+
+    def get(self, table: int, key: str) -> Optional[dict]:
+        slot_count, table_offset = self._tables[table]
+        if not slot_count:
+            return None
+        key_hash = _key_hash(key)
+        pos = key_hash & (slot_count - 1)
+        for _ in range(slot_count):
+            stored_hash, offset, length = SLOT.unpack_from(self._map, table_offset + pos * SLOT.size)
+            if length == 0:
+                return None
+            if stored_hash == key_hash:
+                record = self._record(offset, length)
+                if record.get("_key") == key:
+                    return record
+            pos = (pos + 1) & (slot_count - 1)
+        return None
+
+    def slot_count(self, table: int) -> int:
+        return self._tables[table][0]
+
+    def iter_records(self, table: int) -> Iterator[dict]:
+        slot_count, table_offset = self._tables[table]
+        for pos in range(slot_count):
+            _, offset, length = SLOT.unpack_from(self._map, table_offset + pos * SLOT.size)
+            if length:
+                yield self._record(offset, length)
+
+
+_index: Optional[CatalogIndex] = None
+# The index replaced by the last remap; closed at the next one, when no reader still uses it
+_retired: Optional[CatalogIndex] = None
+_index_lock = threading.Lock()
+_last_remap_check = 0.0
+_refresh_lock = threading.Lock()
+
+
+def _current_index() -> Optional[CatalogIndex]:
+    """Map the catalog file, re-mapping if another process replaced it."""
+    global _index, _retired, _last_remap_check
+    now = time.time()
+    if _index is not None and now - _last_remap_check < REMAP_CHECK_INTERVAL:
+        return _index
+
+    with _index_lock:
+        _last_remap_check = now
+        try:
+            stat = os.stat(CATALOG_PATH)
+        except OSError:
+            return _index
+        if _index is None or _index.identity != (stat.st_ino, stat.st_mtime_ns):
+            try:
+                new_index = CatalogIndex(CATALOG_PATH)
+            except (OSError, ValueError) as e:
+                print(f"Could not map Codeforces catalog: {e}")
+                return _index
+            # Readers may still be using the old map, so it is closed one remap later
+            if _retired is not None:
+                _retired.close()
+            _retired = _index
+            _index = new_index
+        return _index
+
+
+def lookup_problem(contest_id, index: str) -> Optional[dict]:
+    """Problem API object for (contestId, index), or None on a miss."""
+    catalog = _current_index()
+    if catalog is None:
+        return None
+    record = catalog.get(TABLE_PROBLEMS, f"{contest_id}/{index}")
+    return record["problem"] if record else None
+
+
+def lookup_contest(contest_id) -> Optional[dict]:
+    catalog = _current_index()
+    if catalog is None:
+        return None
+    record = catalog.get(TABLE_CONTESTS, f"id:{contest_id}")
+    if record:
+        record.pop("_key", None)
+    return record
+
+
+def lookup_contest_by_name(name: str) -> Optional[dict]:
+    catalog = _current_index()
+    if catalog is None:
+        return None
+    record = catalog.get(TABLE_CONTESTS, f"name:{name.lower()}")
+    return lookup_contest(record["id"]) if record else None
+
+
+def lookup_round(key) -> List[int]:
+    """Contest ids for a round_key() (Div. 1 and Div. 2 share one)."""
+    catalog = _current_index()
+    if catalog is None:
+        return []
+    record = catalog.get(TABLE_ROUNDS, str(key))
+    return record["contestIds"] if record else []
+
+
+def round_number_for_contest(contest_id) -> Optional[str]:
+    contest = lookup_contest(contest_id)
+    return extract_round_number(contest.get("name", "")) if contest else None
+
+
+def finished_contests_since(since: float) -> List[dict]:
+    """Finished contests that started after the given timestamp, newest first."""
+    catalog = _current_index()
+    if catalog is None:
+        return []
+    contests = []
+    for record in catalog.iter_records(TABLE_CONTESTS):
+        if not record["_key"].startswith("id:"):
+            continue
+        if record.get("phase") == "FINISHED" and record.get("startTimeSeconds", 0) >= since:
+            record.pop("_key")
+            contests.append(record)
+    contests.sort(key=lambda c: c.get("startTimeSeconds", 0), reverse=True)
+    return contests
+
+
+# ---------- building / refreshing ----------
+
+def _api(method: str, params: dict = None) -> dict:
+    # Catalog builds are background work: interactive API calls go first
+    for attempt in range(2):
+        cf_rate_limiter.acquire(cf_rate_limiter.BACKGROUND)
+        r = http_client.get(f"{CF_API_BASE}/{method}", params=params, timeout=60)
+        data = r.json()
+        if not cf_rate_limiter.is_call_limit_exceeded(data):
+            break
+        cf_rate_limiter.penalize()
+    if data.get("status") != "OK":
+        raise RuntimeError(f"{method} failed: {data.get('comment')}")
+    return data["result"]
+
+
+def build_catalog():
+    """Full rebuild from problemset.problems + contest.list."""
+    contests = {str(c["id"]): c for c in _api("contest.list")}
+    problems = {}
+    for p in _api("problemset.problems")["problems"]:
+        if "contestId" in p:
+            problems[f"{p['contestId']}/{p['index']}"] = p
+    write_catalog(problems, contests)
+    print(f"Built Codeforces catalog: {len(problems)} problems, {len(contests)} contests")
+
+
+def refresh_catalog():
+    """
+    Incremental refresh: re-read contest.list and fetch problems only for
+    contests that are new or whose phase changed since the last build.
+    Falls back to a full build when there is no catalog yet.
+    """
+    catalog = _current_index()
+    if catalog is None:
+        build_catalog()
+        return
+
+    contests = {}
+    for record in catalog.iter_records(TABLE_CONTESTS):
+        if record["_key"].startswith("id:"):
+            record.pop("_key")
+            contests[str(record["id"])] = record
+    problems = {}
+    for record in catalog.iter_records(TABLE_PROBLEMS):
+        problems[record["_key"]] = record["problem"]
+
+    changed = []
+    for contest in _api("contest.list"):
+        contest_id = str(contest["id"])
+        known = contests.get(contest_id)
+        if known is None or known.get("phase") != contest.get("phase"):
+            changed.append(contest_id)
+        contests[contest_id] = contest
+
+    for contest_id in changed:
+        if contests[contest_id].get("phase") == "BEFORE":
+            continue
+        try:
+            result = _api("contest.standings", {"contestId": contest_id, "from": "1", "count": "1"})
+        except Exception as e:
+            print(f"Catalog refresh skipped contest {contest_id}: {e}")
+            continue
+        for p in result.get("problems", []):
+            problems[f"{contest_id}/{p['index']}"] = p
+
+    write_catalog(problems, contests)
+    print(f"Refreshed Codeforces catalog: {len(changed)} new or changed contests")
+
+
+def _is_fresh() -> bool:
+    try:
+        return time.time() - os.stat(CATALOG_PATH).st_mtime < MAX_AGE
+    except OSError:
+        return False
+
+
+def ensure_fresh_async():
+    """
+    Kick off a background build/refresh if the catalog is missing or stale.
+    A file lock next to the catalog makes sure only one worker on the
+    machine rebuilds it; the others map the new file when it appears.
+    """
+    if _is_fresh():
+        return
+
+    def run():
+        if not _refresh_lock.acquire(blocking=False):
+            return
+        file_lock = FileLock(CATALOG_PATH + ".lock")
+        try:
+            if not file_lock.acquire(blocking=False):
+                return
+            # Another worker may have finished a refresh just before we got the lock
+            if not _is_fresh():
+                refresh_catalog()
+        except Exception as e:
+            print(f"Codeforces catalog refresh failed: {e}")
+        finally:
+            file_lock.release()
+            _refresh_lock.release()
+
+    threading.Thread(target=run, name="cf-catalog-refresh", daemon=True).start()
+
+
+def catalog_stats() -> Dict:
+    catalog = _current_index()
+    if catalog is None:
+        return {"loaded": False, "path": CATALOG_PATH}
+    return {
+        "loaded": True,
+        "path": CATALOG_PATH,
+        "built_at": int(catalog.built_at),
+        "problem_slots": catalog.slot_count(TABLE_PROBLEMS),
+        "contest_slots": catalog.slot_count(TABLE_CONTESTS),
+    }
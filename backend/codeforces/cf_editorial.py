@@ -1,20 +1,36 @@
 # cf_editorial.py
 import re
-import requests
 import time
 import hashlib
 import random
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from typing import Optional, Dict
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+# Shared scraping helpers live in backend/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+
+import http_client
+import editorial_cleaner
+from html_parsing import parse
+import cookie_jar
+import cf_api_cache
+import cf_catalog
+import cf_rate_limiter
+import editorial_index
+from editorial_sections import extract_problem_section
+import section_store
+import scrape_cache
+from browser_pool import get_pool
+from page_readiness import load_page
+from tiered_fetcher import fetch_page
 
 # Load environment variables
 load_dotenv()
@@ -23,15 +39,6 @@ CF_API_BASE = "https://codeforces.com/api"
 CF_API_KEY = os.getenv("CODEFORCES_API_KEY")
 CF_API_SECRET = os.getenv("CODEFORCES_API_SECRET")
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,/;q=0.8",
-    "Accept-Language": "en-US,en;q=0.9",
-    "Accept-Encoding": "gzip, deflate, br",
-    "Connection": "keep-alive",
-    "Upgrade-Insecure-Requests": "1"
-}
-
 def generate_api_sig(method_name: str, params: dict) -> str:
     """
     Generate API signature for authenticated Codeforces API calls.
@@ -52,110 +59,196 @@ def generate_api_sig(method_name: str, params: dict) -> str:
     
     return rand, sig_hash
 
-def call_cf_api_authenticated(method: str, params: dict = None) -> dict:
+def call_cf_api_authenticated(method: str, params: dict = None, priority: int = cf_rate_limiter.INTERACTIVE) -> dict:
     """
-    Make an authenticated call to Codeforces API
+    Make an authenticated call to Codeforces API.
+    Responses are served from cf_api_cache while fresh; everything else waits
+    for the shared rate limiter (background callers pass BACKGROUND priority).
     """
     if params is None:
         params = {}
     
-    # Add API key
-    params['apiKey'] = CF_API_KEY
-    params['time'] = str(int(time.time()))
-    
-    # Generate signature
-    rand, sig = generate_api_sig(method, params)
-    params['apiSig'] = f"{rand}{sig}"
+    cached = cf_api_cache.get(method, params)
+    if cached is not None:
+        return cached
     
     url = f"{CF_API_BASE}/{method}"
     
     try:
-        r = requests.get(url, params=params, timeout=10)
-        return r.json()
+        for attempt in range(2):
+            # Add API key
+            params['apiKey'] = CF_API_KEY
+            params['time'] = str(int(time.time()))
+            
+            # Generate signature
+            rand, sig = generate_api_sig(method, {k: v for k, v in params.items() if k != 'apiSig'})
+            params['apiSig'] = f"{rand}{sig}"
+            
+            cf_rate_limiter.acquire(priority)
+            r = http_client.get(url, params=params)
+            data = r.json()
+            if not cf_rate_limiter.is_call_limit_exceeded(data):
+                break
+            cf_rate_limiter.penalize()
+        cf_api_cache.put(method, params, data)
+        return data
     except Exception as e:
         return {"status": "FAILED", "error": str(e)}
 
+def call_cf_api(method: str, params: dict = None, priority: int = cf_rate_limiter.INTERACTIVE) -> dict:
+    """
+    Make an anonymous call to Codeforces API (shares cf_api_cache with the
+    authenticated calls).
+    """
+    def fetch():
+        for attempt in range(2):
+            cf_rate_limiter.acquire(priority)
+            r = http_client.get(f"{CF_API_BASE}/{method}", params=params)
+            data = r.json()
+            if not cf_rate_limiter.is_call_limit_exceeded(data):
+                break
+            cf_rate_limiter.penalize()
+        return data
+    
+    return cf_api_cache.cached_call(method, params, fetch)
+
 def search_blog_entries_for_contest(contest_id: str) -> list:
     """
     Search for blog entries that might contain editorial for the contest.
     Strategy: Get contest name, extract round number, search for editorials.
+    Raises when the search could not run to completion (contest info or an
+    author's blog list unavailable) and found nothing, so an empty list
+    always means "no editorial".
     """
     found_links = []
     
     # Step 1: Get the contest name to extract round number
-    contest_name = None
-    round_number = None
+    # The local catalog answers this without a network call when it knows the contest
+    contest = cf_catalog.lookup_contest(contest_id)
+    contest_name = contest.get("name") if contest else None
+    round_number = cf_catalog.extract_round_number(contest_name)
+    if round_number:
+        print(f"Round number (catalog): {round_number}")
     
-    try:
-        # Use contest.standings to get contest info (lighter than contest.list)
-        result = call_cf_api_authenticated("contest.standings", 
-                                          {"contestId": contest_id, "from": "1", "count": "1"})
-        if result.get("status") == "OK":
-            contest_info = result.get("result", {}).get("contest", {})
-            contest_name = contest_info.get("name", "")
-            print(f"Contest: {contest_name}")
-            
-            # Extract round number (e.g., "Round 826" from "Codeforces Round 826 (Div. 3)")
-            import re
-            match = re.search(r'Round (\d+)', contest_name)
-            if match:
-                round_number = match.group(1)
-                print(f"Round number: {round_number}")
-    except Exception as e:
-        print(f"Error getting contest info: {e}")
+    if not round_number:
+        try:
+            # Use contest.standings to get contest info (lighter than contest.list)
+            result = call_cf_api_authenticated("contest.standings", 
+                                              {"contestId": contest_id, "from": "1", "count": "1"})
+        except Exception as e:
+            raise Exception(f"Error getting contest info: {e}")
+        if result.get("status") != "OK":
+            raise Exception(f"contest.standings failed: {result.get('comment') or result.get('error')}")
+        contest_info = result.get("result", {}).get("contest", {})
+        contest_name = contest_info.get("name", "")
+        print(f"Contest: {contest_name}")
+        
+        # Extract round number (e.g., "Round 826" from "Codeforces Round 826 (Div. 3)")
+        round_number = cf_catalog.extract_round_number(contest_name)
+        if round_number:
+            print(f"Round number: {round_number}")
     
-    # Step 2: Search for editorial using round number
-    if round_number:
-        editorial_authors = ["awoo", "BledDest", "Neon", "vovuh"]
+    # Step 2: Search the editorial authors' blogs concurrently, stop at the first hit
+    # Titles are compared by round key, so Round 82 doesn't match "Round 826"
+    # and a regular round doesn't match the Educational round with its number
+    target_key = cf_catalog.round_key(contest_name)
+    if target_key:
+        authors = editorial_index.EDITORIAL_AUTHORS
+        found = threading.Event()
+        failures = []
         
-        for author in editorial_authors:
+        def scan(author):
+            if found.is_set():
+                return None
             try:
-                result = call_cf_api_authenticated("user.blogEntries", {"handle": author})
-                
-                if result.get("status") == "OK":
-                    entries = result.get("result", [])
-                    
-                    # Only check recent entries (last 50)
-                    for entry in entries[:50]:
-                        import re
-                        title = entry.get("title", "")
-                        title_clean = re.sub(r'<.*?>', '', title).lower()
-                        
-                        # Check if title contains the round number and editorial/tutorial
-                        if (round_number in title_clean and 
-                            ("editorial" in title_clean or "tutorial" in title_clean or "разбор" in title_clean)):
-                            
-                            blog_id = entry.get("id")
-                            blog_url = f"https://codeforces.com/blog/entry/{blog_id}"
-                            print(f"Found editorial: {re.sub(r'<.*?>', '', title)}")
-                            found_links.append(blog_url)
-                            break  # Found it, no need to check more entries from this author
-                            
-                time.sleep(0.2)  # Rate limiting
+                entries, complete = _author_editorial_entries(author)
+                for blog_id, title_clean in entries:
+                    if cf_catalog.round_key(title_clean) == target_key:
+                        print(f"Found editorial by {author}: {title_clean}")
+                        return f"https://codeforces.com/blog/entry/{blog_id}"
+                if not complete:
+                    failures.append(f"{author}: blog list unavailable")
             except Exception as e:
                 print(f"Error checking {author}: {e}")
-                continue
+                failures.append(f"{author}: {e}")
+            return None
+        
+        executor = ThreadPoolExecutor(max_workers=len(authors) or 1)
+        try:
+            futures = [executor.submit(scan, author) for author in authors]
+            for future in as_completed(futures):
+                blog_url = future.result()
+                if blog_url:
+                    found.set()
+                    found_links.append(blog_url)
+                    break
+        finally:
+            # Queued scans are dropped; running ones see `found` and finish quickly
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if not found_links and failures:
+            raise Exception("Editorial author scan incomplete: " + "; ".join(failures))
     
     return found_links
 
+# author -> {"entries": [(blog_id, cleaned lowercase title)] newest first, "last_id", "checked_at"}
+_author_entries = {}
+_author_entries_lock = threading.Lock()
+# author -> lock held across a refresh, so concurrent searches don't fetch and merge twice
+_author_refresh_locks = {}
+AUTHOR_REFRESH_INTERVAL = 600
+
+def _author_editorial_entries(author: str) -> tuple:
+    """
+    (editorial-looking blog entries of an author newest first, complete).
+    Refreshed at most every AUTHOR_REFRESH_INTERVAL seconds, and a refresh
+    only looks at entries newer than the last id already processed.
+    complete is False when the refresh failed and only older entries (or
+    none) could be served.
+    """
+    with _author_entries_lock:
+        refresh_lock = _author_refresh_locks.setdefault(author, threading.Lock())
+    
+    with refresh_lock:
+        with _author_entries_lock:
+            cached = _author_entries.get(author)
+            if cached and time.time() - cached["checked_at"] < AUTHOR_REFRESH_INTERVAL:
+                return cached["entries"], True
+    
+        result = call_cf_api_authenticated("user.blogEntries", {"handle": author})
+        if result.get("status") != "OK":
+            print(f"user.blogEntries failed for {author}: {result.get('comment') or result.get('error')}")
+            # Serve what we have rather than nothing
+            return (cached["entries"] if cached else []), False
+    
+        last_id = cached["last_id"] if cached else 0
+        new_entries = []
+        for entry in result.get("result", []):
+            blog_id = entry.get("id", 0)
+            if blog_id <= last_id:
+                continue
+            title_clean = re.sub(r'<.*?>', '', entry.get("title", "")).lower()
+            if "editorial" in title_clean or "tutorial" in title_clean or "разбор" in title_clean:
+                new_entries.append((blog_id, title_clean))
+    
+        new_entries.sort(reverse=True)
+        with _author_entries_lock:
+            previous = _author_entries.get(author, {}).get("entries", [])
+            ids = [entry.get("id", 0) for entry in result.get("result", [])]
+            _author_entries[author] = {
+                "entries": new_entries + previous,
+                "last_id": max(ids + [last_id]),
+                "checked_at": time.time()
+            }
+            return _author_entries[author]["entries"], True
+
 def get_tutorial_link_with_selenium(contest_id: str, index: str) -> Optional[str]:
     """
     Use Selenium to fetch the problem page and find the tutorial link.
-    Returns the tutorial blog URL if found.
+    Returns the tutorial blog URL if found, None if a loaded problem page
+    has no tutorial link. Raises when no problem page could be loaded.
     """
     try:
-        # Setup Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Run in background
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        # Initialize driver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
         # Try both contest and problemset URLs
         urls_to_try = [
             f"https://codeforces.com/contest/{contest_id}/problem/{index}",
@@ -163,226 +256,130 @@ def get_tutorial_link_with_selenium(contest_id: str, index: str) -> Optional[str
         ]
         
         tutorial_url = None
+        pages_checked = 0
         
-        for url in urls_to_try:
-            try:
-                print(f"Fetching with Selenium: {url}")
-                driver.get(url)
-                time.sleep(2)  # Wait for page to load
-                
-                # Look for tutorial link
-                # Common patterns: text="Tutorial", text="Editorial", contains "blog/entry"
+        with get_pool().driver() as driver:
+            for url in urls_to_try:
                 try:
-                    # Try to find link with text "Tutorial"
-                    tutorial_link = driver.find_element(By.LINK_TEXT, "Tutorial")
-                    tutorial_url = tutorial_link.get_attribute("href")
-                    print(f"Found tutorial link: {tutorial_url}")
-                    break
-                except:
-                    pass
-                
-                try:
-                    # Try partial link text
-                    tutorial_link = driver.find_element(By.PARTIAL_LINK_TEXT, "Tutorial")
-                    tutorial_url = tutorial_link.get_attribute("href")
-                    print(f"Found tutorial link: {tutorial_url}")
-                    break
-                except:
-                    pass
-                
-                # If not found, look for any link with "blog/entry" or "blog/" in page
-                try:
-                    page_source = driver.page_source
-                    soup = BeautifulSoup(page_source, "html.parser")
+                    print(f"Fetching with Selenium: {url}")
+                    if not load_page(driver, url, "codeforces_problem")["ready"]:
+                        print(f"Problem page did not render: {url}")
+                        continue
+                    pages_checked += 1
+                    
+                    # Look for tutorial link
+                    # Common patterns: text="Tutorial", text="Editorial", contains "blog/entry"
+                    try:
+                        # Try to find link with text "Tutorial"
+                        tutorial_link = driver.find_element(By.LINK_TEXT, "Tutorial")
+                        tutorial_url = tutorial_link.get_attribute("href")
+                        print(f"Found tutorial link: {tutorial_url}")
+                        break
+                    except:
+                        pass
+                    
+                    try:
+                        # Try partial link text
+                        tutorial_link = driver.find_element(By.PARTIAL_LINK_TEXT, "Tutorial")
+                        tutorial_url = tutorial_link.get_attribute("href")
+                        print(f"Found tutorial link: {tutorial_url}")
+                        break
+                    except:
+                        pass
                     
-                    for a in soup.find_all("a", href=True):
-                        text = a.get_text(strip=True).lower()
-                        href = a.get("href", "")
+                    # If not found, look for any link with "blog/entry" or "blog/" in page
+                    try:
+                        page_source = driver.page_source
+                        # Only the links matter here
+                        soup = parse(page_source, "cf_problem_links", SoupStrainer("a", href=True), fallback=False)
                         
-                        # Look for tutorial/editorial links that point to blog
-                        if ("tutorial" in text or "editorial" in text) and ("/blog/" in href):
-                            if href.startswith("/"):
-                                tutorial_url = "https://codeforces.com" + href
-                            else:
-                                tutorial_url = href
-                            print(f"Found tutorial link in page source: {tutorial_url}")
+                        for a in soup.find_all("a", href=True):
+                            text = a.get_text(strip=True).lower()
+                            href = a.get("href", "")
+                            
+                            # Look for tutorial/editorial links that point to blog
+                            if ("tutorial" in text or "editorial" in text) and ("/blog/" in href):
+                                if href.startswith("/"):
+                                    tutorial_url = "https://codeforces.com" + href
+                                else:
+                                    tutorial_url = href
+                                print(f"Found tutorial link in page source: {tutorial_url}")
+                                break
+                        
+                        if tutorial_url:
                             break
+                    except Exception as e:
+                        print(f"Error parsing page source: {e}")
                     
-                    if tutorial_url:
-                        break
                 except Exception as e:
-                    print(f"Error parsing page source: {e}")
-                
-            except Exception as e:
-                print(f"Error loading {url}: {e}")
-                continue
-        
-        driver.quit()
-        return tutorial_url
+                    print(f"Error loading {url}: {e}")
+                    continue
         
     except Exception as e:
-        print(f"Selenium error: {e}")
-        return None
+        raise Exception(f"Selenium error: {e}")
+    
+    if not tutorial_url and not pages_checked:
+        raise Exception("Selenium could not load the problem page")
+    return tutorial_url
+
+# Blog body containers, in the order extract_blog_text tries them
+BLOG_CONTAINERS = SoupStrainer("div", class_=["ttypography", "topic", "content"])
+
+def extract_blog_text(page_source: str) -> str:
+    """
+    Pull the cleaned blog body out of a Codeforces blog page's HTML.
+    """
+    soup = parse(page_source, "cf_blog", BLOG_CONTAINERS)
+    
+    # Look for blog content - try multiple possible containers
+    content_div = soup.find("div", class_="ttypography")
+    if content_div:
+        text = content_div.get_text(separator="\n").strip()
+        return clean_editorial_text(text)
+    
+    # Try finding the main content area
+    content_div = soup.find("div", class_="topic")
+    if content_div:
+        text = content_div.get_text(separator="\n").strip()
+        return clean_editorial_text(text)
+    
+    # Try blog entry container
+    content_div = soup.find("div", class_="content")
+    if content_div:
+        text = content_div.get_text(separator="\n").strip()
+        return clean_editorial_text(text)
+    
+    # Fallback: get all text
+    text = soup.get_text(separator="\n").strip()
+    return clean_editorial_text(text[:20000])  # Limit to 20k chars
 
 def fetch_blog_text_with_selenium(blog_url: str) -> str:
     """
-    Use Selenium to fetch blog content (since direct requests are blocked).
+    Use Selenium to fetch blog content (forces the browser tier).
+    An unready render (still loading, or a challenge page) is reported as
+    an error and its cookies are not harvested.
     """
-    driver = None
     try:
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        # Suppress logs
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        print(f"Fetching blog with Selenium: {blog_url}")
-        driver.get(blog_url)
-        time.sleep(4)  # Wait for content to load (increased wait time)
-        
-        page_source = driver.page_source
-        
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(page_source, "html.parser")
-        
-        # Look for blog content - try multiple possible containers
-        content_div = soup.find("div", class_="ttypography")
-        if content_div:
-            text = content_div.get_text(separator="\n").strip()
-            driver.quit()
-            return clean_editorial_text(text)
-        
-        # Try finding the main content area
-        content_div = soup.find("div", class_="topic")
-        if content_div:
-            text = content_div.get_text(separator="\n").strip()
-            driver.quit()
-            return clean_editorial_text(text)
-        
-        # Try blog entry container
-        content_div = soup.find("div", class_="content")
-        if content_div:
-            text = content_div.get_text(separator="\n").strip()
-            driver.quit()
-            return clean_editorial_text(text)
+        with get_pool().driver() as driver:
+            print(f"Fetching blog with Selenium: {blog_url}")
+            if not load_page(driver, blog_url, "codeforces_blog")["ready"]:
+                return f"Error fetching blog with Selenium: page did not render: {blog_url}"
+            
+            page_source = driver.page_source
+            # Let later plain-HTTP fetches reuse this session's Cloudflare clearance
+            cookie_jar.harvest_from_driver(driver, http_client.get_session())
         
-        # Fallback: get all text
-        text = soup.get_text(separator="\n").strip()
-        driver.quit()
-        return clean_editorial_text(text[:20000])  # Limit to 20k chars
+        return extract_blog_text(page_source)
         
     except Exception as e:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
         return f"Error fetching blog with Selenium: {e}"
 
 def clean_editorial_text(text: str) -> str:
     """
     Clean up the editorial text to make it more readable.
-    Removes excessive newlines, cleans up LaTeX artifacts, etc.
+    Uses the shared cleaner with the Codeforces profile.
     """
-    import re
-    
-    # First pass: replace multiple consecutive newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    
-    # Clean up isolated variables and LaTeX artifacts
-    # Pattern: word \n single_char \n word -> word single_char word
-    text = re.sub(r'(\w)\s*\n\s*([A-Za-z])\s*\n\s*(\w)', r'\1 \2 \3', text)
-    
-    # Pattern: \n single_char \n -> remove the character if it's likely LaTeX variable
-    # But be careful not to remove problem indices (A, B, C at start of lines)
-    text = re.sub(r'(?<!^)(?<!\n)\n([a-z])\n(?!\n)', r' ', text, flags=re.MULTILINE)
-    
-    # Clean up code blocks and excessive whitespace in code
-    # Replace patterns like "(\n)" with "()" in code contexts
-    text = re.sub(r'\(\s*\n\s*\)', '()', text)
-    text = re.sub(r'\[\s*\n\s*\]', '[]', text)
-    text = re.sub(r'{\s*\n\s*}', '{}', text)
-    
-    # Clean up spaces before punctuation
-    text = re.sub(r'\s+([,.])', r'\1', text)
-    
-    # Remove literal \n strings
-    text = text.replace('\\n', ' ')
-    
-    # Clean up mathematical symbols
-    text = re.sub(r'\s*⋅\s*', ' * ', text)
-    text = re.sub(r'\s*≠\s*', ' != ', text)
-    text = re.sub(r'\s*≤\s*', ' <= ', text)
-    text = re.sub(r'\s*≥\s*', ' >= ', text)
-    text = re.sub(r'\s*→\s*', ' -> ', text)
-    
-    # Clean up lines with only single characters or short fragments
-    lines = text.split('\n')
-    cleaned_lines = []
-    skip_next = False
-    
-    for i, line in enumerate(lines):
-        if skip_next:
-            skip_next = False
-            continue
-            
-        stripped = line.strip()
-        
-        # Keep empty lines for paragraph breaks
-        if not stripped:
-            # Only add empty line if previous line wasn't empty
-            if cleaned_lines and cleaned_lines[-1].strip():
-                cleaned_lines.append('')
-            continue
-        
-        # Check if this is a problem header (like "1741A - Problem Name")
-        if re.match(r'^\d+[A-Z]\s*-', stripped):
-            # Add extra line break before problem headers for readability
-            if cleaned_lines and cleaned_lines[-1].strip():
-                cleaned_lines.append('')
-            cleaned_lines.append(line)
-            continue
-        
-        # Skip lines with only 1-2 characters that are likely LaTeX artifacts
-        # Exception: Keep lines that look like they're part of a list or important markers
-        if len(stripped) <= 2 and not re.match(r'^[A-Z]$|^\d+$|^-$|^\*$', stripped):
-            # Check if next line or previous line has content - if so, try to merge
-            if i < len(lines) - 1:
-                next_stripped = lines[i + 1].strip()
-                if next_stripped and len(next_stripped) > 3:
-                    # Merge with next line
-                    lines[i + 1] = stripped + ' ' + next_stripped
-                    continue
-            # Otherwise skip
-            continue
-        
-        cleaned_lines.append(line)
-    
-    text = '\n'.join(cleaned_lines)
-    
-    # Replace multiple spaces with single space
-    text = re.sub(r' {2,}', ' ', text)
-    
-    # Normalize paragraph breaks (max 2 newlines)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    
-    # Remove leading/trailing whitespace from each line
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
-    
-    # Final cleanup
-    text = re.sub(r' {2,}', ' ', text)
-    
-    return text.strip()
+    return editorial_cleaner.clean_editorial_text(text, "codeforces")
 
 def parse_problem_url(url: str) -> Optional[Dict[str,str]]:
     """
@@ -410,14 +407,24 @@ def parse_problem_url(url: str) -> Optional[Dict[str,str]]:
 
     return {"contest_id": m.group(1), "index": m.group(2)}
 
+@scrape_cache.cached("cf_problem_metadata", ttl=7 * 24 * 3600)
 def fetch_problem_metadata(contest_id: str, index: str) -> dict:
     """
     Uses Codeforces API to fetch problem metadata (name, tags, statement snippets).
+    The local catalog is consulted first; the API is only called on a miss.
     """
+    p = cf_catalog.lookup_problem(contest_id, index)
+    if p:
+        return {
+            "contestId": contest_id,
+            "index": index,
+            "name": p.get("name"),
+            "tags": p.get("tags"),
+            "problem_api_object": p
+        }
+
     # We can call problemset.problems and filter or call contest.standings to get exact problem.
-    url = f"{CF_API_BASE}/contest.standings?contestId={contest_id}&from=1&count=1"
-    r = requests.get(url, headers=HEADERS, timeout=10)
-    data = r.json()
+    data = call_cf_api("contest.standings", {"contestId": contest_id, "from": "1", "count": "1"})
     if data.get("status") != "OK":
         return {"error": "CF API failed", "raw": data}
 
@@ -435,36 +442,173 @@ def fetch_problem_metadata(contest_id: str, index: str) -> dict:
 
     return {"error": "Problem not found in contest.standings response", "raw_problems": problems}
 
+# "No editorial yet" is re-checked soon after a round and rarely for old ones:
+# (seconds since the contest ended, negative TTL), first match wins
+NO_EDITORIAL_TTL_BY_AGE = [
+    (6 * 3600, 10 * 60),
+    (2 * 24 * 3600, 3600),
+    (30 * 24 * 3600, 6 * 3600),
+]
+NO_EDITORIAL_TTL_OLD = 24 * 3600
+NO_EDITORIAL_TTL_UNKNOWN = 30 * 60
+
+def no_editorial_ttl(previous_ttl, contest_id, *args, **kwargs) -> int:
+    """Negative-cache TTL for a contest without editorial links, growing with its age."""
+    contest = cf_catalog.lookup_contest(contest_id)
+    if not contest or not contest.get("startTimeSeconds"):
+        return NO_EDITORIAL_TTL_UNKNOWN
+    if contest.get("phase") != "FINISHED":
+        return NO_EDITORIAL_TTL_BY_AGE[0][1]
+    age = time.time() - contest["startTimeSeconds"] - contest.get("durationSeconds", 0)
+    for max_age, ttl in NO_EDITORIAL_TTL_BY_AGE:
+        if age < max_age:
+            return ttl
+    return NO_EDITORIAL_TTL_OLD
+
+@scrape_cache.cached("cf_tutorial_links", ttl=6 * 3600, stale_ttl=7 * 24 * 3600,
+                     negative=lambda links: links == [], negative_ttl=no_editorial_ttl)
 def find_tutorial_links_for_problem(contest_id: str, index: str) -> list:
     """
     Find tutorial/editorial links for a problem using multiple methods:
+    0. Local contest -> editorial index (filled by the background crawler)
     1. Use Selenium to scrape problem page for tutorial link (primary method)
     2. Search blog entries via authenticated API (backup)
+    Whatever Selenium or the API finds is written back to the index.
+    Raises when nothing was found but a method failed, so a transient
+    failure is never cached as "no editorial".
     """
     found = set()
+    failures = []
+    
+    # Method 0: Local index hit, no network at all
+    indexed_link = editorial_index.lookup(contest_id)
+    if indexed_link:
+        print(f"✓ Found tutorial in editorial index: {indexed_link}")
+        return [indexed_link]
     
     # Method 1: Use Selenium to get tutorial link from problem page
     print(f"Using Selenium to find tutorial link for {contest_id}/{index}...")
-    selenium_link = get_tutorial_link_with_selenium(contest_id, index)
+    try:
+        selenium_link = get_tutorial_link_with_selenium(contest_id, index)
+    except Exception as e:
+        print(f"Selenium lookup failed: {e}")
+        failures.append(str(e))
+        selenium_link = None
     if selenium_link:
         found.add(selenium_link)
         print(f"✓ Found tutorial via Selenium: {selenium_link}")
+        editorial_index.record(contest_id, selenium_link, "selenium")
         # Return immediately since we found the direct link
         return sorted(found)
     
     # Method 2: Fallback to API search
     print(f"Selenium didn't find tutorial, trying API search...")
-    api_links = search_blog_entries_for_contest(contest_id)
+    try:
+        api_links = search_blog_entries_for_contest(contest_id)
+    except Exception as e:
+        print(f"API search failed: {e}")
+        failures.append(str(e))
+        api_links = []
     for link in api_links:
         found.add(link)
         print(f"Found via API: {link}")
+    if api_links:
+        editorial_index.record(contest_id, api_links[0], "api_search")
     
     print(f"Total editorial links found: {len(found)}")
+    if not found and failures:
+        raise Exception("Editorial lookup incomplete: " + "; ".join(failures))
     return sorted(found)
 
+def start_editorial_crawler():
+    """Start the background contest -> editorial index crawler."""
+    def background_call(method, params):
+        return call_cf_api_authenticated(method, params, priority=cf_rate_limiter.BACKGROUND)
+    
+    editorial_index.start_crawler(background_call)
+
+def blog_entry_id(blog_url: str) -> Optional[str]:
+    """Blog entry id from a https://codeforces.com/blog/entry/<id> URL."""
+    match = re.search(r'/blog/entry/(\d+)', blog_url or "")
+    return match.group(1) if match else None
+
+def fetch_blog_text_from_api(blog_url: str) -> Optional[str]:
+    """
+    Fetch a blog body through blogEntry.view (one JSON call, no page render).
+    The API returns the entry's HTML with formulas still in TeX.
+    Returns None when the API has nothing usable, so the caller can fall back.
+    """
+    entry_id = blog_entry_id(blog_url)
+    if not entry_id:
+        return None
+    
+    result = call_cf_api_authenticated("blogEntry.view", {"blogEntryId": entry_id})
+    if result.get("status") != "OK":
+        print(f"blogEntry.view failed for {entry_id}: {result.get('comment') or result.get('error')}")
+        return None
+    
+    content = result.get("result", {}).get("content") or ""
+    text = parse(content, "cf_blog_api").get_text(separator="\n").strip()
+    return clean_editorial_text(text) if text else None
+
+@scrape_cache.cached("cf_blog_text", ttl=6 * 3600, stale_ttl=30 * 24 * 3600,
+                     cacheable=lambda text: bool(text) and not text.startswith("Error fetching"))
 def fetch_blog_text(blog_url: str) -> str:
     """
-    Fetch blog content using Selenium (since direct requests are blocked).
+    Fetch blog content through the Codeforces API. Falls back to the page
+    over plain HTTP, escalating to Selenium only when Codeforces serves a
+    challenge page.
     """
-    return fetch_blog_text_with_selenium(blog_url)
+    try:
+        text = fetch_blog_text_from_api(blog_url)
+        if text:
+            print(f"Fetched blog via API: {blog_url}")
+            return text
+    except Exception as e:
+        print(f"Error fetching blog via API: {e}")
+    
+    try:
+        page = fetch_page(blog_url, "codeforces_blog")
+        print(f"Fetched blog via {page['tier']} in {page['elapsed']}s: {blog_url}")
+        if page["status"] and page["status"] != 200:
+            raise Exception(f"HTTP {page['status']}")
+        return extract_blog_text(page["html"])
+    except Exception as e:
+        return f"Error fetching blog: {e}"
 
+def fetch_problem_editorial(contest_id: str, index: str, problem_name: str = None) -> dict:
+    """
+    Editorial text for one problem, ready for a prompt.
+    Served from section_store when the round editorial was already ingested;
+    otherwise the editorial is fetched once and all its sections are stored.
+    Returns {"editorial_url", "text", "section", "source"} or {"error"}.
+    """
+    stored = section_store.get(contest_id, index, problem_name)
+    if stored:
+        return {**stored, "source": "store"}
+    
+    try:
+        tutorial_links = find_tutorial_links_for_problem(contest_id, index)
+    except Exception as e:
+        print(f"Editorial lookup failed: {e}")
+        return {"error": "Could not look up the editorial right now. Please try again."}
+    if not tutorial_links:
+        return {"error": "No editorial or tutorial links found for this problem."}
+    
+    editorial_url = tutorial_links[0]
+    editorial_text = fetch_blog_text(editorial_url)
+    if "Error fetching" in editorial_text:
+        return {"error": "Could not fetch editorial content. Please try again."}
+    
+    try:
+        section_store.ingest(contest_id, editorial_url, editorial_text)
+    except Exception as e:
+        print(f"Could not store editorial sections: {e}")
+    
+    section = extract_problem_section(editorial_text, contest_id, index, problem_name)
+    return {
+        "editorial_url": editorial_url,
+        "text": section or editorial_text,
+        "section": bool(section),
+        "source": "fetched"
+    }
@@ -0,0 +1,332 @@
+# editorial_index.py
+"""
+Persistent contestId -> editorial URL index, kept up to date by a crawler.
+
+Lookups are a dict hit on an in-memory copy of a small JSON file, so
+find_tutorial_links_for_problem only needs Selenium for contests the index
+has not seen yet. The file is shared by all workers on the machine; a file
+lock makes sure only one of them runs the crawler.
+
+The crawler does two incremental passes:
+1. Editorial authors' blogs (user.blogEntries): only entries newer than the
+   last seen id per author are looked at. An editorial title's round is
+   mapped to contest ids through the local catalog (Div. 1 + Div. 2).
+   Entries whose round the catalog doesn't know yet are kept in a retry
+   list and looked up again on later passes (for up to UNRESOLVED_RETRY_FOR).
+2. "Contest materials" sidebars of recently finished contests that are
+   still missing from the index, fetched over plain HTTP when possible.
+
+Configuration (environment variables):
+    CF_EDITORIAL_INDEX_PATH    index file (default codeforces/data/editorial_index.json)
+    CF_EDITORIAL_AUTHORS       comma-separated handles to crawl
+    CF_EDITORIAL_CRAWL_INTERVAL  seconds between crawl passes (default 1800)
+"""
+import os
+import re
+import json
+import time
+import threading
+from typing import Dict, Optional
+from bs4 import SoupStrainer
+
+import cf_catalog
+from file_lock import FileLock
+from html_parsing import parse
+from tiered_fetcher import fetch_page
+
+INDEX_PATH = os.getenv(
+    "CF_EDITORIAL_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "editorial_index.json")
+)
+EDITORIAL_AUTHORS = [
+    handle.strip()
+    for handle in os.getenv("CF_EDITORIAL_AUTHORS", "awoo,BledDest,Neon,vovuh").split(",")
+    if handle.strip()
+]
+CRAWL_INTERVAL = int(os.getenv("CF_EDITORIAL_CRAWL_INTERVAL", "1800"))
+
+# Contest materials pass: how far back to look, and how many pages per pass
+MATERIALS_LOOKBACK = 60 * 24 * 3600
+MATERIALS_PER_PASS = 20
+MATERIALS_RECHECK = 6 * 3600
+
+EDITORIAL_WORDS = ("editorial", "tutorial", "разбор")
+
+# How long an editorial whose round the catalog can't resolve is retried
+UNRESOLVED_RETRY_FOR = 14 * 24 * 3600
+
+# How often a worker checks whether the crawler rewrote the file
+RELOAD_CHECK_INTERVAL = 5
+
+_lock = threading.Lock()
+_data = {"contests": {}, "authors": {}, "materials_checked": {}, "unresolved": {}}
+# Unresolved entries this process added / dropped (resolved or gave up on) since its last save
+_unresolved_added = set()
+_unresolved_dropped = set()
+_loaded_mtime = None
+_last_reload_check = 0.0
+_crawler_started = False
+
+
+def _empty() -> Dict:
+    return {"contests": {}, "authors": {}, "materials_checked": {}, "unresolved": {}}
+
+
+def _reload_if_changed():
+    # Caller holds _lock
+    global _data, _loaded_mtime, _last_reload_check
+    now = time.time()
+    if _loaded_mtime is not None and now - _last_reload_check < RELOAD_CHECK_INTERVAL:
+        return
+    _last_reload_check = now
+    try:
+        mtime = os.stat(INDEX_PATH).st_mtime_ns
+    except OSError:
+        return
+    if mtime == _loaded_mtime:
+        return
+    try:
+        with open(INDEX_PATH, "r", encoding="utf-8") as f:
+            _data = {**_empty(), **json.load(f)}
+        _loaded_mtime = mtime
+    except (OSError, ValueError) as e:
+        print(f"Could not load editorial index: {e}")
+
+
+def _save():
+    """
+    Persist the index. Other workers may have written since we loaded, so
+    under the write lock the file on disk is merged in first.
+    Caller holds _lock.
+    """
+    global _loaded_mtime
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    with FileLock(INDEX_PATH + ".write.lock"):
+        try:
+            with open(INDEX_PATH, "r", encoding="utf-8") as f:
+                on_disk = json.load(f)
+        except (OSError, ValueError):
+            on_disk = {}
+        _data["contests"] = {**on_disk.get("contests", {}), **_data["contests"]}
+        for section in ("authors", "materials_checked"):
+            for key, value in on_disk.get(section, {}).items():
+                _data[section][key] = max(value, _data[section].get(key, 0))
+        # The disk copy wins, except for the entries this process added or dropped itself
+        unresolved = {k: v for k, v in on_disk.get("unresolved", {}).items() if k not in _unresolved_dropped}
+        for key in _unresolved_added - _unresolved_dropped:
+            if key in _data["unresolved"]:
+                unresolved.setdefault(key, _data["unresolved"][key])
+        _data["unresolved"] = unresolved
+        _unresolved_added.clear()
+        _unresolved_dropped.clear()
+
+        tmp_path = f"{INDEX_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_data, f)
+        os.replace(tmp_path, INDEX_PATH)
+        _loaded_mtime = os.stat(INDEX_PATH).st_mtime_ns
+
+
+def lookup(contest_id) -> Optional[str]:
+    """Editorial URL for a contest, or None if the index has not seen it."""
+    with _lock:
+        _reload_if_changed()
+        entry = _data["contests"].get(str(contest_id))
+    return entry["url"] if entry else None
+
+
+def record(contest_id, url: str, source: str):
+    """Add (or overwrite) a contest's editorial URL and persist the index."""
+    with _lock:
+        _reload_if_changed()
+        _data["contests"][str(contest_id)] = {"url": url, "source": source, "found_at": int(time.time())}
+        _save()
+
+
+def is_editorial_title(title: str) -> bool:
+    lowered = title.lower()
+    return any(word in lowered for word in EDITORIAL_WORDS)
+
+
+def _strip_tags(title: str) -> str:
+    return re.sub(r'<.*?>', '', title or "")
+
+
+# ---------- crawler ----------
+
+def crawl_author_blogs(api_call) -> int:
+    """
+    Pass 1: new editorial entries from the configured authors.
+    `api_call(method, params)` makes a (cached) Codeforces API call.
+    The per-author watermark moves past every entry seen; editorials the
+    catalog couldn't map to contests go to the "unresolved" retry list.
+    Returns the number of contests added.
+    """
+    added = 0
+    added += _retry_unresolved()
+    for author in EDITORIAL_AUTHORS:
+        result = api_call("user.blogEntries", {"handle": author})
+        if result.get("status") != "OK":
+            print(f"Editorial crawl: could not read {author}'s blog: {result.get('comment') or result.get('error')}")
+            continue
+
+        with _lock:
+            _reload_if_changed()
+            last_seen = _data["authors"].get(author, 0)
+
+        newest = last_seen
+        found = {}
+        unresolved = {}
+        for entry in result.get("result", []):
+            blog_id = entry.get("id", 0)
+            if blog_id <= last_seen:
+                continue
+            newest = max(newest, blog_id)
+            title = _strip_tags(entry.get("title", ""))
+            if not is_editorial_title(title):
+                continue
+            key = cf_catalog.round_key(title)
+            if not key:
+                continue
+            contest_ids = cf_catalog.lookup_round(key)
+            if not contest_ids:
+                # Catalog missing or older than the round; try again on later passes
+                unresolved[str(blog_id)] = {"author": author, "title": title, "first_seen": int(time.time())}
+            for contest_id in contest_ids:
+                found.setdefault(str(contest_id), f"https://codeforces.com/blog/entry/{blog_id}")
+
+        with _lock:
+            _reload_if_changed()
+            added += _add_found(found, f"blog:{author}")
+            for blog_id, pending in unresolved.items():
+                _data["unresolved"].setdefault(blog_id, pending)
+                _unresolved_added.add(blog_id)
+            _data["authors"][author] = newest
+            _save()
+    return added
+
+
+def _add_found(found: Dict[str, str], source: str) -> int:
+    # Caller holds _lock
+    added = 0
+    for contest_id, url in found.items():
+        if contest_id not in _data["contests"]:
+            _data["contests"][contest_id] = {"url": url, "source": source, "found_at": int(time.time())}
+            added += 1
+    return added
+
+
+def _retry_unresolved() -> int:
+    """Look up the rounds of previously unresolved editorials again. Returns contests added."""
+    with _lock:
+        _reload_if_changed()
+        pending = dict(_data["unresolved"])
+    if not pending:
+        return 0
+
+    now = time.time()
+    added = 0
+    with _lock:
+        for blog_id, item in pending.items():
+            key = cf_catalog.round_key(item["title"])
+            contest_ids = cf_catalog.lookup_round(key) if key else []
+            if contest_ids:
+                url = f"https://codeforces.com/blog/entry/{blog_id}"
+                added += _add_found({str(c): url for c in contest_ids}, f"blog:{item['author']}")
+                _data["unresolved"].pop(blog_id, None)
+                _unresolved_dropped.add(blog_id)
+            elif now - item.get("first_seen", 0) > UNRESOLVED_RETRY_FOR:
+                print(f"Editorial crawl: giving up on unresolved entry {blog_id}: {item['title']}")
+                _data["unresolved"].pop(blog_id, None)
+                _unresolved_dropped.add(blog_id)
+        _save()
+    return added
+
+
+def extract_materials_link(html: str) -> Optional[str]:
+    """Tutorial/editorial blog link from a contest page's "Contest materials" box."""
+    soup = parse(html, "cf_contest_materials", SoupStrainer("a", href=True), fallback=False)
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if "/blog/entry/" in href and is_editorial_title(a.get_text(strip=True)):
+            return "https://codeforces.com" + href if href.startswith("/") else href
+    return None
+
+
+def crawl_contest_materials() -> int:
+    """
+    Pass 2: recently finished contests missing from the index.
+    Returns the number of contests added.
+    """
+    now = time.time()
+    with _lock:
+        _reload_if_changed()
+        known = set(_data["contests"])
+        checked = dict(_data["materials_checked"])
+
+    candidates = [
+        c for c in cf_catalog.finished_contests_since(now - MATERIALS_LOOKBACK)
+        if str(c["id"]) not in known and now - checked.get(str(c["id"]), 0) > MATERIALS_RECHECK
+    ][:MATERIALS_PER_PASS]
+
+    added = 0
+    for contest in candidates:
+        contest_id = str(contest["id"])
+        try:
+            page = fetch_page(f"https://codeforces.com/contest/{contest_id}", "codeforces_problem")
+            url = extract_materials_link(page["html"])
+        except Exception as e:
+            print(f"Editorial crawl: contest {contest_id} failed: {e}")
+            url = None
+        with _lock:
+            _reload_if_changed()
+            _data["materials_checked"][contest_id] = int(now)
+            if url and contest_id not in _data["contests"]:
+                _data["contests"][contest_id] = {"url": url, "source": "materials", "found_at": int(now)}
+                added += 1
+            _save()
+    return added
+
+
+def crawl_once(api_call):
+    # The crawler maps rounds through the catalog; keep it from going stale in long-lived workers
+    cf_catalog.ensure_fresh_async()
+    blogs = crawl_author_blogs(api_call)
+    materials = crawl_contest_materials()
+    print(f"Editorial crawl: {blogs} contests from author blogs, {materials} from contest materials")
+
+
+def start_crawler(api_call):
+    """
+    Run the crawler in a daemon thread. Only the worker that holds the
+    crawler lock crawls; the others just read the shared index file.
+    """
+    global _crawler_started
+    with _lock:
+        if _crawler_started:
+            return
+        _crawler_started = True
+
+    def run():
+        crawler_lock = FileLock(INDEX_PATH + ".lock")
+        while not crawler_lock.acquire(blocking=False):
+            time.sleep(CRAWL_INTERVAL)
+        while True:
+            try:
+                crawl_once(api_call)
+            except Exception as e:
+                print(f"Editorial crawl failed: {e}")
+            time.sleep(CRAWL_INTERVAL)
+
+    threading.Thread(target=run, name="cf-editorial-crawler", daemon=True).start()
+
+
+def index_stats() -> Dict:
+    with _lock:
+        _reload_if_changed()
+        return {
+            "contests": len(_data["contests"]),
+            "authors": dict(_data["authors"]),
+            "unresolved": len(_data["unresolved"]),
+            "path": INDEX_PATH,
+        }
@@ -0,0 +1,127 @@
+# editorial_sections.py
+"""
+Split a round editorial (cleaned blog text) into per-problem sections.
+
+A Codeforces round editorial covers every problem of the round, but a hint
+request is about one of them. Sections start at problem headers such as
+"1741A - Sum", "A. Sum", "Problem A: Sum" or "Problem A". Inside a section,
+spoiler titles like "Hint 1", "Tutorial" or "Solution" show up as lines on
+their own; they split the section into sub-sections, so code can be left
+out of the prompt.
+"""
+import re
+from typing import Dict, List, Optional
+
+# "1741A - Name", "1741A. Name", "A - Name", "A. Name", "Problem A: Name", "Problem 1741B1 - Name"
+HEADER_RE = re.compile(
+    r'^(?:Problem\s+)?(?P<contest>\d+)?(?P<index>[A-Z][1-9]?)\s*[-–—.:]\s*(?P<title>\S.{0,100})$'
+)
+# "Problem A" on its own line
+BARE_HEADER_RE = re.compile(r'^Problem\s+(?P<contest>\d+)?(?P<index>[A-Z][1-9]?)$')
+
+SUBSECTION_RE = re.compile(
+    r'^(?P<label>tutorial|editorial|solution|hints?|hint\s*\d+|idea|proof|code|implementation)'
+    r'(?:\s*\d+)?\s*:?$',
+    re.IGNORECASE
+)
+
+CODE_MARKERS = ("#include", "int main", "using namespace", "def solve", "import java", "public static void main")
+
+
+def _parse_header(line: str) -> Optional[Dict]:
+    stripped = line.strip()
+    if len(stripped) > 120:
+        return None
+    match = BARE_HEADER_RE.match(stripped)
+    if match:
+        return {"contest_id": match.group("contest"), "index": match.group("index"), "title": ""}
+    match = HEADER_RE.match(stripped)
+    if not match:
+        return None
+    title = match.group("title").strip()
+    # Without a contest id or "Problem", only accept "A - Title" / "A. Title" style headers
+    if not match.group("contest") and not stripped.startswith("Problem") and not title[:1].isupper():
+        return None
+    return {"contest_id": match.group("contest"), "index": match.group("index"), "title": title}
+
+
+def _split_subsections(lines: List[str]) -> List[Dict]:
+    subsections = [{"label": "", "lines": []}]
+    for line in lines:
+        match = SUBSECTION_RE.match(line.strip())
+        if match:
+            subsections.append({"label": match.group("label").lower(), "lines": []})
+        else:
+            subsections[-1]["lines"].append(line)
+    return [
+        {"label": s["label"], "text": "\n".join(s["lines"]).strip()}
+        for s in subsections
+        if s["label"] or "\n".join(s["lines"]).strip()
+    ]
+
+
+def split_sections(text: str) -> List[Dict]:
+    """
+    Split editorial text into sections, one per problem header, in order.
+    Each section: {"contest_id", "index", "title", "header", "text", "subsections"}.
+    Text before the first header (round intro) is dropped.
+    """
+    sections = []
+    current = None
+    for line in text.split("\n"):
+        header = _parse_header(line)
+        if header:
+            current = {**header, "header": line.strip(), "lines": []}
+            sections.append(current)
+        elif current is not None:
+            current["lines"].append(line)
+
+    for section in sections:
+        lines = section.pop("lines")
+        section["text"] = "\n".join(lines).strip()
+        section["subsections"] = _split_subsections(lines)
+    return sections
+
+
+def find_section(sections: List[Dict], contest_id, index: str, problem_name: str = None) -> Optional[Dict]:
+    """
+    The section for one problem.
+    Combined Div. 1 + Div. 2 editorials label problems with either contest's
+    id, so a header with another contest id only matches on the problem name.
+    """
+    contest_id = str(contest_id)
+    name = (problem_name or "").strip().lower()
+
+    for section in sections:
+        if section["contest_id"] == contest_id and section["index"] == index:
+            return section
+    if name:
+        for section in sections:
+            if section["title"].lower() == name:
+                return section
+    for section in sections:
+        if section["contest_id"] is None and section["index"] == index:
+            return section
+    return None
+
+
+def _looks_like_code(text: str) -> bool:
+    return any(marker in text for marker in CODE_MARKERS)
+
+
+def section_prompt_text(section: Dict) -> str:
+    """Section text for an LLM prompt: header and explanations, without code listings."""
+    parts = [section["header"]]
+    for sub in section["subsections"]:
+        if sub["label"] in ("code", "implementation") or _looks_like_code(sub["text"]):
+            continue
+        parts.append(f"{sub['label'].capitalize()}:\n{sub['text']}" if sub["label"] else sub["text"])
+    return "\n\n".join(part for part in parts if part.strip())
+
+
+def extract_problem_section(text: str, contest_id, index: str, problem_name: str = None) -> Optional[str]:
+    """Prompt text for one problem of a multi-problem editorial, or None if it cannot be found."""
+    section = find_section(split_sections(text), contest_id, index, problem_name)
+    if section is None:
+        return None
+    return section_prompt_text(section)
@@ -5,6 +5,8 @@ from typing import Optional
 from dotenv import load_dotenv
 import os
 import cf_editorial as cfe
+import scrape_cache  # on sys.path via cf_editorial
+import single_flight
 
 # Load environment variables from .env
 load_dotenv()
@@ -38,6 +40,8 @@ app.add_middleware(
 
 class InputURL(BaseModel):
     problem_url: str
+    # Re-check problems cached as having no editorial
+    bypass_negative_cache: bool = False
 
 
 @app.get("/")
@@ -62,15 +66,14 @@ def generate_hints(input_data: InputURL):
     # Step 1: Fetch metadata
     metadata = cfe.fetch_problem_metadata(contest_id, index)
 
-    # Step 2: Find editorial links
-    tutorial_links = cfe.find_tutorial_links_for_problem(contest_id, index)
-    if not tutorial_links:
-        return {"error": "No editorial or tutorial links found for this problem."}
+    # Step 2: Editorial for this problem (its section of the round editorial when possible)
+    with scrape_cache.request_scope(bypass_negative=input_data.bypass_negative_cache) as cache_scope:
+        editorial = cfe.fetch_problem_editorial(contest_id, index, (metadata or {}).get("name"))
+    if "error" in editorial:
+        return {"error": editorial["error"], "negative_cache_hit": bool(cache_scope["negative_hits"])}
 
-    editorial_url = tutorial_links[0]
-    editorial_text = cfe.fetch_blog_text(editorial_url)
-    if "Error fetching" in editorial_text:
-        return {"error": "Could not fetch editorial content. Please try again."}
+    editorial_url = editorial["editorial_url"]
+    editorial_text = editorial["text"]
 
     # Step 3: Prepare the AI prompt
     prompt = f"""
@@ -89,25 +92,27 @@ Now generate clear, structured hints:
 """
 
     # Step 4: Generate hints
-    try:
+    def ask_llm():
         if USE_GEMINI:
             # --- Gemini Path ---
             model = genai.GenerativeModel("gemini-2.5-flash")
             response = model.generate_content(prompt)
-            hints = response.text.strip()
-
-        else:
-            # --- OpenAI Path ---
-            completion = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI tutor for competitive programming."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=700,
-                temperature=0.7
-            )
-            hints = completion.choices[0].message.content.strip()
+            return response.text.strip()
+        # --- OpenAI Path ---
+        completion = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful AI tutor for competitive programming."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=700,
+            temperature=0.7
+        )
+        return completion.choices[0].message.content.strip()
+
+    try:
+        # Students asking about the same problem at once share one LLM call
+        hints = single_flight.do(f"codeforces:{contest_id}/{index}:hints:codeforces:{single_flight.digest(prompt)}", ask_llm)
 
         return {
             "problem": metadata,
@@ -120,7 +125,7 @@ Now generate clear, structured hints:
 
 
 @app.get("/fetch/editorial")
-def fetch_editorial(problem_url: Optional[str] = Query(None)):
+def fetch_editorial(problem_url: Optional[str] = Query(None), bypass_negative_cache: bool = Query(False)):
     """
     Debug endpoint to fetch and view editorial text directly.
     """
@@ -134,11 +139,16 @@ def fetch_editorial(problem_url: Optional[str] = Query(None)):
     contest_id = parsed["contest_id"]
     index = parsed["index"]
 
-    tutorial_links = cfe.find_tutorial_links_for_problem(contest_id, index)
+    with scrape_cache.request_scope(bypass_negative=bypass_negative_cache) as cache_scope:
+        try:
+            tutorial_links = cfe.find_tutorial_links_for_problem(contest_id, index)
+        except Exception as e:
+            return {"error": f"Editorial lookup failed, please try again: {e}"}
     editorials = []
     for link in tutorial_links:
         text = cfe.fetch_blog_text(link)
         editorials.append({"url": link, "text": text[:1000]})  # limit text preview
 
-    return {"tutorial_links": tutorial_links, "editorials": editorials}
+    return {"tutorial_links": tutorial_links, "editorials": editorials,
+            "negative_cache_hit": bool(cache_scope["negative_hits"])}
 
@@ -0,0 +1,171 @@
+# section_store.py
+"""
+Per-problem editorial sections, stored once per round editorial.
+
+The first time a round editorial is fetched it is split into sections and
+every section is stored under its (contestId, index) key, so hint requests
+for sibling problems of the same round need no upstream call at all.
+
+One small JSON file per contest under the store directory; writes are
+atomic replaces, so several workers can share the directory. A contest's
+sections are a list, not a dict by index: combined Div. 1 + Div. 2
+editorials have two "A" sections, told apart by contest id or problem name
+the same way editorial_sections.find_section does.
+
+Configuration (environment variables):
+    CF_SECTION_STORE_DIR   store directory (default codeforces/data/sections)
+    CF_SECTION_STORE_TTL   seconds a stored editorial is trusted (default 7 days)
+"""
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from editorial_sections import split_sections, section_prompt_text, find_section
+
+STORE_DIR = os.getenv(
+    "CF_SECTION_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sections")
+)
+STORE_TTL = int(os.getenv("CF_SECTION_STORE_TTL", str(7 * 24 * 3600)))
+
+# Contest files kept in memory
+MAX_CACHED_CONTESTS = 256
+
+_lock = threading.Lock()
+_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "ingested": 0}
+
+
+def _path(contest_id: str) -> str:
+    return os.path.join(STORE_DIR, f"{contest_id}.json")
+
+
+def _load(contest_id: str) -> Optional[Dict]:
+    with _lock:
+        entry = _cache.get(contest_id)
+        if entry is not None:
+            _cache.move_to_end(contest_id)
+            return entry
+    try:
+        with open(_path(contest_id), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    with _lock:
+        _cache[contest_id] = entry
+        while len(_cache) > MAX_CACHED_CONTESTS:
+            _cache.popitem(last=False)
+    return entry
+
+
+def _write(contest_id: str, entry: Dict):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp_path = f"{_path(contest_id)}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, _path(contest_id))
+    with _lock:
+        _cache[contest_id] = entry
+        _cache.move_to_end(contest_id)
+
+
+def _section_key(section: Dict):
+    return section["contest_id"], section["index"], section["title"].lower()
+
+
+def _stored_sections(entry: Dict) -> List[Dict]:
+    sections = entry.get("sections") or []
+    if isinstance(sections, dict):
+        # Files written before sections became a list: keyed by bare index
+        return [{"contest_id": None, "index": index, **section} for index, section in sections.items()]
+    return sections
+
+
+def ingest(contest_id, editorial_url: str, text: str) -> int:
+    """
+    Split a fetched editorial and store all of its sections in one pass.
+    Headers that name another contest (combined Div. 1 + Div. 2 editorials)
+    are stored under that contest as well, merged into the sections it
+    already has. Returns the number of sections.
+    """
+    contest_id = str(contest_id)
+    now = int(time.time())
+    sections = split_sections(text)
+
+    by_contest = {contest_id: []}
+    for section in sections:
+        owner = section["contest_id"] or contest_id
+        by_contest.setdefault(owner, []).append({
+            "contest_id": section["contest_id"],
+            "index": section["index"],
+            "title": section["title"],
+            "text": section_prompt_text(section),
+            "editorial_url": editorial_url,
+        })
+
+    for owner, owned in by_contest.items():
+        existing = _load(owner)
+        fresh = existing is not None and now - existing.get("stored_at", 0) <= STORE_TTL
+        # New sections replace the same problem's old one; the others are kept
+        replaced = {_section_key(section) for section in owned}
+        kept = [s for s in _stored_sections(existing) if _section_key(s) not in replaced] if fresh else []
+
+        if owner == contest_id or not fresh:
+            entry = {"editorial_url": editorial_url, "stored_at": now}
+            if owner == contest_id:
+                # Kept so problems the segmenter could not place are still served from the store
+                entry["text"] = text
+        else:
+            # The sibling keeps its own editorial URL, full text and age
+            entry = {key: value for key, value in existing.items() if key != "sections"}
+        entry["sections"] = kept + owned
+        _write(owner, entry)
+
+    with _lock:
+        _stats["ingested"] += 1
+    print(f"Stored {len(sections)} editorial sections for contest {contest_id}")
+    return len(sections)
+
+
+def get(contest_id, index: str, problem_name: str = None) -> Optional[Dict]:
+    """
+    Stored editorial for one problem:
+    {"editorial_url", "text", "section": True if text is only this problem's section}.
+    None if the contest's editorial has not been ingested (or is too old).
+    """
+    entry = _load(str(contest_id))
+    if entry is None or time.time() - entry.get("stored_at", 0) > STORE_TTL:
+        with _lock:
+            _stats["misses"] += 1
+        return None
+
+    sections = _stored_sections(entry)
+    section = find_section(sections, contest_id, index, problem_name)
+    if section is not None and section["contest_id"] is None:
+        # Matched on a bare index: only trust it if no other division's section shares it
+        name = (problem_name or "").strip().lower()
+        same_index = [s for s in sections if s["contest_id"] is None and s["index"] == index]
+        if len(same_index) > 1 and not (name and section["title"].lower() == name):
+            section = None
+
+    if section is not None:
+        result = {"editorial_url": section.get("editorial_url", entry["editorial_url"]),
+                  "text": section["text"], "section": True}
+    elif "text" in entry:
+        result = {"editorial_url": entry["editorial_url"], "text": entry["text"], "section": False}
+    else:
+        with _lock:
+            _stats["misses"] += 1
+        return None
+
+    with _lock:
+        _stats["hits"] += 1
+    return result
+
+
+def store_stats() -> Dict:
+    with _lock:
+        return {**_stats, "cached_contests": len(_cache), "path": STORE_DIR}
@@ -0,0 +1,106 @@
+"""
+Test script for editorial_sections
+Splits the saved Codeforces round editorial fixture and checks that each
+problem's section is found and trimmed for the prompt (no network needed)
+
+    python test_editorial_sections.py
+"""
+import os
+
+from editorial_sections import split_sections, find_section, section_prompt_text, extract_problem_section
+
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "common", "fixtures", "editorials", "cf_round_page.txt"
+)
+
+# Combined Div. 1 + Div. 2 editorial: both divisions have an "A"
+COMBINED_EDITORIAL = """Codeforces Round Editorial
+
+1740A - Shared Problem
+Tutorial
+Div. 1 explanation.
+
+1741A - Easy Start
+Tutorial
+Div. 2 explanation.
+Solution
+#include <bits/stdc++.h>
+int main() {}
+"""
+
+
+def load_fixture() -> str:
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_split_fixture():
+    """Test 1: every problem header of the round editorial starts a section"""
+    print("\n" + "="*60)
+    print("TEST 1: Split cf_round_page.txt")
+    print("="*60)
+
+    sections = split_sections(load_fixture())
+    for section in sections:
+        labels = [sub["label"] for sub in section["subsections"]]
+        print(f"  {section['contest_id']}{section['index']} - {section['title']} {labels}")
+
+    assert [(s["contest_id"], s["index"]) for s in sections] == [("1741", "A"), ("1741", "B"), ("1741", "C")]
+    assert sections[0]["title"] == "Compare T-Shirt Sizes"
+    assert [sub["label"] for sub in sections[0]["subsections"]] == ["idea", "tutorial", "solution"]
+    # The round intro before the first header is not part of any section
+    assert all("BledDest\n, \nhistory" not in s["text"] for s in sections)
+    print("\n✓ Fixture split into 3 sections")
+
+
+def test_find_section():
+    """Test 2: sections are found by contest id + index, then by name"""
+    print("\n" + "="*60)
+    print("TEST 2: Find one problem's section")
+    print("="*60)
+
+    sections = split_sections(load_fixture())
+    assert find_section(sections, 1741, "B")["title"] == "Funny Permutation"
+    assert find_section(sections, "1741", "D") is None
+    # Another contest id only matches on the problem name
+    assert find_section(sections, 1740, "C") is None
+    assert find_section(sections, 1740, "C", "Minimize the Thickness")["index"] == "C"
+
+    text = extract_problem_section(load_fixture(), 1741, "B")
+    print(text[:200])
+    assert text.startswith("1741B - Funny Permutation")
+    assert "Compare T-Shirt Sizes" not in text and "Minimize the Thickness" not in text
+    print("\n✓ Section lookup works")
+
+
+def test_combined_divisions():
+    """Test 3: Div. 1 and Div. 2 "A" sections stay apart; code is left out of the prompt"""
+    print("\n" + "="*60)
+    print("TEST 3: Combined Div. 1 + Div. 2 editorial")
+    print("="*60)
+
+    sections = split_sections(COMBINED_EDITORIAL)
+    div1 = find_section(sections, 1740, "A")
+    div2 = find_section(sections, 1741, "A")
+    assert div1["title"] == "Shared Problem" and div2["title"] == "Easy Start"
+
+    prompt = section_prompt_text(div2)
+    print(prompt)
+    assert "Div. 2 explanation." in prompt
+    assert "#include" not in prompt
+    print("\n✓ Divisions kept apart, code dropped")
+
+
+def main():
+    """Run all tests"""
+    test_split_fixture()
+    test_find_section()
+    test_combined_divisions()
+    print("\n" + "="*60)
+    print("✅ All editorial section tests passed!")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Test script for section_store
+Ingests editorials into a throwaway store directory and checks that sibling
+problems and the other division are served from it (no network needed)
+
+    python test_section_store.py
+"""
+import os
+import shutil
+import tempfile
+
+# The store reads its directory at import time
+os.environ["CF_SECTION_STORE_DIR"] = tempfile.mkdtemp(prefix="cf_sections_")
+
+import section_store
+
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "common", "fixtures", "editorials", "cf_round_page.txt"
+)
+
+DIV1_URL = "https://codeforces.com/blog/entry/1"
+COMBINED_URL = "https://codeforces.com/blog/entry/2"
+
+# Div. 1 editorial ingested first, then the combined one naming both contests
+DIV1_EDITORIAL = """1760B - Div One Only
+Tutorial
+Only in the Div. 1 editorial.
+"""
+COMBINED_EDITORIAL = """1760A - Shared Problem
+Tutorial
+Div. 1 explanation.
+
+1761A - Easy Start
+Tutorial
+Div. 2 explanation.
+"""
+
+
+def test_ingest_fixture():
+    """Test 1: one ingest serves every problem of the round"""
+    print("\n" + "="*60)
+    print("TEST 1: Ingest cf_round_page.txt")
+    print("="*60)
+
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        text = f.read()
+    url = "https://codeforces.com/blog/entry/107908"
+    assert section_store.ingest(1741, url, text) == 3
+
+    for index in ("A", "B", "C"):
+        stored = section_store.get(1741, index)
+        print(f"  1741{index}: {stored['text'].splitlines()[0]}")
+        assert stored["section"] and stored["editorial_url"] == url
+        assert stored["text"].startswith(f"1741{index} - ")
+
+    # Unknown problem falls back to the full editorial text
+    fallback = section_store.get(1741, "D")
+    assert fallback["section"] is False and fallback["text"] == text
+    assert section_store.get(9999, "A") is None
+    print("\n✓ Sibling problems served from the store")
+
+
+def test_sibling_contest_merge():
+    """Test 2: a combined editorial merges into the other division's existing sections"""
+    print("\n" + "="*60)
+    print("TEST 2: Combined Div. 1 + Div. 2 ingest")
+    print("="*60)
+
+    section_store.ingest(1760, DIV1_URL, DIV1_EDITORIAL)
+    section_store.ingest(1761, COMBINED_URL, COMBINED_EDITORIAL)
+
+    div2 = section_store.get(1761, "A")
+    div1 = section_store.get(1760, "A")
+    print(f"  1761A: {div2['text'].splitlines()[0]}")
+    print(f"  1760A: {div1['text'].splitlines()[0]}")
+    assert "Div. 2 explanation." in div2["text"]
+    assert "Div. 1 explanation." in div1["text"] and div1["editorial_url"] == COMBINED_URL
+
+    # The sibling keeps what it already had
+    kept = section_store.get(1760, "B")
+    assert kept["section"] and "Only in the Div. 1 editorial." in kept["text"]
+    assert kept["editorial_url"] == DIV1_URL
+    print("\n✓ Sibling contest merged without losing its sections")
+
+
+def main():
+    """Run all tests"""
+    print(f"Store directory: {section_store.STORE_DIR}")
+    try:
+        test_ingest_fixture()
+        test_sibling_contest_merge()
+        print("\n" + "="*60)
+        print("✅ All section store tests passed!")
+        print(section_store.store_stats())
+        print("="*60 + "\n")
+    finally:
+        shutil.rmtree(section_store.STORE_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
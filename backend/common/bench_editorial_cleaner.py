@@ -0,0 +1,239 @@
+# bench_editorial_cleaner.py
+"""
+Check editorial_cleaner against the previous clean_editorial_text
+implementations and compare their throughput.
+
+    python bench_editorial_cleaner.py [--rounds N] [--fuzz N]
+
+1. Every fixture in fixtures/editorials is cleaned with both profiles by the
+   old and the new code; the outputs must be identical.
+2. The same is checked on randomly shuffled mixes of fixture lines (seeded),
+   which exercise line-boundary cases the fixtures may not hit.
+3. Throughput (MB/s) of old vs new, and of clean_many, on the corpus.
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+from editorial_cleaner import clean_editorial_text, clean_many
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "editorials")
+
+
+# ---------- previous implementations, kept verbatim as the reference ----------
+
+def legacy_codeforces_clean(text: str) -> str:
+    import re
+
+    # First pass: replace multiple consecutive newlines
+    text = re.sub(r'\n{3,}', '\n\n', text)
+
+    # Clean up isolated variables and LaTeX artifacts
+    # Pattern: word \n single_char \n word -> word single_char word
+    text = re.sub(r'(\w)\s*\n\s*([A-Za-z])\s*\n\s*(\w)', r'\1 \2 \3', text)
+
+    # Pattern: \n single_char \n -> remove the character if it's likely LaTeX variable
+    # But be careful not to remove problem indices (A, B, C at start of lines)
+    text = re.sub(r'(?<!^)(?<!\n)\n([a-z])\n(?!\n)', r' ', text, flags=re.MULTILINE)
+
+    # Clean up code blocks and excessive whitespace in code
+    # Replace patterns like "(\n)" with "()" in code contexts
+    text = re.sub(r'\(\s*\n\s*\)', '()', text)
+    text = re.sub(r'\[\s*\n\s*\]', '[]', text)
+    text = re.sub(r'{\s*\n\s*}', '{}', text)
+
+    # Clean up spaces before punctuation
+    text = re.sub(r'\s+([,.])', r'\1', text)
+
+    # Remove literal \n strings
+    text = text.replace('\\n', ' ')
+
+    # Clean up mathematical symbols
+    text = re.sub(r'\s*⋅\s*', ' * ', text)
+    text = re.sub(r'\s*≠\s*', ' != ', text)
+    text = re.sub(r'\s*≤\s*', ' <= ', text)
+    text = re.sub(r'\s*≥\s*', ' >= ', text)
+    text = re.sub(r'\s*→\s*', ' -> ', text)
+
+    # Clean up lines with only single characters or short fragments
+    lines = text.split('\n')
+    cleaned_lines = []
+    skip_next = False
+
+    for i, line in enumerate(lines):
+        if skip_next:
+            skip_next = False
+            continue
+
+        stripped = line.strip()
+
+        # Keep empty lines for paragraph breaks
+        if not stripped:
+            # Only add empty line if previous line wasn't empty
+            if cleaned_lines and cleaned_lines[-1].strip():
+                cleaned_lines.append('')
+            continue
+
+        # Check if this is a problem header (like "1741A - Problem Name")
+        if re.match(r'^\d+[A-Z]\s*-', stripped):
+            # Add extra line break before problem headers for readability
+            if cleaned_lines and cleaned_lines[-1].strip():
+                cleaned_lines.append('')
+            cleaned_lines.append(line)
+            continue
+
+        # Skip lines with only 1-2 characters that are likely LaTeX artifacts
+        # Exception: Keep lines that look like they're part of a list or important markers
+        if len(stripped) <= 2 and not re.match(r'^[A-Z]$|^\d+$|^-$|^\*$', stripped):
+            # Check if next line or previous line has content - if so, try to merge
+            if i < len(lines) - 1:
+                next_stripped = lines[i + 1].strip()
+                if next_stripped and len(next_stripped) > 3:
+                    # Merge with next line
+                    lines[i + 1] = stripped + ' ' + next_stripped
+                    continue
+            # Otherwise skip
+            continue
+
+        cleaned_lines.append(line)
+
+    text = '\n'.join(cleaned_lines)
+
+    # Replace multiple spaces with single space
+    text = re.sub(r' {2,}', ' ', text)
+
+    # Normalize paragraph breaks (max 2 newlines)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+
+    # Remove leading/trailing whitespace from each line
+    lines = [line.strip() for line in text.split('\n')]
+    text = '\n'.join(lines)
+
+    # Final cleanup
+    text = re.sub(r' {2,}', ' ', text)
+
+    return text.strip()
+
+
+def legacy_codechef_clean(text: str) -> str:
+    if not text:
+        return ""
+
+    # Remove excessive newlines
+    text = re.sub(r'\n{3,}', '\n\n', text)
+
+    # Remove excessive spaces
+    text = re.sub(r' {2,}', ' ', text)
+
+    # Clean up common artifacts
+    text = text.replace('\\n', ' ')
+    text = re.sub(r'\s+([,.])', r'\1', text)
+
+    # Remove lines with only special characters or very short lines that are likely artifacts
+    lines = text.split('\n')
+    cleaned_lines = []
+
+    for line in lines:
+        stripped = line.strip()
+
+        # Keep empty lines for paragraph breaks
+        if not stripped:
+            if cleaned_lines and cleaned_lines[-1].strip():
+                cleaned_lines.append('')
+            continue
+
+        # Skip very short lines that are likely artifacts (but keep single-letter problem labels)
+        if len(stripped) <= 2 and not re.match(r'^[A-Z]$|^\d+$', stripped):
+            continue
+
+        cleaned_lines.append(line)
+
+    text = '\n'.join(cleaned_lines)
+
+    # Final cleanup
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = re.sub(r' {2,}', ' ', text)
+
+    # Remove leading/trailing whitespace from each line
+    lines = [line.strip() for line in text.split('\n')]
+    text = '\n'.join(lines)
+
+    return text.strip()
+
+
+LEGACY = {"codeforces": legacy_codeforces_clean, "codechef": legacy_codechef_clean}
+
+
+# ---------- corpus ----------
+
+def load_fixtures():
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.endswith(".txt"):
+            with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+                fixtures[name] = f.read()
+    return fixtures
+
+
+def fuzz_documents(fixtures, count, seed=826):
+    """Documents made of random runs of fixture lines plus edge-case fragments."""
+    rng = random.Random(seed)
+    pool = [line for text in fixtures.values() for line in text.split("\n")]
+    pool += ["", " ", "  ", "a", "x ", " B", "7", "-", "*", "ab", "(", ")", "[", "]", "{", "}",
+             " , ", ".", "≤", " ⋅ ", "→", "\\n", "1741A - Header", "\t", "é", "n\n"]
+    documents = []
+    for _ in range(count):
+        lines = [rng.choice(pool) for _ in range(rng.randint(1, 80))]
+        documents.append("\n".join(lines))
+    return documents
+
+
+def check_equivalence(documents):
+    mismatches = 0
+    for profile, legacy in LEGACY.items():
+        for name, text in documents.items():
+            expected, actual = legacy(text), clean_editorial_text(text, profile)
+            if expected != actual:
+                mismatches += 1
+                print(f"MISMATCH [{profile}] {name}")
+    return mismatches
+
+
+def throughput(clean, texts, rounds):
+    size_mb = sum(len(text.encode("utf-8")) for text in texts) / 1e6
+    start = time.perf_counter()
+    for _ in range(rounds):
+        clean(texts)
+    elapsed = time.perf_counter() - start
+    return size_mb * rounds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--fuzz", type=int, default=2000)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    fuzz = fuzz_documents(fixtures, args.fuzz)
+    documents = {**fixtures, **{f"fuzz-{i}": text for i, text in enumerate(fuzz)}}
+
+    mismatches = check_equivalence(documents)
+    print(f"Equivalence: {len(documents)} documents x {len(LEGACY)} profiles, {mismatches} mismatches")
+    if mismatches:
+        sys.exit(1)
+
+    corpus = list(fixtures.values())
+    for profile, legacy in LEGACY.items():
+        before = throughput(lambda texts: [legacy(t) for t in texts], corpus, args.rounds)
+        after = throughput(lambda texts: [clean_editorial_text(t, profile) for t in texts], corpus, args.rounds)
+        batch = throughput(lambda texts: clean_many(texts, profile), corpus, args.rounds)
+        print(f"{profile:>10}: before {before:6.2f} MB/s | after {after:6.2f} MB/s "
+              f"({after / before:.2f}x) | clean_many {batch:6.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# browser_pool.py
+"""
+Shared pool of long-lived headless Chrome WebDriver instances.
+
+Starting Chrome (and running ChromeDriverManager().install()) costs several
+seconds, so the scrapers check a driver out of this pool instead of booting
+a fresh browser for every page. Drivers are health-checked before reuse and
+recycled after a configurable number of page loads.
+
+Configuration (environment variables):
+    BROWSER_POOL_SIZE         max live drivers per process (default 2)
+    BROWSER_MAX_PAGES         page loads before a driver is recycled (default 50)
+    BROWSER_CHECKOUT_TIMEOUT  seconds to wait for a free driver (default 60)
+    CHROMEDRIVER_PATH         skip ChromeDriverManager and use this binary
+"""
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional, List
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+import resource_blocking
+
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+MAX_PAGES_PER_DRIVER = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+CHECKOUT_TIMEOUT = float(os.getenv("BROWSER_CHECKOUT_TIMEOUT", "60"))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process.
+    ChromeDriverManager().install() hits the network and the disk, so its
+    result is memoized; CHROMEDRIVER_PATH short-circuits it entirely.
+    """
+    global _driver_path
+    if _driver_path:
+        return _driver_path
+
+    with _driver_path_lock:
+        if not _driver_path:
+            _driver_path = os.getenv("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+            print(f"Using chromedriver at {_driver_path}")
+    return _driver_path
+
+
+def build_chrome_options() -> Options:
+    """
+    Chrome options shared by every scraper (CodeChef and Codeforces both sit
+    behind Cloudflare, so they need the same "real browser" setup).
+    """
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+
+    # driver.get() returns at DOMContentLoaded; page_readiness waits for the content we need
+    chrome_options.page_load_strategy = "eager"
+
+    # Network events feed resource_blocking's per-page accounting, when enabled
+    if resource_blocking.NETWORK_STATS:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    # Suppress unnecessary logs and automation banners
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+
+    return chrome_options
+
+
+def create_driver() -> webdriver.Chrome:
+    """
+    Start a new configured Chrome WebDriver (not pooled).
+    """
+    service = Service(resolve_driver_path())
+    driver = webdriver.Chrome(service=service, options=build_chrome_options())
+
+    # Remove webdriver property
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+    return driver
+
+
+class PooledDriver:
+    """A WebDriver plus the bookkeeping the pool needs to recycle it."""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+    def is_healthy(self) -> bool:
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of Chrome drivers with checkout/checkin semantics.
+
+    Drivers are created lazily up to `size`. A checked-in driver is recycled
+    when it has served `max_pages` checkouts or fails its health check.
+    """
+
+    def __init__(self, size: int = POOL_SIZE, max_pages: int = MAX_PAGES_PER_DRIVER):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self._idle: List[PooledDriver] = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {"created": 0, "recycled": 0, "checkouts": 0, "unhealthy": 0}
+
+    def checkout(self, timeout: float = CHECKOUT_TIMEOUT) -> PooledDriver:
+        """
+        Take a healthy driver from the pool, starting one if under capacity.
+        Blocks up to `timeout` seconds when every driver is busy.
+        Health checks and quits talk to Chrome, so they run outside the lock.
+        """
+        deadline = time.time() + timeout
+        while True:
+            pooled = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is shut down")
+
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+
+                    if self._live < self.size:
+                        self._live += 1
+                        break
+
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser available after {timeout}s")
+                    self._cond.wait(remaining)
+
+            if pooled is None:
+                break
+            if pooled.is_healthy():
+                with self._cond:
+                    self._stats["checkouts"] += 1
+                return pooled
+            # Dead driver: free its slot and look again
+            with self._cond:
+                self._stats["unhealthy"] += 1
+                self._live -= 1
+                self._cond.notify()
+            pooled.quit()
+
+        # Start Chrome outside the lock so other threads can keep checking in
+        try:
+            pooled = PooledDriver(create_driver())
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._stats["created"] += 1
+            self._stats["checkouts"] += 1
+        return pooled
+
+    def checkin(self, pooled: PooledDriver, healthy: bool = True):
+        """
+        Return a driver to the pool, recycling it if it is worn out or broken.
+        """
+        pooled.pages += 1
+        recycle = not healthy or pooled.pages >= self.max_pages or not pooled.is_healthy()
+
+        with self._cond:
+            recycle = recycle or self._closed
+            if recycle:
+                self._stats["recycled" if healthy else "unhealthy"] += 1
+                self._live -= 1
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+
+        if recycle:
+            pooled.quit()
+
+    @contextmanager
+    def driver(self, timeout: float = CHECKOUT_TIMEOUT):
+        """
+        Usage:
+            with get_pool().driver() as driver:
+                driver.get(url)
+        """
+        pooled = self.checkout(timeout)
+        healthy = True
+        try:
+            yield pooled.driver
+        except Exception:
+            # Page errors are common; only a failed health check retires the driver
+            healthy = pooled.is_healthy()
+            raise
+        finally:
+            self.checkin(pooled, healthy=healthy)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "max_pages": self.max_pages,
+                "live": self._live,
+                "idle": len(self._idle),
+                **self._stats
+            }
+
+    def shutdown(self):
+        """Quit every idle driver and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            pooled.quit()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> BrowserPool:
+    """Process-wide browser pool shared by all scrapers."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
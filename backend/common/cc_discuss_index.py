@@ -0,0 +1,338 @@
+# cc_discuss_index.py
+"""
+Local problem_code -> editorial topic index for CodeChef Discuss.
+
+A background crawler walks the editorial categories of discuss.codechef.com
+(newest topics first), fetches each new topic's first post and stores its
+cooked HTML under the problem codes it is about. fetch_discuss_explanations
+reads this index first, so most lookups are a local SQLite read; the live
+search.json query is only needed for problem codes the index has never seen.
+
+Per category the crawler keeps a checkpoint (highest topic id seen) and a
+backfill page, so each pass only reads topics newer than the checkpoint plus
+a few older pages until the whole category has been seen once. The SQLite
+file is shared by all workers; a file lock makes sure only one of them
+crawls.
+
+Configuration (environment variables):
+    CC_DISCUSS_INDEX_PATH        SQLite file (default common/data/cc_discuss_index.db)
+    CC_DISCUSS_CRAWL_INTERVAL    seconds between crawl passes (default 1800)
+    CC_DISCUSS_CRAWL_TOPICS      topic fetches per pass (default 100)
+    CC_DISCUSS_CRAWL_PAGES       listing pages per category per pass and phase (default 5)
+"""
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+import http_client
+from discuss_ranking import DISCUSS_BASE, editorial_category_ids
+from file_lock import FileLock
+
+INDEX_PATH = os.getenv(
+    "CC_DISCUSS_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cc_discuss_index.db")
+)
+CRAWL_INTERVAL = int(os.getenv("CC_DISCUSS_CRAWL_INTERVAL", "1800"))
+TOPICS_PER_PASS = int(os.getenv("CC_DISCUSS_CRAWL_TOPICS", "100"))
+CRAWL_PAGES = int(os.getenv("CC_DISCUSS_CRAWL_PAGES", "5"))
+
+# Pause between Discourse requests so the crawler stays well under its rate limits
+REQUEST_DELAY = 1.0
+
+HEADERS = {"Accept": "application/json"}
+
+# Problem links in an editorial's "PROBLEM LINK" section
+PROBLEM_LINK_RE = re.compile(r'codechef\.com/(?:[A-Za-z0-9_]+/)?problems/([A-Za-z0-9_]+)')
+PROBLEM_LINK_HEADING_RE = re.compile(r'problem\s+links?', re.IGNORECASE)
+# "CHEFSUB - Editorial", "[CHEFSUB] Editorial", "CHEFSUB: editorial"
+TITLE_CODE_RE = re.compile(r'^\s*\[?([A-Z0-9_]{3,})\]?\s*[-–:]')
+
+_crawler_started = False
+_crawler_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"lookups": 0, "hits": 0, "topics_indexed": 0}
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def _connect() -> sqlite3.Connection:
+    if not _schema_ready:
+        with _schema_lock:
+            _ensure_schema()
+    return sqlite3.connect(INDEX_PATH, timeout=30)
+
+
+def _ensure_schema():
+    """Create the index file and tables once per process (caller holds _schema_lock)."""
+    global _schema_ready
+    if _schema_ready:
+        return
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    conn = sqlite3.connect(INDEX_PATH, timeout=30)
+    try:
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS topics (
+            topic_id INTEGER PRIMARY KEY,
+            title TEXT,
+            slug TEXT,
+            category_id INTEGER,
+            like_count INTEGER,
+            posts_count INTEGER,
+            cooked TEXT,
+            fetched_at INTEGER
+        )
+        """)
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS problem_topics (
+            problem_code TEXT,
+            topic_id INTEGER,
+            PRIMARY KEY (problem_code, topic_id)
+        )
+        """)
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            category_id INTEGER PRIMARY KEY,
+            last_topic_id INTEGER,
+            backfill_page INTEGER,
+            backfill_done INTEGER,
+            crawled_at INTEGER
+        )
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+    _schema_ready = True
+
+
+def lookup(problem_code: str) -> List[Dict]:
+    """
+    Indexed editorial topics for a problem code, most liked first.
+    Each: {"topic_id", "title", "url", "cooked"}. Empty if never seen.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute("""
+        SELECT t.topic_id, t.title, t.slug, t.cooked FROM problem_topics p
+        JOIN topics t ON t.topic_id = p.topic_id
+        WHERE p.problem_code = ?
+        ORDER BY t.like_count DESC, t.topic_id DESC
+        """, (problem_code.upper(),)).fetchall()
+    finally:
+        conn.close()
+    with _stats_lock:
+        _stats["lookups"] += 1
+        if rows:
+            _stats["hits"] += 1
+    return [
+        {"topic_id": r[0], "title": r[1], "url": f"{DISCUSS_BASE}/t/{r[2]}/{r[0]}", "cooked": r[3]}
+        for r in rows
+    ]
+
+
+def posts_from_index(problem_code: str, to_post: Callable[[str, str, str], Optional[Dict]],
+                     limit: Optional[int] = None) -> List[Dict]:
+    """
+    Posts for a problem built from indexed cooked HTML with the caller's
+    to_post(title, url, cooked). Empty when the index cannot answer, in
+    which case the caller searches Discourse.
+    """
+    try:
+        topics = lookup(problem_code)
+    except sqlite3.Error as e:
+        print(f"Discuss index lookup failed: {e}")
+        return []
+    posts = [post for post in (to_post(t["title"], t["url"], t["cooked"]) for t in topics) if post]
+    return posts[:limit] if limit else posts
+
+
+def problem_codes_for(title: str, cooked: str, tags: List[str]) -> Set[str]:
+    """
+    Problem code an editorial topic is about: the code in its title, else
+    the first link of its PROBLEM LINK section (or its first problem link),
+    else its tags. Other links in the post (prerequisites, similar problems)
+    don't make the topic their editorial.
+    """
+    match = TITLE_CODE_RE.match(title or "")
+    if match:
+        return {match.group(1)}
+    cooked = cooked or ""
+    heading = PROBLEM_LINK_HEADING_RE.search(cooked)
+    link = PROBLEM_LINK_RE.search(cooked, heading.end() if heading else 0) or PROBLEM_LINK_RE.search(cooked)
+    if link:
+        return {link.group(1).upper()}
+    return {tag.upper() for tag in tags if re.fullmatch(r'[a-z0-9_]{3,}', tag) and tag != "editorial"}
+
+
+def _get_json(path: str, params: Dict = None) -> Dict:
+    res = http_client.get(f"{DISCUSS_BASE}{path}", params=params, headers=HEADERS)
+    res.raise_for_status()
+    time.sleep(REQUEST_DELAY)
+    return res.json()
+
+
+def index_topic(conn: sqlite3.Connection, topic: Dict) -> int:
+    """Fetch a topic's first post and store it under its problem codes."""
+    topic_json = _get_json(f"/t/{topic['id']}.json")
+    posts = topic_json.get("post_stream", {}).get("posts", [])
+    if not posts:
+        return 0
+    cooked = posts[0].get("cooked", "")
+    tags = [str(tag.get("name", tag) if isinstance(tag, dict) else tag).lower() for tag in topic.get("tags", []) or []]
+    codes = problem_codes_for(topic.get("title", ""), cooked, tags)
+
+    conn.execute(
+        "INSERT OR REPLACE INTO topics VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (topic["id"], topic.get("title"), topic.get("slug"), topic.get("category_id"),
+         topic.get("like_count", 0) or 0, topic.get("posts_count", 0) or 0, cooked, int(time.time()))
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO problem_topics VALUES (?, ?)",
+        [(code, topic["id"]) for code in codes]
+    )
+    conn.commit()
+    with _stats_lock:
+        _stats["topics_indexed"] += 1
+    return len(codes)
+
+
+def crawl_category(conn: sqlite3.Connection, category_id: int, budget: int) -> int:
+    """
+    One pass over a category (listing ordered by creation, newest first):
+    1. topics newer than the checkpoint;
+    2. up to CRAWL_PAGES older listing pages, until the category has been
+       seen once.
+    At most `budget` topics are fetched. Returns the number fetched.
+    """
+    row = conn.execute(
+        "SELECT last_topic_id, backfill_page, backfill_done FROM checkpoints WHERE category_id = ?",
+        (category_id,)
+    ).fetchone()
+    first_pass = row is None
+    last_topic_id, backfill_page, backfill_done = row if row else (0, 0, 0)
+    known = {r[0] for r in conn.execute("SELECT topic_id FROM topics WHERE category_id = ?", (category_id,))}
+    fetched = failures = 0
+
+    def index_new(topics) -> bool:
+        """Index unknown topics; False once the budget runs out."""
+        nonlocal fetched, failures
+        for topic in topics:
+            if topic["id"] in known:
+                continue
+            if fetched >= budget:
+                return False
+            try:
+                index_topic(conn, topic)
+                known.add(topic["id"])
+            except Exception as e:
+                failures += 1
+                print(f"Discuss crawl: topic {topic['id']} failed: {e}")
+            fetched += 1
+        return True
+
+    # 1. New topics. The checkpoint only moves once everything above it is indexed.
+    if not first_pass:
+        newest = last_topic_id
+        complete = False
+        for page in range(CRAWL_PAGES):
+            topics = _get_json(f"/c/{category_id}.json", {"order": "created", "page": page}) \
+                .get("topic_list", {}).get("topics", [])
+            newer = [t for t in topics if t["id"] > last_topic_id]
+            newest = max([newest] + [t["id"] for t in newer])
+            if not index_new(newer):
+                break
+            # Pinned topics sit on top of page 0 whatever their age, so look at the last one
+            if not topics or topics[-1]["id"] <= last_topic_id:
+                complete = True
+                break
+        # A failed topic keeps the checkpoint, so the next pass retries it
+        if complete and not failures:
+            last_topic_id = newest
+
+    # 2. Backfill older pages; page 0 of the first pass also sets the checkpoint
+    if not backfill_done:
+        for page in range(backfill_page, backfill_page + CRAWL_PAGES):
+            topics = _get_json(f"/c/{category_id}.json", {"order": "created", "page": page}) \
+                .get("topic_list", {}).get("topics", [])
+            if not topics:
+                backfill_done = 1
+                break
+            if first_pass and page == 0:
+                last_topic_id = max(t["id"] for t in topics)
+            if not index_new(topics):
+                break
+            backfill_page = page + 1
+
+    conn.execute(
+        "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+        (category_id, last_topic_id, backfill_page, backfill_done, int(time.time()))
+    )
+    conn.commit()
+    return fetched
+
+
+def crawl_once() -> int:
+    categories = sorted(editorial_category_ids())
+    if not categories:
+        print("Discuss crawl: no editorial category known, skipping")
+        return 0
+    conn = _connect()
+    total = 0
+    try:
+        for category_id in categories:
+            try:
+                total += crawl_category(conn, category_id, TOPICS_PER_PASS - total)
+            except Exception as e:
+                print(f"Discuss crawl: category {category_id} failed: {e}")
+            if total >= TOPICS_PER_PASS:
+                break
+    finally:
+        conn.close()
+    print(f"Discuss crawl: indexed {total} editorial topics")
+    return total
+
+
+def start_crawler():
+    """
+    Run the crawler in a daemon thread. Only the worker that holds the
+    crawler lock crawls; the others just read the shared index.
+    """
+    global _crawler_started
+    with _crawler_lock:
+        if _crawler_started:
+            return
+        _crawler_started = True
+
+    def run():
+        lock = FileLock(INDEX_PATH + ".lock")
+        while not lock.acquire(blocking=False):
+            time.sleep(CRAWL_INTERVAL)
+        while True:
+            try:
+                crawl_once()
+            except Exception as e:
+                print(f"Discuss crawl failed: {e}")
+            time.sleep(CRAWL_INTERVAL)
+
+    threading.Thread(target=run, name="cc-discuss-crawler", daemon=True).start()
+
+
+def index_stats() -> Dict:
+    try:
+        conn = _connect()
+        try:
+            topics = conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0]
+            problems = conn.execute("SELECT COUNT(DISTINCT problem_code) FROM problem_topics").fetchone()[0]
+            checkpoints = {
+                r[0]: {"last_topic_id": r[1], "backfill_page": r[2], "backfill_done": bool(r[3]), "crawled_at": r[4]}
+                for r in conn.execute("SELECT * FROM checkpoints")
+            }
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return {"error": str(e)}
+    with _stats_lock:
+        stats = dict(_stats)
+    return {**stats, "topics": topics, "problem_codes": problems, "categories": checkpoints, "path": INDEX_PATH}
@@ -0,0 +1,195 @@
+# cf_rate_limiter.py
+"""
+Codeforces API rate limiter shared by every thread and every worker process
+on the machine.
+
+Codeforces allows roughly one API call every two seconds per client IP, so
+the token bucket lives in a small JSON state file guarded by a file lock:
+all uvicorn workers (and the profile linker) draw from the same bucket.
+
+Within a process, callers queue by priority. INTERACTIVE callers (a user is
+waiting for a hint or a profile) are always served before BACKGROUND ones
+(catalog refreshes, editorial crawls). Across processes, a waiting
+interactive caller marks the state file so background callers elsewhere
+hold off until it has been served.
+
+Configuration (environment variables):
+    CF_API_RATE          sustained calls per second (default 0.5)
+    CF_API_BURST         bucket size (default 4)
+    CF_RATE_STATE_PATH   shared state file (default <tmp>/codeflex_cf_rate.json)
+"""
+import os
+import json
+import time
+import heapq
+import itertools
+import tempfile
+import threading
+from typing import Dict
+
+from file_lock import FileLock
+
+RATE = float(os.getenv("CF_API_RATE", "0.5"))
+BURST = float(os.getenv("CF_API_BURST", "4"))
+STATE_PATH = os.getenv("CF_RATE_STATE_PATH", os.path.join(tempfile.gettempdir(), "codeflex_cf_rate.json"))
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# How long a waiting interactive caller keeps background callers (in any process) back
+INTERACTIVE_HOLD = 1.0
+
+# Longest single sleep between attempts, so new arrivals and other processes are noticed
+MAX_POLL = 0.5
+
+
+class TokenBucket:
+    """Token bucket whose state is shared through a locked file."""
+
+    def __init__(self, path: str = STATE_PATH, rate: float = RATE, burst: float = BURST):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self._file_lock = FileLock(path + ".lock")
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"tokens": self.burst, "updated": time.time(), "interactive_until": 0}
+
+    def _write(self, state: Dict):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def try_take(self, priority: int) -> float:
+        """
+        Take one token if one is available to this priority.
+        Returns 0 on success, otherwise the number of seconds to wait.
+        """
+        with self._file_lock:
+            state = self._read()
+            now = time.time()
+            tokens = min(self.burst, state["tokens"] + max(0.0, now - state["updated"]) * self.rate)
+            state["tokens"], state["updated"] = tokens, now
+
+            if priority == BACKGROUND and state.get("interactive_until", 0) > now:
+                self._write(state)
+                return max(state["interactive_until"] - now, 1 / self.rate)
+
+            if tokens >= 1:
+                state["tokens"] = tokens - 1
+                self._write(state)
+                return 0.0
+
+            wait = (1 - tokens) / self.rate
+            if priority == INTERACTIVE:
+                state["interactive_until"] = max(state.get("interactive_until", 0), now + wait + INTERACTIVE_HOLD)
+            self._write(state)
+            return wait
+
+    def drain(self):
+        """Empty the bucket, e.g. after Codeforces reported "Call limit exceeded"."""
+        with self._file_lock:
+            state = self._read()
+            state["tokens"], state["updated"] = 0.0, time.time()
+            self._write(state)
+
+
+class PriorityLimiter:
+    """In-process priority queue in front of the shared bucket."""
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._stats = {
+            name: {"acquired": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for name in PRIORITY_NAMES.values()
+        }
+        self._max_depth = 0
+        self._penalties = 0
+
+    def acquire(self, priority: int = INTERACTIVE):
+        """Block until this caller may make one Codeforces API call."""
+        start = time.time()
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            self._max_depth = max(self._max_depth, len(self._queue))
+
+        try:
+            while True:
+                with self._cond:
+                    while self._queue[0] != ticket:
+                        self._cond.wait()
+                    # Only the head of the queue polls the shared bucket
+                    wait = self.bucket.try_take(priority)
+                    if wait == 0:
+                        break
+                time.sleep(min(wait, MAX_POLL))
+        finally:
+            with self._cond:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+        waited = time.time() - start
+        with self._cond:
+            stats = self._stats[PRIORITY_NAMES[priority]]
+            stats["acquired"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+
+    def penalize(self):
+        with self._cond:
+            self._penalties += 1
+        self.bucket.drain()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._queue:
+                depth[PRIORITY_NAMES[priority]] += 1
+            return {
+                "rate": self.bucket.rate,
+                "burst": self.bucket.burst,
+                "queue_depth": depth,
+                "max_queue_depth": self._max_depth,
+                "rate_limit_hits": self._penalties,
+                "by_priority": {
+                    name: {
+                        "acquired": s["acquired"],
+                        "avg_wait": round(s["total_wait"] / s["acquired"], 3) if s["acquired"] else 0.0,
+                        "max_wait": round(s["max_wait"], 3),
+                    }
+                    for name, s in self._stats.items()
+                },
+            }
+
+
+_limiter = PriorityLimiter(TokenBucket())
+
+
+def acquire(priority: int = INTERACTIVE):
+    """Wait for permission to make one Codeforces API call."""
+    _limiter.acquire(priority)
+
+
+def is_call_limit_exceeded(response: dict) -> bool:
+    return response.get("status") == "FAILED" and "limit exceeded" in (response.get("comment") or "").lower()
+
+
+def penalize():
+    """Record a "Call limit exceeded" response and back off every worker."""
+    print("Codeforces API call limit exceeded, draining the shared rate limiter")
+    _limiter.penalize()
+
+
+def limiter_stats() -> Dict:
+    return _limiter.stats()
@@ -0,0 +1,53 @@
+# concurrent_fetch.py
+"""
+Fetch a ranked list of items concurrently, keeping the ranking.
+
+Used for Discourse topic fetches: the search already ranked the topics, so
+results come back in that order, and with a limit the call returns as soon
+as the best `limit` usable results are known, i.e. every better-ranked item
+has finished without a usable result. Fetches that are no longer needed are
+cancelled (queued ones never start; running ones finish in the background
+and are ignored).
+"""
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def fetch_ranked(items: Sequence[T], fetch: Callable[[T], Optional[R]], max_workers: int = 4,
+                 limit: Optional[int] = None) -> List[R]:
+    """
+    Run fetch(item) for the items with at most `max_workers` in flight.
+    fetch returns None (or raises) for an unusable item.
+    Returns the usable results in item order, at most `limit` of them.
+    """
+    if not items or limit == 0:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items))))
+    futures = [executor.submit(fetch, item) for item in items]
+    results = []
+    next_rank = 0
+    try:
+        pending = set(futures)
+        while next_rank < len(futures):
+            # Consume finished items in rank order; stop at the first unfinished one
+            while next_rank < len(futures) and futures[next_rank].done():
+                try:
+                    result = futures[next_rank].result()
+                except Exception as e:
+                    print(f"Fetch failed for {items[next_rank]}: {e}")
+                    result = None
+                next_rank += 1
+                if result is not None:
+                    results.append(result)
+                    if limit is not None and len(results) >= limit:
+                        return results
+            if next_rank < len(futures):
+                pending = {f for f in pending if not f.done()}
+                wait(pending, return_when=FIRST_COMPLETED)
+        return results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
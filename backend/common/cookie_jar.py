@@ -0,0 +1,170 @@
+# cookie_jar.py
+"""
+Carries Cloudflare clearance cookies from browser sessions to the HTTP client.
+
+When a pooled browser gets past a challenge, its clearance and session
+cookies (plus the User-Agent they were issued to - cf_clearance is bound to
+it) are copied into the shared requests session. Until they expire, plain
+HTTP GETs to the same site pass the challenge without a browser.
+"""
+import os
+import time
+import threading
+from typing import Dict, List, Optional
+
+CLEARANCE_COOKIES = {"cf_clearance", "__cf_bm", "__cfruid", "_cfuvid"}
+SESSION_COOKIE_HINTS = ("sess", "csrf", "39ce7")  # 39ce7 is Codeforces' session cookie
+
+# Browser session cookies have no expiry; assume they stay valid this long
+SESSION_COOKIE_TTL = int(os.getenv("SESSION_COOKIE_TTL", "1800"))
+
+_lock = threading.Lock()
+# cookie domain (no leading dot) -> {"cookies": [...], "user_agent": str, "harvested_at": float}
+_jar: Dict[str, Dict] = {}
+_stats = {"harvests": 0, "invalidations": 0}
+
+
+def _wanted(name: str) -> bool:
+    lowered = name.lower()
+    return name in CLEARANCE_COOKIES or any(hint in lowered for hint in SESSION_COOKIE_HINTS)
+
+
+def _domain_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def _host(url_or_host: str) -> str:
+    host = url_or_host.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0]
+    return host.lower()
+
+
+def harvest_from_driver(driver, session=None) -> int:
+    """
+    Copy clearance/session cookies from a browser that just loaded a real
+    (non-challenge) page. Returns the number of cookies taken.
+    """
+    try:
+        browser_cookies = driver.get_cookies()
+        user_agent = driver.execute_script("return navigator.userAgent")
+    except Exception as e:
+        print(f"Could not read browser cookies: {e}")
+        return 0
+
+    now = time.time()
+    by_domain: Dict[str, List[Dict]] = {}
+    for cookie in browser_cookies:
+        if not _wanted(cookie.get("name", "")):
+            continue
+        domain = cookie.get("domain", "").lstrip(".").lower()
+        if not domain:
+            continue
+        by_domain.setdefault(domain, []).append({
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "domain": cookie.get("domain"),
+            "path": cookie.get("path", "/"),
+            "secure": cookie.get("secure", False),
+            "expires": cookie.get("expiry") or int(now + SESSION_COOKIE_TTL),
+            "clearance": cookie["name"] in CLEARANCE_COOKIES,
+        })
+
+    if not by_domain:
+        return 0
+
+    with _lock:
+        for domain, cookies in by_domain.items():
+            _jar[domain] = {"cookies": cookies, "user_agent": user_agent, "harvested_at": now}
+        _stats["harvests"] += 1
+
+    if session is not None:
+        for cookies in by_domain.values():
+            _load_into_session(session, cookies)
+
+    return sum(len(cookies) for cookies in by_domain.values())
+
+
+def _load_into_session(session, cookies: List[Dict]):
+    for cookie in cookies:
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie["domain"],
+            path=cookie["path"],
+            secure=cookie["secure"],
+            expires=cookie["expires"],
+        )
+
+
+def _live_entries(host: str) -> List[Dict]:
+    # Caller holds _lock; drops expired cookies as a side effect
+    now = time.time()
+    entries = []
+    for domain, entry in list(_jar.items()):
+        if not _domain_matches(host, domain):
+            continue
+        entry["cookies"] = [c for c in entry["cookies"] if c["expires"] > now]
+        if entry["cookies"]:
+            entries.append(entry)
+        else:
+            del _jar[domain]
+    return entries
+
+
+def request_headers(url: str) -> Dict[str, str]:
+    """
+    Extra headers for an HTTP request to `url`: the User-Agent the stored
+    cookies were issued to, if we hold any for that host.
+    """
+    with _lock:
+        entries = _live_entries(_host(url))
+    if entries and entries[0].get("user_agent"):
+        return {"User-Agent": entries[0]["user_agent"]}
+    return {}
+
+
+def clearance_expires_at(url_or_host: str) -> Optional[float]:
+    """Expiry timestamp of the clearance cookie for a host, or None."""
+    with _lock:
+        entries = _live_entries(_host(url_or_host))
+        expiries = [c["expires"] for e in entries for c in e["cookies"] if c["clearance"]]
+    return min(expiries) if expiries else None
+
+
+def has_clearance(url_or_host: str) -> bool:
+    return clearance_expires_at(url_or_host) is not None
+
+
+def invalidate(url_or_host: str, session=None):
+    """Forget cookies for a host that got challenged despite holding them."""
+    host = _host(url_or_host)
+    with _lock:
+        dropped = [domain for domain in _jar if _domain_matches(host, domain)]
+        for domain in dropped:
+            del _jar[domain]
+        if dropped:
+            _stats["invalidations"] += 1
+
+    if session is not None:
+        for domain in dropped:
+            for cookie_domain in (domain, "." + domain):
+                try:
+                    session.cookies.clear(domain=cookie_domain)
+                except KeyError:
+                    pass
+
+
+def jar_stats() -> Dict:
+    """Stored cookie names and expiries per domain."""
+    now = time.time()
+    with _lock:
+        domains = {
+            domain: {
+                "cookies": [c["name"] for c in entry["cookies"]],
+                "clearance_expires_in": min(
+                    [int(c["expires"] - now) for c in entry["cookies"] if c["clearance"]] or [0]
+                ),
+                "harvested_at": int(entry["harvested_at"]),
+            }
+            for domain, entry in _jar.items()
+        }
+        return {**_stats, "domains": domains}
@@ -0,0 +1,136 @@
+# discuss_ranking.py
+"""
+Rank CodeChef Discuss (Discourse) search results before fetching topics.
+
+search.json already says a lot about each topic: its title, category and
+tags, and for the matching posts the author and like count. Topics are
+scored on those signals, and only the best few are downloaded, so posts[0]
+is usually the official editorial and unrelated threads cost no round trip.
+
+Configuration (environment variables):
+    CC_DISCUSS_TOP_K             topics fetched per search (default 3)
+    CC_EDITORIAL_CATEGORY_IDS    comma-separated editorial category ids; when
+                                 unset they are looked up once in /categories.json
+    CC_EDITORIAL_AUTHORS         comma-separated handles of editorial writers
+"""
+import os
+import re
+import math
+import time
+import threading
+from typing import Dict, List, Set
+
+import http_client
+
+DISCUSS_BASE = "https://discuss.codechef.com"
+
+TOP_K = int(os.getenv("CC_DISCUSS_TOP_K", "3"))
+EDITORIAL_AUTHORS = {
+    handle.strip().lower()
+    for handle in os.getenv("CC_EDITORIAL_AUTHORS", "").split(",")
+    if handle.strip()
+}
+
+# Titles of threads asking for help rather than explaining
+BAD_TITLE_WORDS = ["help", "doubt", "error", "stuck", "solve", "solution needed", "please help"]
+TITLE_WORD_SCORES = {"editorial": 25, "explanation": 10, "approach": 10, "tutorial": 10, "solution": 5}
+
+EXACT_CODE_SCORE = 50
+EDITORIAL_CATEGORY_SCORE = 40
+EDITORIAL_TAG_SCORE = 20
+AUTHOR_SCORE = 30
+
+CATEGORY_RETRY = 3600
+
+_category_lock = threading.Lock()
+_category_ids = None
+_category_checked_at = 0.0
+
+
+def editorial_category_ids() -> Set[int]:
+    """Ids of the editorial categories (and their subcategories)."""
+    global _category_ids, _category_checked_at
+    configured = os.getenv("CC_EDITORIAL_CATEGORY_IDS")
+    if configured:
+        return {int(c) for c in configured.split(",") if c.strip().isdigit()}
+
+    with _category_lock:
+        if _category_ids is not None or time.time() - _category_checked_at < CATEGORY_RETRY:
+            return _category_ids or set()
+        _category_checked_at = time.time()
+        try:
+            res = http_client.get(f"{DISCUSS_BASE}/categories.json",
+                                  params={"include_subcategories": "true"},
+                                  headers={"Accept": "application/json"})
+            res.raise_for_status()
+            ids = set()
+            for category in res.json().get("category_list", {}).get("categories", []):
+                parent_is_editorial = "editorial" in (category.get("slug", "") + category.get("name", "")).lower()
+                if parent_is_editorial:
+                    ids.add(category["id"])
+                for sub in category.get("subcategory_list", []) or []:
+                    if parent_is_editorial or "editorial" in (sub.get("slug", "") + sub.get("name", "")).lower():
+                        ids.add(sub["id"])
+            _category_ids = ids
+            print(f"Discuss editorial categories: {sorted(ids)}")
+        except Exception as e:
+            print(f"Could not load Discuss categories: {e}")
+        return _category_ids or set()
+
+
+def _post_signals(search_data: Dict) -> Dict[int, Dict]:
+    """topic id -> {"likes", "author"} from the search result's matching posts."""
+    signals = {}
+    for post in search_data.get("posts", []):
+        topic_signals = signals.setdefault(post.get("topic_id"), {"likes": 0, "author": None})
+        topic_signals["likes"] = max(topic_signals["likes"], post.get("like_count", 0) or 0)
+        if post.get("post_number") == 1 or topic_signals["author"] is None:
+            topic_signals["author"] = (post.get("username") or "").lower()
+    return signals
+
+
+def score_topic(topic: Dict, problem_code: str, signals: Dict, category_ids: Set[int]) -> float:
+    """
+    Relevance of one search topic; 0 means "not an explanation of this problem".
+    Problem-code, like and reply signals only add to a topic that already
+    looks like an editorial (title word, category, tag or author).
+    """
+    title = topic.get("title", "").lower()
+    if any(bad in title for bad in BAD_TITLE_WORDS):
+        return 0
+
+    editorial_score = sum(score for word, score in TITLE_WORD_SCORES.items() if word in title)
+    if topic.get("category_id") in category_ids:
+        editorial_score += EDITORIAL_CATEGORY_SCORE
+    tags = [str(tag.get("name", tag) if isinstance(tag, dict) else tag).lower() for tag in topic.get("tags", []) or []]
+    if "editorial" in tags:
+        editorial_score += EDITORIAL_TAG_SCORE
+    if signals.get("author") in EDITORIAL_AUTHORS:
+        editorial_score += AUTHOR_SCORE
+    if editorial_score == 0:
+        return 0
+
+    score = editorial_score
+    if re.search(rf'\b{re.escape(problem_code.lower())}\b', title) or problem_code.lower() in tags:
+        score += EXACT_CODE_SCORE
+    score += 5 * math.log1p(signals.get("likes", 0))
+    score += 2 * math.log1p(topic.get("posts_count", 0) or 0)
+    return score
+
+
+def rank_topics(search_data: Dict, problem_code: str, top_k: int = TOP_K) -> List[Dict]:
+    """The top_k relevant topics of a search.json response, best first."""
+    topics = search_data.get("topics", [])
+    if not topics:
+        return []
+    category_ids = editorial_category_ids()
+    signals = _post_signals(search_data)
+
+    scored = []
+    for rank, topic in enumerate(topics):
+        score = score_topic(topic, problem_code, signals.get(topic.get("id"), {}), category_ids)
+        if score > 0:
+            # Ties keep Discourse's own order
+            scored.append((-score, rank, topic))
+    scored.sort(key=lambda item: (item[0], item[1]))
+    return [topic for _, _, topic in scored[:top_k]]
@@ -0,0 +1,157 @@
+# editorial_cleaner.py
+"""
+Editorial text cleanup shared by the Codeforces and CodeChef scrapers.
+
+Both sites used to carry their own clean_editorial_text with a dozen
+re.sub passes and two split/join cycles over the whole text. This module
+produces the same output per site ("profile") with precompiled patterns,
+passes that are skipped when their trigger characters are absent, and one
+pass over the lines that also does the final whitespace normalization.
+
+    clean_editorial_text(text, "codeforces")
+    clean_many(texts, "codechef")
+
+bench_editorial_cleaner.py checks the output against the previous
+implementations on a fixture corpus and reports MB/s before and after.
+"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List
+
+PROFILES = {
+    # MathJax leaves variables on lines of their own; merge them back in
+    "codeforces": {
+        "collapse_spaces_first": False,
+        "latex_fixes": True,
+        "math_symbols": True,
+        "merge_short_lines": True,
+        "header_spacing": True,
+        "keep_short": re.compile(r'^[A-Z]$|^\d+$|^-$|^\*$'),
+    },
+    "codechef": {
+        "collapse_spaces_first": True,
+        "latex_fixes": False,
+        "math_symbols": False,
+        "merge_short_lines": False,
+        "header_spacing": False,
+        "keep_short": re.compile(r'^[A-Z]$|^\d+$'),
+    },
+}
+
+EXTRA_NEWLINES = re.compile(r'\n{3,}')
+EXTRA_SPACES = re.compile(r' {2,}')
+# word \n single_char \n word -> word single_char word
+ISOLATED_VARIABLE = re.compile(r'(\w)\s*\n\s*([A-Za-z])\s*\n\s*(\w)')
+# \n single_lowercase_char \n (not at a line start) -> space
+STRAY_LETTER = re.compile(r'(?<!^)(?<!\n)\n([a-z])\n(?!\n)', re.MULTILINE)
+# "(\n)" -> "()", same for [] and {}
+SPLIT_BRACKETS = re.compile(r'\(\s*\n\s*\)|\[\s*\n\s*\]|{\s*\n\s*}')
+SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+([,.])')
+PROBLEM_HEADER = re.compile(r'^\d+[A-Z]\s*-')
+
+# Applied one symbol at a time, in this order, to keep the original spacing
+MATH_SYMBOLS = [
+    ('⋅', re.compile(r'\s*⋅\s*'), ' * '),
+    ('≠', re.compile(r'\s*≠\s*'), ' != '),
+    ('≤', re.compile(r'\s*≤\s*'), ' <= '),
+    ('≥', re.compile(r'\s*≥\s*'), ' >= '),
+    ('→', re.compile(r'\s*→\s*'), ' -> '),
+]
+
+
+def _join_brackets(match) -> str:
+    return match.group(0)[0] + match.group(0)[-1]
+
+
+def clean_editorial_text(text: str, profile: str = "codeforces") -> str:
+    """
+    Clean up editorial text to make it more readable.
+    Removes excessive newlines and spaces, LaTeX artifacts, etc.
+    """
+    if not text:
+        return ""
+    options = PROFILES[profile]
+
+    text = EXTRA_NEWLINES.sub('\n\n', text)
+    if options["collapse_spaces_first"]:
+        text = EXTRA_SPACES.sub(' ', text)
+
+    if options["latex_fixes"]:
+        text = ISOLATED_VARIABLE.sub(r'\1 \2 \3', text)
+        text = STRAY_LETTER.sub(' ', text)
+        if '(' in text or '[' in text or '{' in text:
+            text = SPLIT_BRACKETS.sub(_join_brackets, text)
+        text = SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+        text = text.replace('\\n', ' ')
+    else:
+        text = text.replace('\\n', ' ')
+        text = SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+
+    if options["math_symbols"]:
+        for symbol, pattern, replacement in MATH_SYMBOLS:
+            if symbol in text:
+                text = pattern.sub(replacement, text)
+
+    # One pass over the lines: drop/merge artifacts, keep single paragraph
+    # breaks, and normalize spaces on the lines that are kept
+    keep_short = options["keep_short"].match
+    merge_short_lines = options["merge_short_lines"]
+    header_spacing = options["header_spacing"]
+    collapse = EXTRA_SPACES.sub
+    lines = text.split('\n')
+    last = len(lines) - 1
+    cleaned = []
+    carry = None
+
+    for i, line in enumerate(lines):
+        if carry is not None:
+            line, carry = carry, None
+        stripped = line.strip()
+
+        # Keep empty lines for paragraph breaks, never two in a row
+        if not stripped:
+            if cleaned and cleaned[-1]:
+                cleaned.append('')
+            continue
+
+        if header_spacing and PROBLEM_HEADER.match(stripped):
+            if cleaned and cleaned[-1]:
+                cleaned.append('')
+            cleaned.append(collapse(' ', line).strip())
+            continue
+
+        # Lines of 1-2 characters are usually LaTeX artifacts
+        if len(stripped) <= 2 and not keep_short(stripped):
+            if merge_short_lines and i < last:
+                next_stripped = lines[i + 1].strip()
+                if len(next_stripped) > 3:
+                    carry = stripped + ' ' + next_stripped
+            continue
+
+        cleaned.append(collapse(' ', line).strip())
+
+    return '\n'.join(cleaned).strip()
+
+
+def _clean_chunk(args) -> List[str]:
+    texts, profile = args
+    return [clean_editorial_text(text, profile) for text in texts]
+
+
+def clean_many(texts: Iterable[str], profile: str = "codeforces", processes: int = 0,
+               chunk_size: int = 64) -> List[str]:
+    """
+    Clean many documents, in input order.
+    With processes > 1 the corpus is split into chunks cleaned in worker
+    processes (worth it for large batches only; the work is pure CPU).
+    """
+    texts = list(texts)
+    if processes <= 1 or len(texts) <= chunk_size:
+        return [clean_editorial_text(text, profile) for text in texts]
+
+    chunks = [(texts[i:i + chunk_size], profile) for i in range(0, len(texts), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for chunk in executor.map(_clean_chunk, chunks):
+            results.extend(chunk)
+    return results
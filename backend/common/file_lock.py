@@ -0,0 +1,73 @@
+# file_lock.py
+"""
+Cross-process advisory file lock (fcntl on Linux/macOS, msvcrt on Windows).
+
+Used to coordinate uvicorn workers on the same machine, e.g. so that only
+one of them runs a background crawler.
+"""
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Usage:
+        lock = FileLock("/tmp/thing.lock")
+        if lock.acquire(blocking=False):
+            try:
+                ...
+            finally:
+                lock.release()
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    def acquire(self, blocking: bool = True, timeout: float = None) -> bool:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if timeout is None else time.time() + timeout
+
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                self._fd = fd
+                return True
+            except OSError:
+                if not blocking or (deadline is not None and time.time() >= deadline):
+                    os.close(fd)
+                    return False
+                time.sleep(0.05)
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,107 @@
+# html_parsing.py
+"""
+Targeted HTML parsing for the scrapers.
+
+Most call sites read one or two containers out of a large page. Parsing
+with lxml (when installed) and a SoupStrainer only builds those subtrees,
+which is several times faster than a full "html.parser" parse. When the
+targeted parse finds nothing (layout changed, container missing), the page
+is parsed in full so the caller's fallbacks still see everything.
+
+    soup = parse(html, "cf_blog", SoupStrainer("div", class_="ttypography"))
+
+Every call is timed per label; parse_stats() reports the numbers.
+"""
+import time
+import threading
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict] = {}
+
+
+def _record(label: str, mode: str, elapsed: float):
+    with _lock:
+        stats = _stats.setdefault(label, {"calls": 0, "targeted": 0, "full": 0, "fallbacks": 0,
+                                          "total_ms": 0.0, "max_ms": 0.0})
+        stats["calls"] += 1
+        stats["fallbacks" if mode == "fallback" else mode] += 1
+        stats["total_ms"] += elapsed * 1000
+        stats["max_ms"] = max(stats["max_ms"], elapsed * 1000)
+    # Timings are in parse_stats(); only a fallback (targets missed) is worth a log line
+    if mode == "fallback":
+        print(f"Parsed {label} in full after targeted parse found nothing ({elapsed * 1000:.1f}ms, {PARSER})")
+
+
+class _AnyStrainer(SoupStrainer):
+    """A SoupStrainer letting through a tag that any of several strainers accepts."""
+
+    def __init__(self, strainers: List[SoupStrainer]):
+        super().__init__()
+        self.strainers = strainers
+
+    # bs4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return any(s.allow_tag_creation(nsprefix, name, attrs) for s in self.strainers)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+    # bs4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        for strainer in self.strainers:
+            found = strainer.search_tag(markup_name, markup_attrs)
+            if found:
+                return found
+        return None
+
+
+def parse_any(html: str, label: str, targets: Optional[List[SoupStrainer]] = None,
+              fallback: bool = True) -> BeautifulSoup:
+    """
+    Parse only the subtrees matching any of `targets`, in one pass over the
+    document; the subtrees keep their document order.
+    Without targets, or when nothing matches and `fallback` is set, the
+    whole page is parsed.
+    """
+    start = time.perf_counter()
+    if not targets:
+        soup = BeautifulSoup(html or "", PARSER)
+        _record(label, "full", time.perf_counter() - start)
+        return soup
+
+    only = targets[0] if len(targets) == 1 else _AnyStrainer(targets)
+    soup = BeautifulSoup(html or "", PARSER, parse_only=only)
+
+    if soup.find() is None and fallback:
+        soup = BeautifulSoup(html or "", PARSER)
+        _record(label, "fallback", time.perf_counter() - start)
+        return soup
+
+    _record(label, "targeted", time.perf_counter() - start)
+    return soup
+
+
+def parse(html: str, label: str, only: Optional[SoupStrainer] = None, fallback: bool = True) -> BeautifulSoup:
+    """Parse the subtrees matching `only` (whole page if None); see parse_any."""
+    return parse_any(html, label, [only] if only is not None else None, fallback)
+
+
+def parse_stats() -> Dict:
+    with _lock:
+        return {
+            "parser": PARSER,
+            "by_label": {
+                label: {**s, "avg_ms": round(s["total_ms"] / s["calls"], 2),
+                        "total_ms": round(s["total_ms"], 1), "max_ms": round(s["max_ms"], 1)}
+                for label, s in _stats.items()
+            },
+        }
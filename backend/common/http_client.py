@@ -0,0 +1,262 @@
+# http_client.py
+"""
+Shared HTTP client for all outbound scraping and API calls.
+
+One requests.Session per process with:
+- per-host keep-alive connection pools (urllib3), so repeated calls to the
+  same host skip the TCP + TLS handshake
+- a default timeout on every request
+- transparent gzip/deflate, plus brotli when the `brotli` package is installed
+- a small TTL cache in front of DNS resolution, used only by this
+  session's connection pools (socket.getaddrinfo itself is left alone, so
+  Selenium and other libraries resolve as usual)
+- per-host request / new-connection counters (see connection_stats())
+- opt-in conditional GETs (ETag / Last-Modified) that replay the stored
+  body on 304 Not Modified
+
+Configuration (environment variables):
+    HTTP_TIMEOUT                  default timeout in seconds (default 10)
+    HTTP_POOL_HOSTS               number of per-host pools kept alive (default 16)
+    HTTP_POOL_MAXSIZE             connections kept per host (default 16)
+    DNS_CACHE_TTL                 seconds a DNS answer is reused (default 300)
+    HTTP_CONDITIONAL_CACHE_BYTES  bodies kept for conditional GETs (default 16 MB)
+"""
+import os
+import time
+import socket
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util import connection
+
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "16"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", "300"))
+CONDITIONAL_CACHE_BYTES = int(os.getenv("HTTP_CONDITIONAL_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+try:
+    import brotli  # noqa: F401  (urllib3 decodes "br" bodies when it is importable)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+}
+
+_session = None
+_adapter = None
+_session_lock = threading.Lock()
+
+# url -> validators + body of the last 200 response, for conditional GETs
+_conditional: "OrderedDict[tuple, Dict]" = OrderedDict()
+_conditional_bytes = 0
+_conditional_lock = threading.Lock()
+_conditional_stats = {"not_modified": 0, "modified": 0, "unconditional": 0}
+
+
+# ---------- DNS cache ----------
+
+_dns_cache: Dict[tuple, tuple] = {}
+_dns_lock = threading.Lock()
+_dns_stats = {"hits": 0, "misses": 0}
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = args + tuple(sorted(kwargs.items()))
+    now = time.time()
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+        if cached and cached[0] > now:
+            _dns_stats["hits"] += 1
+            return cached[1]
+        _dns_stats["misses"] += 1
+
+    result = socket.getaddrinfo(*args, **kwargs)
+    with _dns_lock:
+        _dns_cache[key] = (now + DNS_CACHE_TTL, result)
+    return result
+
+
+class _CachedDNSMixin:
+    """urllib3 connection that resolves its host through the DNS cache, then connects by address."""
+
+    def _new_conn(self):
+        host = self._dns_host.strip("[]")
+        try:
+            addresses = _cached_getaddrinfo(host, self.port, connection.allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NewConnectionError(self, f"Failed to resolve '{host}' ({e})") from e
+
+        error = NewConnectionError(self, f"Failed to resolve '{host}' (no addresses)")
+        for address in addresses:
+            sockaddr = address[4]
+            try:
+                return connection.create_connection(
+                    (sockaddr[0], sockaddr[1]), self.timeout,
+                    source_address=self.source_address, socket_options=self.socket_options
+                )
+            except socket.timeout:
+                error = ConnectTimeoutError(self, f"Connection to {host} timed out. (connect timeout={self.timeout})")
+            except OSError as e:
+                error = NewConnectionError(self, f"Failed to establish a new connection: {e}")
+        raise error
+
+
+class _CachedDNSHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools use the DNS cache."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        if DNS_CACHE_TTL > 0:
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": _CachedDNSHTTPConnectionPool,
+                "https": _CachedDNSHTTPSConnectionPool,
+            }
+
+
+# ---------- session ----------
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session."""
+    global _session, _adapter
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = CachedDNSAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(BROWSER_HEADERS)
+                _adapter = adapter
+                _session = session
+    return _session
+
+
+# ---------- conditional requests ----------
+
+def _conditional_key(url: str, kwargs: dict) -> tuple:
+    params = kwargs.get("params") or {}
+    accept = (kwargs.get("headers") or {}).get("Accept", "")
+    return (url, tuple(sorted((str(k), str(v)) for k, v in dict(params).items())), accept)
+
+
+def _conditional_lookup(key: tuple) -> Optional[Dict]:
+    with _conditional_lock:
+        entry = _conditional.get(key)
+        if entry:
+            _conditional.move_to_end(key)
+        return entry
+
+
+def _conditional_store(key: tuple, response: requests.Response):
+    global _conditional_bytes
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    content = response.content
+    with _conditional_lock:
+        old = _conditional.pop(key, None)
+        if old:
+            _conditional_bytes -= len(old["content"])
+        if not (etag or last_modified) or len(content) > CONDITIONAL_CACHE_BYTES:
+            return
+        _conditional[key] = {"etag": etag, "last_modified": last_modified,
+                             "content": content, "encoding": response.encoding}
+        _conditional_bytes += len(content)
+        while _conditional_bytes > CONDITIONAL_CACHE_BYTES:
+            _, evicted = _conditional.popitem(last=False)
+            _conditional_bytes -= len(evicted["content"])
+
+
+def get(url: str, conditional: bool = False, **kwargs) -> requests.Response:
+    """
+    session.get() with the default timeout.
+
+    With conditional=True the validators (ETag / Last-Modified) of the last
+    200 response for the same URL are sent along; when the server answers
+    304 the stored body is replayed as a 200 and response.not_modified is
+    True, so callers read the body as usual.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    if not conditional:
+        return get_session().get(url, **kwargs)
+
+    key = _conditional_key(url, kwargs)
+    stored = _conditional_lookup(key)
+    if stored:
+        headers = dict(kwargs.get("headers") or {})
+        if stored["etag"]:
+            headers["If-None-Match"] = stored["etag"]
+        if stored["last_modified"]:
+            headers["If-Modified-Since"] = stored["last_modified"]
+        kwargs["headers"] = headers
+
+    response = get_session().get(url, **kwargs)
+    response.not_modified = False
+    if response.status_code == 304 and stored:
+        response.status_code = 200
+        response._content = stored["content"]
+        response.encoding = stored["encoding"]
+        response.not_modified = True
+        with _conditional_lock:
+            _conditional_stats["not_modified"] += 1
+    elif response.status_code == 200:
+        _conditional_store(key, response)
+        with _conditional_lock:
+            _conditional_stats["modified" if stored else "unconditional"] += 1
+    return response
+
+
+def connection_stats() -> Dict:
+    """
+    Per-host request and new-connection counts for the live pools.
+    reused = requests served over an already-open connection.
+    """
+    hosts = {}
+    if _adapter is not None:
+        pools = _adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            entry = hosts.setdefault(pool.host, {"requests": 0, "connections": 0})
+            entry["requests"] += pool.num_requests
+            entry["connections"] += pool.num_connections
+
+    for entry in hosts.values():
+        entry["reused"] = max(0, entry["requests"] - entry["connections"])
+
+    with _dns_lock:
+        dns = {**_dns_stats, "cached_names": len(_dns_cache)}
+
+    with _conditional_lock:
+        conditional = {**_conditional_stats, "entries": len(_conditional), "bytes": _conditional_bytes}
+
+    return {"hosts": hosts, "dns_cache": dns, "conditional": conditional, "accept_encoding": ACCEPT_ENCODING}
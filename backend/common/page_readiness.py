@@ -0,0 +1,149 @@
+# page_readiness.py
+"""
+Per-site page readiness conditions for the Selenium scrapers.
+
+Instead of sleeping a fixed number of seconds after driver.get(), callers
+wait until the DOM they actually read is present. Chrome runs with the
+"eager" page-load strategy (see browser_pool), so driver.get() returns at
+DOMContentLoaded and these conditions decide when the page is usable.
+
+Every wait is timed per site so the selectors and timeouts can be tuned
+from real numbers (see readiness_stats()).
+"""
+import time
+import threading
+from collections import deque
+from typing import Dict, List
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from resource_blocking import apply_blocking, collect_page_stats
+
+# site key -> CSS selectors (any one present means ready), timeout in seconds,
+# and raw-HTML markers used to accept a plain HTTP response for the same page
+SITE_CONDITIONS: Dict[str, Dict] = {
+    "codeforces_problem": {
+        "selectors": ["#sidebar", "div.problem-statement"],
+        "html_markers": ['id="sidebar"', 'class="problem-statement"'],
+        "timeout": 8,
+    },
+    "codeforces_blog": {
+        "selectors": ["div.ttypography"],
+        "html_markers": ["ttypography"],
+        "timeout": 10,
+    },
+    "codechef_problem": {
+        "selectors": ["#problem-statement", "[class*='problem-statement']", "[class*='problemStatement']"],
+        "html_markers": ["problem-statement", "problemStatement"],
+        "timeout": 15,
+    },
+    "codechef_editorial": {
+        "selectors": ["div.cooked", "[class*='editorial']", "[class*='post']"],
+        "html_markers": ['class="cooked"'],
+        "timeout": 10,
+    },
+}
+
+DEFAULT_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+RECENT_SAMPLES = 50
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict] = {}
+
+
+def _any_selector_present(selectors: List[str]):
+    def condition(driver):
+        for selector in selectors:
+            if driver.find_elements(By.CSS_SELECTOR, selector):
+                return selector
+        return False
+    return condition
+
+
+def _record(site: str, elapsed: float, ready: bool, selector: str = None):
+    with _stats_lock:
+        entry = _stats.setdefault(site, {
+            "waits": 0,
+            "timeouts": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+            "matched": {},
+            "recent": deque(maxlen=RECENT_SAMPLES),
+        })
+        entry["waits"] += 1
+        entry["total_seconds"] += elapsed
+        entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+        entry["recent"].append(round(elapsed, 3))
+        if ready:
+            entry["matched"][selector] = entry["matched"].get(selector, 0) + 1
+        else:
+            entry["timeouts"] += 1
+
+
+def wait_until_ready(driver, site: str, timeout: float = None) -> bool:
+    """
+    Block until one of the site's readiness selectors is in the DOM.
+
+    Returns True when the page became ready, False on timeout (callers
+    usually continue with whatever page_source is available).
+    """
+    condition = SITE_CONDITIONS.get(site, {})
+    selectors = condition.get("selectors", ["body"])
+    if timeout is None:
+        timeout = condition.get("timeout", DEFAULT_TIMEOUT)
+
+    start = time.perf_counter()
+    try:
+        selector = WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            _any_selector_present(selectors)
+        )
+        _record(site, time.perf_counter() - start, True, selector)
+        return True
+    except TimeoutException:
+        elapsed = time.perf_counter() - start
+        _record(site, elapsed, False)
+        print(f"Warning: {site} not ready after {elapsed:.1f}s, continuing anyway...")
+        return False
+
+
+def load_page(driver, url: str, site: str, timeout: float = None) -> Dict:
+    """
+    Navigate with the site's resource blocklist installed and wait until the
+    page is ready.
+
+    Returns:
+        dict: {"ready": bool, "resources": blocked/loaded request counts}
+    """
+    apply_blocking(driver, site)
+    driver.get(url)
+    ready = wait_until_ready(driver, site, timeout)
+    return {"ready": ready, "resources": collect_page_stats(driver, site)}
+
+
+def html_looks_ready(html: str, site: str) -> bool:
+    """
+    Cheap check that a raw (non-rendered) HTML body already contains the
+    site's content, i.e. that a browser render is not needed.
+    """
+    markers = SITE_CONDITIONS.get(site, {}).get("html_markers")
+    if not markers:
+        return bool(html)
+    return any(marker in html for marker in markers)
+
+
+def readiness_stats() -> Dict[str, Dict]:
+    """Per-site wait timings: counts, timeouts, avg/max and recent samples."""
+    with _stats_lock:
+        report = {}
+        for site, entry in _stats.items():
+            report[site] = {
+                "waits": entry["waits"],
+                "timeouts": entry["timeouts"],
+                "avg_seconds": round(entry["total_seconds"] / entry["waits"], 3),
+                "max_seconds": round(entry["max_seconds"], 3),
+                "matched_selectors": dict(entry["matched"]),
+                "recent_seconds": list(entry["recent"]),
+            }
+        return report
@@ -0,0 +1,161 @@
+# resource_blocking.py
+"""
+Resource blocking for the headless browsers, via Chrome DevTools.
+
+The scrapers only read driver.page_source, so images, fonts, stylesheets,
+media, math rendering and analytics are dead weight. Before each navigation
+the blocklist for the page's site is pushed with Network.setBlockedURLs.
+
+Limits of this approach:
+- Network.setBlockedURLs only matches URLs, so the resource-type rules
+  (image, font, stylesheet, ...) are approximated by file extension and
+  host patterns; a stylesheet served without ".css" in its URL still loads.
+- Chrome's URL blocklist has no allow rules, so a site allowlist can only
+  exempt whole rules for that site; there is no per-site allowlist of
+  individual scripts (scripts are not blocked by type at all, only the
+  math renderers and trackers listed below).
+
+With BROWSER_NETWORK_STATS=1 the drivers record performance logs and each
+page load reports requests blocked vs. loaded. Loaded bytes are measured
+(encodedDataLength); bytes_avoided_estimate is NOT measured - blocked
+requests never transfer anything, so it is a rough figure from
+TYPICAL_BYTES per resource type.
+
+Configuration (environment variables):
+    BROWSER_BLOCKING_PROFILE   off | light | aggressive (default aggressive)
+    BROWSER_NETWORK_STATS      1 = record per-page network stats (default 0)
+"""
+import os
+import json
+import threading
+from typing import Dict, List
+
+# rule name -> URL patterns (Chrome wildcard syntax)
+RESOURCE_RULES: Dict[str, List[str]] = {
+    "image": ["*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+              "*.webp", "*.webp?*", "*.svg", "*.svg?*", "*.ico", "*.ico?*"],
+    "font": ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*",
+             "*.eot", "*.eot?*"],
+    "stylesheet": ["*.css", "*.css?*"],
+    "media": ["*.mp4", "*.mp4?*", "*.webm", "*.webm?*", "*.mp3", "*.mp3?*"],
+    "math_render": ["*MathJax.js*", "*mathjax*", "*katex*"],
+    "tracker": ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                "*googlesyndication.com*", "*adservice.google.*", "*connect.facebook.net*",
+                "*mc.yandex.ru*", "*hotjar.com*", "*clarity.ms*", "*amplitude.com*",
+                "*segment.io*", "*sentry.io*"],
+}
+
+BLOCKING_PROFILES: Dict[str, List[str]] = {
+    "off": [],
+    "light": ["image", "media", "font", "tracker"],
+    "aggressive": ["image", "media", "font", "tracker", "stylesheet", "math_render"],
+}
+
+# site key -> rules NOT applied on that site
+SITE_ALLOWLISTS: Dict[str, List[str]] = {
+    # CodeChef renders statements client-side and its KaTeX output is part of
+    # the text we scrape; Codeforces blogs are read as raw TeX (same as over HTTP)
+    "codechef_problem": ["math_render"],
+    "codechef_editorial": ["math_render"],
+}
+
+BLOCKING_PROFILE = os.getenv("BROWSER_BLOCKING_PROFILE", "aggressive")
+# Performance logging costs every page load some CDP traffic, so it is opt-in
+NETWORK_STATS = os.getenv("BROWSER_NETWORK_STATS", "0") == "1"
+
+# Rough transfer sizes used to estimate (not measure) bytes avoided by blocked requests
+TYPICAL_BYTES = {
+    "Image": 40_000,
+    "Font": 60_000,
+    "Stylesheet": 30_000,
+    "Script": 80_000,
+    "Media": 500_000,
+    "Other": 5_000,
+}
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict] = {}
+
+
+def blocked_patterns(site: str, profile: str = None) -> List[str]:
+    """URL patterns to block for a site under the given profile."""
+    rules = BLOCKING_PROFILES.get(profile or BLOCKING_PROFILE, [])
+    allowed = set(SITE_ALLOWLISTS.get(site, []))
+    patterns = []
+    for rule in rules:
+        if rule not in allowed:
+            patterns.extend(RESOURCE_RULES[rule])
+    return patterns
+
+
+def apply_blocking(driver, site: str):
+    """Install the site's blocklist on a driver before navigating."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns(site)})
+        if NETWORK_STATS:
+            # Drop performance log entries left over from the previous page
+            driver.get_log("performance")
+    except Exception as e:
+        print(f"Could not apply resource blocking: {e}")
+
+
+def collect_page_stats(driver, site: str) -> Dict:
+    """
+    Summarize the network activity of the page load that just happened:
+    requests blocked (with a TYPICAL_BYTES estimate of what that saved) vs.
+    requests loaded and their measured bytes. All zeros unless
+    BROWSER_NETWORK_STATS is on.
+    """
+    report = {"blocked_requests": 0, "bytes_avoided_estimate": 0, "requests_loaded": 0, "bytes_loaded": 0}
+    if not NETWORK_STATS:
+        return report
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return report
+
+    request_types = {}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            request_types[params.get("requestId")] = params.get("type", "Other")
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            resource_type = params.get("type") or request_types.get(params.get("requestId"), "Other")
+            report["blocked_requests"] += 1
+            report["bytes_avoided_estimate"] += TYPICAL_BYTES.get(resource_type, TYPICAL_BYTES["Other"])
+        elif method == "Network.loadingFinished":
+            report["requests_loaded"] += 1
+            report["bytes_loaded"] += int(params.get("encodedDataLength", 0))
+
+    _record(site, report)
+    return report
+
+
+def _record(site: str, report: Dict):
+    with _stats_lock:
+        entry = _stats.setdefault(site, {
+            "page_loads": 0,
+            "blocked_requests": 0,
+            "bytes_avoided_estimate": 0,
+            "requests_loaded": 0,
+            "bytes_loaded": 0,
+        })
+        entry["page_loads"] += 1
+        for key, value in report.items():
+            entry[key] += value
+
+
+def blocking_stats() -> Dict:
+    """Per-site totals of blocked/loaded requests and bytes (avoided bytes are estimates)."""
+    with _stats_lock:
+        return {
+            "profile": BLOCKING_PROFILE,
+            "network_stats": NETWORK_STATS,
+            "sites": {site: dict(entry) for site, entry in _stats.items()}
+        }
@@ -0,0 +1,513 @@
+# scrape_cache.py
+"""
+Two-tier cache for scrape and API results, shared by all workers.
+
+Tier 1 is an in-process LRU bounded by the compressed size of its entries.
+Tier 2 is a SQLite file every uvicorn worker on the machine reads and
+writes, so a result fetched by one worker is a local read for the others.
+Values are stored as zlib-compressed JSON; every hit decodes a fresh copy,
+so callers may mutate what they get back.
+
+    @scrape_cache.cached("cf_blog_text", ttl=24 * 3600)
+    def fetch_blog_text(blog_url): ...
+
+Errors are not cached: by default None, empty values and dicts with an
+"error" key go straight back to the caller.
+
+Stale-while-revalidate: with stale_ttl, an entry older than ttl is still
+served (immediately) for another stale_ttl seconds while one background
+refresh per key, across all workers, re-runs the function. The refresh
+compares the new result's content hash with the stored one; when nothing
+changed only the expiry moves and the stored value is left alone. Upstream
+fetches made with http_client.get(conditional=True) turn such refreshes
+into 304 Not Modified round trips when the server sends validators.
+
+Negative caching: with negative=..., definite "nothing found" results
+(no editorial yet) are cached too, for a TTL the caller computes, e.g.
+growing with the contest's age. Requests inside request_scope() learn
+whether they were answered from a negative entry and may bypass them.
+
+Concurrent misses for the same call are coalesced with single_flight, so
+a burst of identical requests runs the scrape once.
+
+Configuration (environment variables):
+    SCRAPE_CACHE_PATH              SQLite file (default common/data/scrape_cache.db)
+    SCRAPE_CACHE_MEMORY_BYTES      compressed bytes kept in memory per process (default 32 MB)
+    SCRAPE_CACHE_REFRESH_WORKERS   background refreshes run at once per process (default 2)
+    SCRAPE_CACHE_DISABLED          set to 1 to bypass the cache entirely
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import inspect
+import threading
+import functools
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import single_flight
+
+CACHE_PATH = os.getenv(
+    "SCRAPE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "scrape_cache.db")
+)
+MEMORY_BYTES = int(os.getenv("SCRAPE_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+REFRESH_WORKERS = int(os.getenv("SCRAPE_CACHE_REFRESH_WORKERS", "2"))
+DISABLED = os.getenv("SCRAPE_CACHE_DISABLED", "") == "1"
+
+DEFAULT_TTL = 3600
+
+# Expired disk rows are swept once every this many writes
+PURGE_EVERY = 200
+
+# A worker's claim on refreshing an entry lapses after this long (crashed refresh)
+REFRESH_CLAIM_SECONDS = 300
+
+_lock = threading.Lock()
+# (namespace, key) -> (expires_at, blob); only fresh entries are served from memory
+_memory: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+_memory_bytes = 0
+_writes = 0
+_schema_ready = False
+_schema_lock = threading.Lock()
+_refreshing = set()
+_refresh_executor = None
+_stats = {"memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0, "stored": 0,
+          "evictions": 0, "expired": 0, "disk_errors": 0,
+          "refreshes": 0, "refresh_unchanged": 0, "refresh_changed": 0, "refresh_failures": 0,
+          "negative_hits": 0, "negative_stored": 0}
+_namespace_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=30)
+    if not _schema_ready:
+        with _schema_lock:
+            _ensure_schema(conn)
+    return conn
+
+
+def _ensure_schema(conn: sqlite3.Connection):
+    global _schema_ready
+    if not _schema_ready:
+        # WAL lets workers read while another one writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS entries (
+            namespace TEXT,
+            key TEXT,
+            expires_at REAL,
+            value BLOB,
+            stale_until REAL,
+            content_hash TEXT,
+            refresh_claimed_until REAL,
+            PRIMARY KEY (namespace, key)
+        )
+        """)
+        # Files written before stale-while-revalidate lack the newer columns
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+        for column, kind in (("stale_until", "REAL"), ("content_hash", "TEXT"), ("refresh_claimed_until", "REAL")):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE entries ADD COLUMN {column} {kind}")
+        conn.commit()
+        _schema_ready = True
+
+
+def _encode(value: Any) -> Tuple[bytes, str]:
+    """Compressed blob and content hash of a value."""
+    raw = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw), hashlib.sha1(raw).hexdigest()
+
+
+def _decode(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _count(namespace: str, name: str):
+    # Callers hold _lock
+    _stats[name] += 1
+    counters = _namespace_stats.setdefault(namespace, {"hits": 0, "stale_hits": 0, "misses": 0, "stored": 0})
+    if name in ("memory_hits", "disk_hits"):
+        counters["hits"] += 1
+    elif name in counters:
+        counters[name] += 1
+
+
+def _remember(key: Tuple[str, str], expires_at: float, blob: bytes):
+    """Put an entry in the memory tier and evict least recently used ones over the budget."""
+    global _memory_bytes
+    with _lock:
+        old = _memory.pop(key, None)
+        if old:
+            _memory_bytes -= len(old[1])
+        if len(blob) > MEMORY_BYTES:
+            return
+        _memory[key] = (expires_at, blob)
+        _memory_bytes += len(blob)
+        while _memory_bytes > MEMORY_BYTES:
+            _, (_, evicted) = _memory.popitem(last=False)
+            _memory_bytes -= len(evicted)
+            _stats["evictions"] += 1
+
+
+def _forget(key: Tuple[str, str]):
+    global _memory_bytes
+    with _lock:
+        old = _memory.pop(key, None)
+        if old:
+            _memory_bytes -= len(old[1])
+
+
+def lookup(namespace: str, key: str) -> Tuple[Optional[Any], bool]:
+    """
+    (value, fresh) for (namespace, key). A stale value (past its ttl but
+    within its stale window) comes back with fresh=False; (None, False)
+    is a miss.
+    """
+    if DISABLED:
+        return None, False
+    mkey = (namespace, key)
+    now = time.time()
+    with _lock:
+        entry = _memory.get(mkey)
+        if entry and entry[0] > now:
+            _memory.move_to_end(mkey)
+            _count(namespace, "memory_hits")
+            blob = entry[1]
+        else:
+            blob = None
+    if blob is not None:
+        return _decode(blob), True
+    if entry:
+        # Another worker may have refreshed it already; the disk copy decides
+        _forget(mkey)
+
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute(
+                "SELECT expires_at, value, stale_until FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Scrape cache read failed: {e}")
+        with _lock:
+            _stats["disk_errors"] += 1
+            _count(namespace, "misses")
+        return None, False
+
+    if row and row[0] > now:
+        _remember(mkey, row[0], row[1])
+        with _lock:
+            _count(namespace, "disk_hits")
+        return _decode(row[1]), True
+
+    if row and (row[2] or 0) > now:
+        with _lock:
+            _count(namespace, "stale_hits")
+        return _decode(row[1]), False
+
+    with _lock:
+        if row:
+            _stats["expired"] += 1
+        _count(namespace, "misses")
+    return None, False
+
+
+def get(namespace: str, key: str) -> Optional[Any]:
+    """Fresh cached value for (namespace, key), or None."""
+    value, fresh = lookup(namespace, key)
+    return value if fresh else None
+
+
+def put(namespace: str, key: str, value: Any, ttl: int = DEFAULT_TTL, stale_ttl: int = 0):
+    """
+    Store a JSON-serializable value in both tiers, fresh for `ttl` seconds
+    and servable as stale for `stale_ttl` more.
+    """
+    global _writes
+    if DISABLED or ttl <= 0:
+        return
+    expires_at = time.time() + ttl
+    blob, content_hash = _encode(value)
+    _remember((namespace, key), expires_at, blob)
+    with _lock:
+        _count(namespace, "stored")
+        _writes += 1
+        purge = _writes % PURGE_EVERY == 0
+
+    try:
+        conn = _connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                         (namespace, key, expires_at, blob, expires_at + stale_ttl, content_hash))
+            if purge:
+                conn.execute("DELETE FROM entries WHERE MAX(expires_at, COALESCE(stale_until, 0)) <= ?",
+                             (time.time(),))
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Scrape cache write failed: {e}")
+        with _lock:
+            _stats["disk_errors"] += 1
+
+
+def invalidate(namespace: str, key: str):
+    """Drop one entry from both tiers (this process's memory and the shared file)."""
+    _forget((namespace, key))
+    try:
+        conn = _connect()
+        try:
+            conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Scrape cache delete failed: {e}")
+
+
+def _claim_refresh(namespace: str, key: str) -> bool:
+    """True if this process may refresh the entry: no thread here and no other worker is on it."""
+    with _lock:
+        if (namespace, key) in _refreshing:
+            return False
+        _refreshing.add((namespace, key))
+    now = time.time()
+    try:
+        conn = _connect()
+        try:
+            claimed = conn.execute("""
+            UPDATE entries SET refresh_claimed_until = ?
+            WHERE namespace = ? AND key = ? AND COALESCE(refresh_claimed_until, 0) < ?
+            """, (now + REFRESH_CLAIM_SECONDS, namespace, key, now)).rowcount == 1
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Scrape cache refresh claim failed: {e}")
+        claimed = False
+    if not claimed:
+        with _lock:
+            _refreshing.discard((namespace, key))
+    return claimed
+
+
+def _store_refresh(namespace: str, key: str, value: Any, ttl: int, stale_ttl: int):
+    """Store a refreshed value; when its content is unchanged only the expiry moves."""
+    blob, content_hash = _encode(value)
+    expires_at = time.time() + ttl
+    conn = _connect()
+    try:
+        unchanged = conn.execute("""
+        UPDATE entries SET expires_at = ?, stale_until = ?, refresh_claimed_until = NULL
+        WHERE namespace = ? AND key = ? AND content_hash = ?
+        """, (expires_at, expires_at + stale_ttl, namespace, key, content_hash)).rowcount == 1
+        conn.commit()
+    finally:
+        conn.close()
+    if unchanged:
+        _remember((namespace, key), expires_at, blob)
+        with _lock:
+            _stats["refresh_unchanged"] += 1
+    else:
+        put(namespace, key, value, ttl, stale_ttl)
+        with _lock:
+            _stats["refresh_changed"] += 1
+    return unchanged
+
+
+def _release_claim(namespace: str, key: str):
+    try:
+        conn = _connect()
+        try:
+            conn.execute("UPDATE entries SET refresh_claimed_until = NULL WHERE namespace = ? AND key = ?",
+                         (namespace, key))
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Scrape cache refresh release failed: {e}")
+
+
+def _refresh(namespace: str, key: str, func: Callable, args: tuple, kwargs: dict,
+             ttl: int, stale_ttl: int, cacheable: Callable[[Any], bool]):
+    try:
+        value = func(*args, **kwargs)
+        if cacheable(value):
+            unchanged = _store_refresh(namespace, key, value, ttl, stale_ttl)
+            print(f"Refreshed {namespace} entry ({'unchanged' if unchanged else 'changed'})")
+        else:
+            # Keep serving the stale value; the next stale hit tries again
+            with _lock:
+                _stats["refresh_failures"] += 1
+            _release_claim(namespace, key)
+    except Exception as e:
+        print(f"Refreshing {namespace} entry failed: {e}")
+        with _lock:
+            _stats["refresh_failures"] += 1
+        _release_claim(namespace, key)
+    finally:
+        with _lock:
+            _refreshing.discard((namespace, key))
+
+
+def _schedule_refresh(namespace: str, key: str, func: Callable, args: tuple, kwargs: dict,
+                      ttl: int, stale_ttl: int, cacheable: Callable[[Any], bool]):
+    global _refresh_executor
+    if not _claim_refresh(namespace, key):
+        return
+    with _lock:
+        _stats["refreshes"] += 1
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS,
+                                                   thread_name_prefix="scrape-cache-refresh")
+    _refresh_executor.submit(_refresh, namespace, key, func, args, kwargs, ttl, stale_ttl, cacheable)
+
+
+# ---------- negative results ----------
+
+# How long an expired negative entry is remembered, so backoff_ttl can grow from it
+NEGATIVE_MEMORY = 3 * 24 * 3600
+
+_scope = threading.local()
+
+
+@contextmanager
+def request_scope(bypass_negative: bool = False):
+    """
+    Per-request view of the negative cache for the calling thread.
+
+        with scrape_cache.request_scope(bypass_negative=refresh) as scope:
+            links = find_tutorial_links_for_problem(...)
+        if scope["negative_hits"]: ...
+
+    scope["negative_hits"] lists the namespaces that answered from a cached
+    "nothing found"; with bypass_negative those entries are ignored and the
+    lookup runs again (its result replaces them).
+    """
+    previous = getattr(_scope, "state", None)
+    state = {"bypass_negative": bypass_negative, "negative_hits": []}
+    _scope.state = state
+    try:
+        yield state
+    finally:
+        _scope.state = previous
+
+
+def backoff_ttl(base: int, cap: int) -> Callable:
+    """negative_ttl policy for results without a known age: base, then doubling up to cap."""
+    def ttl(previous_ttl: Optional[int], *args, **kwargs) -> int:
+        return min(previous_ttl * 2, cap) if previous_ttl else base
+    return ttl
+
+
+def _lookup_negative(namespace: str, key: str) -> Tuple[Optional[Any], Optional[int]]:
+    """(cached negative value or None, TTL the last negative entry was stored with)."""
+    entry, fresh = lookup(namespace + ":negative", key)
+    if not entry:
+        return None, None
+    return (entry["value"] if fresh else None), entry.get("ttl")
+
+
+def call_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    """
+    Cache key for a function call; arguments are compared by their JSON form.
+    Arguments are bound to func's parameters with defaults applied, so
+    f(x), f(x=x) and f(x, flag=False) (when False is the default) share a key.
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+    except TypeError:
+        # Let the call itself raise the argument error
+        return json.dumps([args, kwargs], sort_keys=True, default=str, separators=(",", ":"))
+    bound.apply_defaults()
+    return json.dumps(bound.arguments, sort_keys=True, default=str, separators=(",", ":"))
+
+
+def is_cacheable(value: Any) -> bool:
+    """Default policy: keep real results, never errors or empty answers."""
+    if value is None or value == "" or value == [] or value == {}:
+        return False
+    return not (isinstance(value, dict) and "error" in value)
+
+
+def cached(namespace: str, ttl: int = DEFAULT_TTL, cacheable: Callable[[Any], bool] = is_cacheable,
+           stale_ttl: int = 0, negative: Callable[[Any], bool] = None, negative_ttl: Callable = None):
+    """
+    Decorator serving a function's results from the cache.
+    Results are keyed on the call's arguments and stored only when
+    `cacheable(result)` holds. With stale_ttl, expired results are served
+    for that much longer while a background refresh runs.
+
+    Results for which `negative(result)` holds (a definite "nothing found",
+    not an error) are cached separately for
+    negative_ttl(previous_ttl, *args, **kwargs) seconds, where previous_ttl
+    is the TTL of the last negative entry for the same call, if any.
+    Negative hits are reported to the caller's request_scope.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = call_key(func, args, kwargs)
+            value, fresh = lookup(namespace, key)
+            if value is not None:
+                if not fresh:
+                    _schedule_refresh(namespace, key, func, args, kwargs, ttl, stale_ttl, cacheable)
+                return value
+
+            previous_ttl = None
+            if negative and not DISABLED:
+                scope = getattr(_scope, "state", None)
+                value, previous_ttl = _lookup_negative(namespace, key)
+                if value is not None and not (scope and scope["bypass_negative"]):
+                    with _lock:
+                        _stats["negative_hits"] += 1
+                    if scope is not None:
+                        scope["negative_hits"].append(namespace)
+                    return value
+
+            def compute():
+                value = func(*args, **kwargs)
+                try:
+                    if cacheable(value):
+                        put(namespace, key, value, ttl, stale_ttl)
+                    elif negative and negative(value):
+                        seconds = int(negative_ttl(previous_ttl, *args, **kwargs)) if negative_ttl else DEFAULT_TTL
+                        put(namespace + ":negative", key, {"value": value, "ttl": seconds}, seconds, NEGATIVE_MEMORY)
+                        with _lock:
+                            _stats["negative_stored"] += 1
+                except (TypeError, ValueError) as e:
+                    print(f"Scrape cache cannot store {namespace} result: {e}")
+                return value
+
+            # Concurrent misses for the same call wait for one computation
+            return single_flight.do(f"{namespace}:{key}", compute)
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> Dict:
+    with _lock:
+        stats = {**_stats, "memory_entries": len(_memory), "memory_bytes": _memory_bytes,
+                 "memory_limit_bytes": MEMORY_BYTES, "refreshing": len(_refreshing),
+                 "namespaces": {ns: dict(c) for ns, c in _namespace_stats.items()}}
+    try:
+        conn = _connect()
+        try:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM entries").fetchone()
+        finally:
+            conn.close()
+        stats["disk"] = {"entries": entries, "bytes": size, "path": CACHE_PATH}
+    except sqlite3.Error as e:
+        stats["disk"] = {"error": str(e)}
+    return stats
@@ -0,0 +1,155 @@
+# single_flight.py
+"""
+Coalesce identical in-flight computations.
+
+During a contest many students ask about the same problem within seconds.
+do(key, fn) runs fn once per key at a time: concurrent callers with the
+same key wait for the running call and get a copy of its result, or its
+exception.
+Keys name the problem and the stage, e.g.
+"cf_tutorial_links:{"contest_id":"1900","index":"A"}"; LLM calls add the service and a
+digest() of the prompt, e.g. "codeforces:1900/A:hints:competitive:<digest>",
+so callers with different prompts or models never share an answer.
+
+Within a worker this is plain threads and events. With
+SINGLE_FLIGHT_LOCK_DIR set, workers on the same machine coalesce too: the
+computing worker holds a file lock for the key and leaves the outcome in a
+result file next to it; a worker that had to wait for that lock reads the
+outcome instead of computing again. Only successful, JSON-serializable
+results are shared across workers; after an error (or an unserializable
+result) the waiting worker computes for itself, so exceptions keep their
+type.
+
+Configuration (environment variables):
+    SINGLE_FLIGHT_LOCK_DIR    lock/result directory; unset = per-worker only
+    SINGLE_FLIGHT_TIMEOUT     seconds to wait for another worker (default 120)
+"""
+import os
+import copy
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Callable, Dict
+
+from file_lock import FileLock
+
+LOCK_DIR = os.getenv("SINGLE_FLIGHT_LOCK_DIR")
+TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "120"))
+
+# Result files older than this are ignored (the next computation overwrites them)
+RESULT_TTL = 600
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+_lock = threading.Lock()
+_flights: Dict[str, _Flight] = {}
+_stats = {"leaders": 0, "followers": 0, "shared_across_workers": 0, "errors_shared": 0, "lock_timeouts": 0}
+
+
+def _paths(key: str):
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    base = os.path.join(LOCK_DIR, digest)
+    return base + ".lock", base + ".json"
+
+
+def digest(text: str) -> str:
+    """Short content hash for keys that depend on a prompt or other large input."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _read_result(path: str, since: float):
+    """Result another worker stored after `since`, as (found, result)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return False, None
+    finished_at = stored.get("finished_at", 0)
+    if finished_at < since or time.time() - finished_at > RESULT_TTL:
+        return False, None
+    return True, stored.get("result")
+
+
+def _write_result(path: str, result: Any):
+    outcome = {"finished_at": time.time(), "result": result}
+    try:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(outcome, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Single-flight result not shared: {e}")
+
+
+def _run_across_workers(key: str, fn: Callable[[], Any]) -> Any:
+    lock_path, result_path = _paths(key)
+    started = time.time()
+    lock = FileLock(lock_path)
+    if not lock.acquire(blocking=True, timeout=TIMEOUT):
+        # The other worker is stuck; don't wait any longer than a cold call would
+        with _lock:
+            _stats["lock_timeouts"] += 1
+        return fn()
+    try:
+        # A result newer than our arrival means another worker ran this while we waited;
+        # if that run failed it left nothing and we try ourselves
+        found, result = _read_result(result_path, started)
+        if found:
+            with _lock:
+                _stats["shared_across_workers"] += 1
+            return result
+        result = fn()
+        _write_result(result_path, result)
+        return result
+    finally:
+        lock.release()
+
+
+def do(key: str, fn: Callable[[], Any]) -> Any:
+    """Run fn() once for all concurrent callers with the same key; share its result or error."""
+    with _lock:
+        flight = _flights.get(key)
+        if flight is None:
+            flight = _flights[key] = _Flight()
+            leader = True
+            _stats["leaders"] += 1
+        else:
+            flight.waiters += 1
+            leader = False
+            _stats["followers"] += 1
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            with _lock:
+                _stats["errors_shared"] += 1
+            raise flight.error
+        # Callers may mutate what they get (endpoints add response fields)
+        return copy.deepcopy(flight.result)
+
+    try:
+        flight.result = _run_across_workers(key, fn) if LOCK_DIR else fn()
+        # Everyone, the leader included, gets a copy; the original stays pristine for followers
+        return copy.deepcopy(flight.result)
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            _flights.pop(key, None)
+        flight.done.set()
+        if flight.waiters:
+            print(f"Single-flight {key[:80]}: shared with {flight.waiters} waiting request(s)")
+
+
+def flight_stats() -> Dict:
+    with _lock:
+        return {**_stats, "in_flight": len(_flights), "cross_worker": bool(LOCK_DIR)}
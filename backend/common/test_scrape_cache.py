@@ -0,0 +1,129 @@
+"""
+Test script for scrape_cache
+Runs decorated fake scrapers against a throwaway cache file and checks
+negative caching, request_scope bypass and stale-while-revalidate
+(no network needed)
+
+    python test_scrape_cache.py
+"""
+import os
+import time
+import shutil
+import tempfile
+
+# The cache reads its path at import time
+TEMP_DIR = tempfile.mkdtemp(prefix="scrape_cache_")
+os.environ["SCRAPE_CACHE_PATH"] = os.path.join(TEMP_DIR, "scrape_cache.db")
+os.environ.pop("SCRAPE_CACHE_DISABLED", None)
+
+import scrape_cache
+
+calls = {"links": 0, "page": 0}
+# What the fake upstream currently returns
+upstream = {"links": [], "page": "version 1"}
+
+
+@scrape_cache.cached("test_links", ttl=3600, negative=lambda links: links == [],
+                     negative_ttl=scrape_cache.backoff_ttl(60, 600))
+def find_links(contest_id, index="A"):
+    calls["links"] += 1
+    return list(upstream["links"])
+
+
+@scrape_cache.cached("test_page", ttl=1, stale_ttl=60)
+def fetch_text(url):
+    calls["page"] += 1
+    return upstream["page"]
+
+
+def negative_entry_ttl(*args, **kwargs):
+    key = scrape_cache.call_key(find_links.uncached, args, kwargs)
+    return scrape_cache._lookup_negative("test_links", key)[1]
+
+
+def test_negative_then_bypass():
+    """Test 1: "nothing found" is cached, reported to the scope, and bypassed on request"""
+    print("\n" + "="*60)
+    print("TEST 1: Negative entry followed by a bypass")
+    print("="*60)
+
+    assert find_links(1900) == [] and calls["links"] == 1
+    assert negative_entry_ttl(1900) == 60
+
+    # Served from the negative entry, and the request learns about it
+    with scrape_cache.request_scope() as scope:
+        assert find_links(1900, index="A") == []
+    print(f"  negative hits: {scope['negative_hits']}")
+    assert calls["links"] == 1 and scope["negative_hits"] == ["test_links"]
+
+    # Bypass recomputes; still nothing, so the entry is stored again with a longer TTL
+    with scrape_cache.request_scope(bypass_negative=True) as scope:
+        assert find_links(1900) == []
+    assert calls["links"] == 2 and scope["negative_hits"] == []
+    assert negative_entry_ttl(1900) == 120
+
+    # The editorial appears: a bypass picks it up and it is cached as a real result
+    upstream["links"] = ["https://codeforces.com/blog/entry/1"]
+    with scrape_cache.request_scope(bypass_negative=True):
+        assert find_links(1900) == upstream["links"]
+    assert calls["links"] == 3
+    with scrape_cache.request_scope() as scope:
+        assert find_links(1900) == upstream["links"]
+    assert calls["links"] == 3 and scope["negative_hits"] == []
+    print("\n✓ Negative entry served, bypassed and replaced")
+
+
+def test_backoff_ttl():
+    """Test 2: backoff_ttl doubles from base up to cap"""
+    print("\n" + "="*60)
+    print("TEST 2: Negative TTL backoff")
+    print("="*60)
+
+    ttl = scrape_cache.backoff_ttl(60, 600)
+    steps = [ttl(None)]
+    for _ in range(5):
+        steps.append(ttl(steps[-1]))
+    print(f"  {steps}")
+    assert steps == [60, 120, 240, 480, 600, 600]
+    print("\n✓ Backoff capped")
+
+
+def test_stale_refresh():
+    """Test 3: an expired entry is served stale while one background refresh runs"""
+    print("\n" + "="*60)
+    print("TEST 3: Stale-while-revalidate")
+    print("="*60)
+
+    assert fetch_text("https://example.com/blog") == "version 1" and calls["page"] == 1
+    upstream["page"] = "version 2"
+    time.sleep(1.2)
+
+    # Past its ttl: the old value comes back at once and a refresh is scheduled
+    assert fetch_text("https://example.com/blog") == "version 1"
+    deadline = time.time() + 10
+    while scrape_cache.cache_stats()["refreshing"] and time.time() < deadline:
+        time.sleep(0.05)
+    assert calls["page"] == 2
+
+    assert fetch_text("https://example.com/blog") == "version 2" and calls["page"] == 2
+    print("\n✓ Stale value served, refreshed value picked up")
+
+
+def main():
+    """Run all tests"""
+    print(f"Cache file: {scrape_cache.CACHE_PATH}")
+    try:
+        test_negative_then_bypass()
+        test_backoff_ttl()
+        test_stale_refresh()
+        print("\n" + "="*60)
+        print("✅ All scrape cache tests passed!")
+        stats = scrape_cache.cache_stats()
+        print({name: stats[name] for name in ("negative_hits", "negative_stored", "refreshes", "refresh_failures")})
+        print("="*60 + "\n")
+    finally:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Test script for single_flight
+Starts concurrent callers with the same key and checks that the work runs
+once and that its result, or its exception, reaches every caller
+(no network needed)
+
+    python test_single_flight.py
+"""
+import os
+import time
+import threading
+
+# Per-worker coalescing only; the lock directory is read at import time
+os.environ.pop("SINGLE_FLIGHT_LOCK_DIR", None)
+
+import single_flight
+
+FOLLOWERS = 4
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out waiting for callers to join the flight"
+        time.sleep(0.01)
+
+
+def run_flight(key, fn):
+    """Start a leader and FOLLOWERS callers on `key`; return their outcomes once fn is released."""
+    release = threading.Event()
+    outcomes = []
+    outcomes_lock = threading.Lock()
+
+    def gated():
+        release.wait()
+        return fn()
+
+    def caller():
+        try:
+            outcome = ("result", single_flight.do(key, gated))
+        except Exception as e:
+            outcome = ("error", e)
+        with outcomes_lock:
+            outcomes.append(outcome)
+
+    followers_before = single_flight.flight_stats()["followers"]
+    threads = [threading.Thread(target=caller)]
+    threads[0].start()
+    wait_for(lambda: single_flight.flight_stats()["in_flight"] == 1)
+    for _ in range(FOLLOWERS):
+        thread = threading.Thread(target=caller)
+        thread.start()
+        threads.append(thread)
+    wait_for(lambda: single_flight.flight_stats()["followers"] - followers_before == FOLLOWERS)
+
+    release.set()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_result_shared():
+    """Test 1: one computation, every caller gets its own copy of the result"""
+    print("\n" + "="*60)
+    print("TEST 1: Result shared with followers")
+    print("="*60)
+
+    runs = []
+
+    def compute():
+        runs.append(1)
+        return {"links": ["https://codeforces.com/blog/entry/1"]}
+
+    outcomes = run_flight("test:result", compute)
+    print(f"  runs: {len(runs)}, outcomes: {[kind for kind, _ in outcomes]}")
+    assert len(runs) == 1
+    assert [kind for kind, _ in outcomes] == ["result"] * (FOLLOWERS + 1)
+    results = [value for _, value in outcomes]
+    assert all(result == results[0] for result in results)
+    # Copies, not the same object: one caller's changes don't leak to the others
+    results[0]["links"].append("mutated")
+    assert all(result["links"] == ["https://codeforces.com/blog/entry/1"] for result in results[1:])
+    print("\n✓ Computed once, copies handed out")
+
+
+def test_leader_error_shared():
+    """Test 2: the leader's exception propagates to every follower with its type"""
+    print("\n" + "="*60)
+    print("TEST 2: Leader exception propagates to followers")
+    print("="*60)
+
+    runs = []
+
+    def compute():
+        runs.append(1)
+        raise ValueError("editorial page did not render")
+
+    errors_before = single_flight.flight_stats()["errors_shared"]
+    outcomes = run_flight("test:error", compute)
+    for kind, value in outcomes:
+        print(f"  {kind}: {type(value).__name__}: {value}")
+    assert len(runs) == 1
+    assert all(kind == "error" and isinstance(value, ValueError) for kind, value in outcomes)
+    assert all(str(value) == "editorial page did not render" for _, value in outcomes)
+    assert single_flight.flight_stats()["errors_shared"] - errors_before == FOLLOWERS
+
+    # The failed flight is gone; the next call computes again
+    assert single_flight.do("test:error", lambda: "recovered") == "recovered"
+    print("\n✓ Error shared once, key usable again")
+
+
+def test_digest():
+    """Test 3: prompt digests are short and stable"""
+    print("\n" + "="*60)
+    print("TEST 3: Prompt digest")
+    print("="*60)
+
+    first = single_flight.digest("Explain problem 1741B")
+    assert first == single_flight.digest("Explain problem 1741B")
+    assert first != single_flight.digest("Explain problem 1741C")
+    assert len(first) == 16
+    print(f"  {first}")
+    print("\n✓ Digest stable")
+
+
+def main():
+    """Run all tests"""
+    test_result_shared()
+    test_leader_error_shared()
+    test_digest()
+    print("\n" + "="*60)
+    print("✅ All single-flight tests passed!")
+    print(single_flight.flight_stats())
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
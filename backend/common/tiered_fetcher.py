@@ -0,0 +1,181 @@
+# tiered_fetcher.py
+"""
+Tiered page fetcher: plain HTTP first, headless Chrome only when needed.
+
+Tier 1 is a GET through the shared keep-alive session. If the response is a
+Cloudflare / anti-bot interstitial (by status code or body markers) or does
+not contain the content the caller needs, the fetch escalates to tier 2, a
+pooled Selenium browser.
+
+The tier that worked last is remembered per (host, path prefix), so e.g.
+once codechef.com/problems is known to need a browser we go straight there.
+Browser routes are re-probed over HTTP after BROWSER_ROUTE_TTL seconds, or
+immediately while cookie_jar holds a clearance cookie for the host.
+"""
+import os
+import time
+import threading
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import http_client
+import cookie_jar
+from browser_pool import get_pool
+from page_readiness import load_page, html_looks_ready
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+BROWSER_ROUTE_TTL = int(os.getenv("BROWSER_ROUTE_TTL", "1800"))
+
+CHALLENGE_STATUS_CODES = {403, 429, 503}
+CHALLENGE_MARKERS = [
+    "cf-browser-verification",
+    "cf_chl_opt",
+    "/cdn-cgi/challenge-platform",
+    "challenge-form",
+    "<title>Just a moment...</title>",
+    "Attention Required! | Cloudflare",
+    "Checking your browser before accessing",
+    "Enable JavaScript and cookies to continue",
+]
+
+# Challenge markers are looked for in this many leading characters; smaller
+# 403/503 bodies count as challenges
+CHALLENGE_SCAN_CHARS = 20000
+
+_routes_lock = threading.Lock()
+_routes: Dict[Tuple[str, str], Dict] = {}
+_stats = {"http": 0, "browser": 0, "escalations": 0, "challenges": 0}
+
+
+def is_challenge_page(status_code: int, body: str) -> bool:
+    """True if the response looks like an anti-bot interstitial."""
+    body = body or ""
+    # Interstitial markers sit near the top; don't scan whole problem pages for them
+    if any(marker in body[:CHALLENGE_SCAN_CHARS] for marker in CHALLENGE_MARKERS):
+        return True
+    # Cloudflare answers challenges with 403/503; a small body at those codes is never real content
+    return status_code in CHALLENGE_STATUS_CODES and len(body) < CHALLENGE_SCAN_CHARS
+
+
+def _count(name: str):
+    with _routes_lock:
+        _stats[name] += 1
+
+
+def route_key(url: str) -> Tuple[str, str]:
+    """
+    (host, path prefix) used to remember which tier worked.
+    The last path segment (problem code, blog id, ...) is dropped and at most
+    two segments are kept: /blog/entry/123 -> /blog/entry,
+    /problems/FLOW001 -> /problems.
+    """
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    segments = [seg for seg in parts.path.split("/") if seg][:-1]
+    return host, "/" + "/".join(segments[:2])
+
+
+def _starting_tier(key: Tuple[str, str]) -> str:
+    with _routes_lock:
+        route = _routes.get(key)
+    if not route:
+        return TIER_HTTP
+    if route["tier"] == TIER_BROWSER:
+        if time.time() - route["updated"] > BROWSER_ROUTE_TTL or cookie_jar.has_clearance(key[0]):
+            return TIER_HTTP
+    return route["tier"]
+
+
+def _remember(key: Tuple[str, str], tier: str):
+    with _routes_lock:
+        _routes[key] = {"tier": tier, "updated": time.time()}
+
+
+def _fetch_http(url: str) -> Dict:
+    # Send the User-Agent our clearance cookies (if any) were issued to
+    response = http_client.get(url, headers=cookie_jar.request_headers(url), conditional=True)
+    return {"status": response.status_code, "html": response.text, "resources": None}
+
+
+def _fetch_browser(url: str, site: str) -> Dict:
+    with get_pool().driver() as driver:
+        load = load_page(driver, url, site)
+        resources = load["resources"]
+        if resources["blocked_requests"]:
+            print(f"Blocked {resources['blocked_requests']} requests "
+                  f"(estimated ~{resources['bytes_avoided_estimate'] // 1024} KB) loading {url}")
+        html = driver.page_source
+        if not is_challenge_page(200, html):
+            cookie_jar.harvest_from_driver(driver, http_client.get_session())
+        return {"status": 200 if load["ready"] else None, "html": html, "resources": load["resources"]}
+
+
+def fetch_page(url: str, site: str) -> Dict:
+    """
+    Fetch a page through the cheapest tier that returns real content.
+
+    `site` is a page_readiness key; it picks the browser readiness condition
+    and the markers an HTTP body must contain to be accepted.
+    Only a challenge, or a 200 without those markers, escalates to the
+    browser; other HTTP errors (a 404 for a bad problem code) are returned
+    as they are, and a route only switches to the browser tier when the
+    browser rendered the page.
+
+    Returns:
+        dict: {"url", "html", "status", "tier", "challenge", "elapsed", "resources"}
+        ("resources" is the browser's blocked/loaded request report, None over HTTP)
+    """
+    key = route_key(url)
+    start = time.perf_counter()
+
+    if _starting_tier(key) == TIER_HTTP:
+        try:
+            result = _fetch_http(url)
+            challenged = is_challenge_page(result["status"], result["html"])
+            if challenged:
+                _count("challenges")
+                if cookie_jar.has_clearance(url):
+                    cookie_jar.invalidate(url, http_client.get_session())
+            elif result["status"] != 200 or html_looks_ready(result["html"], site):
+                if result["status"] == 200:
+                    _remember(key, TIER_HTTP)
+                _count("http")
+                return {
+                    "url": url,
+                    "html": result["html"],
+                    "status": result["status"],
+                    "tier": TIER_HTTP,
+                    "challenge": False,
+                    "elapsed": round(time.perf_counter() - start, 3),
+                    "resources": None
+                }
+            print(f"HTTP tier insufficient for {url} (status {result['status']}), escalating to browser")
+        except Exception as e:
+            print(f"HTTP tier failed for {url}: {e}, escalating to browser")
+        _count("escalations")
+
+    result = _fetch_browser(url, site)
+    challenged = is_challenge_page(200, result["html"])
+    if result["status"] == 200 and not challenged:
+        _remember(key, TIER_BROWSER)
+    _count("browser")
+    return {
+        "url": url,
+        "html": result["html"],
+        "status": result["status"],
+        "tier": TIER_BROWSER,
+        "challenge": challenged,
+        "elapsed": round(time.perf_counter() - start, 3),
+        "resources": result["resources"]
+    }
+
+
+def fetcher_stats() -> Dict:
+    """Tier usage counters and the remembered tier per route."""
+    with _routes_lock:
+        routes = {f"{host}{prefix}": route["tier"] for (host, prefix), route in _routes.items()}
+        return {**_stats, "routes": routes}
@@ -13,9 +13,25 @@ import sys
 # Add paths to import from subdirectories
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codechef'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'codeforces'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'common'))
 
 import cc_editorial as cce
 import cf_editorial as cfe
+import browser_pool
+import page_readiness
+import tiered_fetcher
+import cookie_jar
+import resource_blocking
+import http_client
+import html_parsing
+import cf_api_cache
+import cf_rate_limiter
+import cf_catalog
+import editorial_index
+import section_store
+import cc_discuss_index
+import scrape_cache
+import single_flight
 
 # Load environment variables
 load_dotenv()
@@ -51,8 +67,38 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def warm_browser_pool():
+    # Resolve the chromedriver binary once, before the first request needs it
+    try:
+        browser_pool.resolve_driver_path()
+    except Exception as e:
+        print(f"Could not resolve chromedriver at startup: {e}")
+
+
+@app.on_event("startup")
+def start_codeforces_background_jobs():
+    # Builds the catalog on first boot, refreshes it incrementally when stale,
+    # and keeps the contest -> editorial index growing
+    cf_catalog.ensure_fresh_async()
+    cfe.start_editorial_crawler()
+
+
+@app.on_event("startup")
+def start_codechef_background_jobs():
+    # Keeps the local problem code -> Discuss editorial index growing
+    cc_discuss_index.start_crawler()
+
+
+@app.on_event("shutdown")
+def close_browser_pool():
+    browser_pool.shutdown_pool()
+
+
 class InputURL(BaseModel):
     problem_url: str
+    # Re-check problems cached as having no editorial
+    bypass_negative_cache: bool = False
 
 
 @app.get("/")
@@ -68,6 +114,28 @@ def root():
     }
 
 
+@app.get("/stats/scrapers")
+def scraper_stats():
+    """HTTP connection reuse, browser pool, fetch tiers, cookies, resource blocking, readiness and caches."""
+    return {
+        "http_client": http_client.connection_stats(),
+        "browser_pool": browser_pool.get_pool().stats(),
+        "fetch_tiers": tiered_fetcher.fetcher_stats(),
+        "cookie_jar": cookie_jar.jar_stats(),
+        "resource_blocking": resource_blocking.blocking_stats(),
+        "page_readiness": page_readiness.readiness_stats(),
+        "html_parsing": html_parsing.parse_stats(),
+        "codeforces_api_cache": cf_api_cache.cache_stats(),
+        "codeforces_rate_limiter": cf_rate_limiter.limiter_stats(),
+        "codeforces_catalog": cf_catalog.catalog_stats(),
+        "codeforces_editorial_index": editorial_index.index_stats(),
+        "codeforces_editorial_sections": section_store.store_stats(),
+        "codechef_discuss_index": cc_discuss_index.index_stats(),
+        "scrape_cache": scrape_cache.cache_stats(),
+        "single_flight": single_flight.flight_stats()
+    }
+
+
 # ==================== CODECHEF ENDPOINTS ====================
 
 @app.post("/codechef/generate/hints")
@@ -82,7 +150,8 @@ def codechef_generate_hints(input_data: InputURL):
         return {"error": "Invalid CodeChef problem URL format"}
     
     problem_code = parsed["problem_code"]
-    result = cce.fetch_discuss_explanations(problem_code)
+    with scrape_cache.request_scope(bypass_negative=input_data.bypass_negative_cache) as cache_scope:
+        result = cce.fetch_discuss_explanations(problem_code, first_only=True)
     
     if "error" in result:
         return {"error": result["error"]}
@@ -91,7 +160,8 @@ def codechef_generate_hints(input_data: InputURL):
         return {
             "error": "Editorial not available for this problem",
             "message": "No editorial found in CodeChef Discuss forum for this problem.",
-            "problem_code": problem_code
+            "problem_code": problem_code,
+            "negative_cache_hit": bool(cache_scope["negative_hits"])
         }
     
     first_post = result["posts"][0]
@@ -119,22 +189,25 @@ Editorial:
 Now generate clear, structured hints:
 """
 
-    try:
+    def ask_llm():
         if USE_GEMINI:
             model = genai.GenerativeModel("gemini-2.0-flash-exp")
             response = model.generate_content(prompt)
-            hints = response.text.strip()
-        else:
-            completion = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI tutor for competitive programming."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=700,
-                temperature=0.7
-            )
-            hints = completion.choices[0].message.content.strip()
+            return response.text.strip()
+        completion = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful AI tutor for competitive programming."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=700,
+            temperature=0.7
+        )
+        return completion.choices[0].message.content.strip()
+
+    try:
+        # Students asking about the same problem at once share one LLM call
+        hints = single_flight.do(f"codechef:{problem_code}:hints:competitive:{single_flight.digest(prompt)}", ask_llm)
 
         return {
             "problem": metadata,
@@ -148,7 +221,8 @@ Now generate clear, structured hints:
 
 
 @app.get("/codechef/fetch/editorial")
-def codechef_fetch_editorial(problem_url: Optional[str] = Query(None)):
+def codechef_fetch_editorial(problem_url: Optional[str] = Query(None),
+                             bypass_negative_cache: bool = Query(False)):
     """Fetch editorial from CodeChef Discuss forum."""
     if not problem_url:
         return {"error": "Provide problem_url query parameter."}
@@ -158,9 +232,10 @@ def codechef_fetch_editorial(problem_url: Optional[str] = Query(None)):
         return {"error": "Invalid CodeChef problem URL format"}
     
     problem_code = parsed["problem_code"]
-    result = cce.fetch_discuss_explanations(problem_code)
+    with scrape_cache.request_scope(bypass_negative=bypass_negative_cache) as cache_scope:
+        result = cce.fetch_discuss_explanations(problem_code)
     
-    return result
+    return {**result, "negative_cache_hit": bool(cache_scope["negative_hits"])}
 
 
 @app.get("/codechef/metadata")
@@ -176,8 +251,7 @@ def codechef_metadata(problem_url: Optional[str] = Query(None)):
     try:
         problem_code = parsed["problem_code"]
         contest_code = parsed.get("contest_code")
-        html = cce.fetch_problem_page(problem_code, contest_code)
-        metadata = cce.extract_problem_metadata(html, problem_code)
+        metadata = cce.get_problem_metadata(problem_code, contest_code)
         
         return {
             "problem": metadata,
@@ -205,16 +279,14 @@ def codeforces_generate_hints(input_data: InputURL):
     index = parsed["index"]
 
     metadata = cfe.fetch_problem_metadata(contest_id, index)
-    tutorial_links = cfe.find_tutorial_links_for_problem(contest_id, index)
-    
-    if not tutorial_links:
-        return {"error": "No editorial or tutorial links found for this problem."}
+    # Editorial for this problem (its section of the round editorial when possible)
+    with scrape_cache.request_scope(bypass_negative=input_data.bypass_negative_cache) as cache_scope:
+        editorial = cfe.fetch_problem_editorial(contest_id, index, (metadata or {}).get("name"))
+    if "error" in editorial:
+        return {"error": editorial["error"], "negative_cache_hit": bool(cache_scope["negative_hits"])}
 
-    editorial_url = tutorial_links[0]
-    editorial_text = cfe.fetch_blog_text(editorial_url)
-    
-    if "Error fetching" in editorial_text:
-        return {"error": "Could not fetch editorial content. Please try again."}
+    editorial_url = editorial["editorial_url"]
+    editorial_text = editorial["text"]
 
     prompt = f"""
 You are an AI assistant that helps competitive programmers learn without revealing full solutions.
@@ -231,22 +303,25 @@ Editorial:
 Now generate clear, structured hints:
 """
 
-    try:
+    def ask_llm():
         if USE_GEMINI:
             model = genai.GenerativeModel("gemini-2.5-flash")
             response = model.generate_content(prompt)
-            hints = response.text.strip()
-        else:
-            completion = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI tutor for competitive programming."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=700,
-                temperature=0.7
-            )
-            hints = completion.choices[0].message.content.strip()
+            return response.text.strip()
+        completion = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful AI tutor for competitive programming."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=700,
+            temperature=0.7
+        )
+        return completion.choices[0].message.content.strip()
+
+    try:
+        # Students asking about the same problem at once share one LLM call
+        hints = single_flight.do(f"codeforces:{contest_id}/{index}:hints:competitive:{single_flight.digest(prompt)}", ask_llm)
 
         return {
             "problem": metadata,
@@ -260,7 +335,8 @@ Now generate clear, structured hints:
 
 
 @app.get("/codeforces/fetch/editorial")
-def codeforces_fetch_editorial(problem_url: Optional[str] = Query(None)):
+def codeforces_fetch_editorial(problem_url: Optional[str] = Query(None),
+                               bypass_negative_cache: bool = Query(False)):
     """Fetch Codeforces editorial."""
     if not problem_url:
         return {"error": "Provide problem_url query parameter."}
@@ -272,13 +348,18 @@ def codeforces_fetch_editorial(problem_url: Optional[str] = Query(None)):
     contest_id = parsed["contest_id"]
     index = parsed["index"]
 
-    tutorial_links = cfe.find_tutorial_links_for_problem(contest_id, index)
+    with scrape_cache.request_scope(bypass_negative=bypass_negative_cache) as cache_scope:
+        try:
+            tutorial_links = cfe.find_tutorial_links_for_problem(contest_id, index)
+        except Exception as e:
+            return {"error": f"Editorial lookup failed, please try again: {e}", "platform": "Codeforces"}
     editorials = []
     for link in tutorial_links:
         text = cfe.fetch_blog_text(link)
         editorials.append({"url": link, "text": text[:1000]})
 
-    return {"tutorial_links": tutorial_links, "editorials": editorials, "platform": "Codeforces"}
+    return {"tutorial_links": tutorial_links, "editorials": editorials, "platform": "Codeforces",
+            "negative_cache_hit": bool(cache_scope["negative_hits"])}
 
 
 if __name__ == "__main__":
@@ -1,5 +1,18 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import sys
+
+# Shared HTTP client lives in backend/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'common'))
+
+import http_client
+from bs4 import SoupStrainer
+from html_parsing import parse
+
+# Profile containers read below; the first <small> and <strong>s live inside them
+PROFILE_CONTAINERS = SoupStrainer(attrs={"class": [
+    "user-details-container", "rating-header", "rating", "user-country-name",
+    "rating-ranks", "rating-data-section"
+]})
 
 def fetch_codechef_profile(handle):
     url = f"https://www.codechef.com/users/{handle}"
@@ -7,11 +20,11 @@ def fetch_codechef_profile(handle):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
     }
 
-    response = requests.get(url, headers=headers)
+    response = http_client.get(url, headers=headers)
     if response.status_code != 200:
         return {"error": "Invalid CodeChef handle"}
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = parse(response.text, "codechef_profile", PROFILE_CONTAINERS)
 
     try:
         # Extract username and full name
@@ -1,4 +1,11 @@
-import requests
+import os
+import sys
+
+# Shared HTTP client lives in backend/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'common'))
+
+import http_client
+import cf_rate_limiter
 
 def fetch_codeforces_profile(handle):
     """
@@ -7,15 +14,24 @@ def fetch_codeforces_profile(handle):
     """
     try:
         url = f"https://codeforces.com/api/user.info?handles={handle}"
-        response = requests.get(url, timeout=10)
+        # Shares the Codeforces call budget with the editorial service; a
+        # "Call limit exceeded" answer drains it for every service and is retried once
+        for attempt in range(2):
+            cf_rate_limiter.acquire(cf_rate_limiter.INTERACTIVE)
+            response = http_client.get(url)
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+            if not cf_rate_limiter.is_call_limit_exceeded(data):
+                break
+            cf_rate_limiter.penalize()
 
         # Check if API request succeeded
         if response.status_code != 200:
             print(f"Error: Codeforces API returned {response.status_code}")
             return None
 
-        data = response.json()
-
         # Validate response content
         if data.get("status") != "OK" or "result" not in data:
             print("Error: Invalid data received from Codeforces API")